@@ -0,0 +1,153 @@
+"""
+Guards the document scanner against pathological inputs: scans documents of adversarial
+sentences (number-word chains, OCR noise, long digit runs) that make the metadata
+regexes backtrack, checks every scan stays within the time budget, and fuzzes mutated
+contract clauses to check the budgeted scanner still finds the same hits as plain re.search.
+
+    python -m services.insights.benchmarks.adversarial_regex_benchmark
+    python -m services.insights.benchmarks.adversarial_regex_benchmark --backend re --count 50
+"""
+import argparse
+import random
+import time
+from services.insights import document_scanner
+from services.insights.benchmarks.contract_corpus import BOILERPLATE_CLAUSES, METADATA_CLAUSES
+from services.insights.benchmarks.regex_prefilter_benchmark import search_loop_hits
+from services.insights.document_scanner import REGEX_DOCUMENT_BUDGET_SECONDS, scan_document
+from services.insights.llm_metrics import metrics
+
+MODULE_NAME = "adversarial_regex_benchmark.py"
+
+NUMBER_WORDS = ["one", "two", "seven", "seventy", "eleven", "Nineteen", "one hundred", "One thousand"]
+OCR_NOISE = "0O1lI|,;:$€£-'/ \t"
+ANCHOR_TAIL = " payable in dollars on 1 January 2024 under the laws of England"
+# A scan may overrun its budget by the one search running when the budget is spent
+BUDGET_SLACK_SECONDS = 1.0
+
+
+def adversarial_sentence(rng: random.Random, length: int) -> str:
+    """
+    Returns a sentence of about ``length`` characters shaped to trigger backtracking.
+    """
+    shape = rng.randrange(6)
+    if shape == 0:
+        unit = rng.choice(NUMBER_WORDS)
+    elif shape == 1:
+        unit = rng.choice(NUMBER_WORDS) + " and "
+    elif shape == 2:
+        unit = "".join(rng.choice(NUMBER_WORDS).title() for _ in range(3))
+    elif shape == 3:
+        unit = "".join(rng.choice(OCR_NOISE) for _ in range(20))
+    elif shape == 4:
+        unit = rng.choice(["1,000", "12 ", "2024", "$1", "Jan 1 "])
+    else:
+        unit = rng.choice(["of the State of ", "courts of ", "laws of "])
+    # The tail holds the anchors of every filter, so the prefilter lets the regexes run
+    # and each fails at every start position within the run before matching the tail
+    return (unit * (length // len(unit) + 1))[:length] + ANCHOR_TAIL
+
+
+def adversarial_documents(rng: random.Random, count: int) -> list:
+    """
+    Returns documents mixing contract clauses with adversarial sentences.
+    """
+    documents = []
+    for _ in range(count):
+        sentences = [rng.choice(METADATA_CLAUSES + BOILERPLATE_CLAUSES) for _ in range(rng.randint(5, 40))]
+        for _ in range(rng.randint(1, 4)):
+            sentences.insert(rng.randrange(len(sentences) + 1), adversarial_sentence(rng, rng.choice([500, 2000, 8000, 20000])))
+        documents.append([". ".join(sentences) + "."])
+    return documents
+
+
+def mutate(rng: random.Random, clause: str) -> str:
+    """
+    Returns a clause with OCR-like character edits and repeated words.
+    """
+    chars = list(clause)
+    for _ in range(rng.randint(0, 6)):
+        position = rng.randrange(len(chars))
+        edit = rng.randrange(3)
+        if edit == 0:
+            chars.insert(position, rng.choice(OCR_NOISE))
+        elif edit == 1:
+            del chars[position]
+        else:
+            chars[position] = rng.choice(OCR_NOISE + "aeiou")
+    words = "".join(chars).split(" ")
+    if rng.random() < 0.3:
+        position = rng.randrange(len(words))
+        words[position:position] = [words[position]] * rng.randint(1, 5)
+    return " ".join(words)
+
+
+def fuzz_documents(rng: random.Random, count: int) -> list:
+    return [
+        [". ".join(mutate(rng, rng.choice(METADATA_CLAUSES + BOILERPLATE_CLAUSES)) for _ in range(rng.randint(1, 30)))]
+        for _ in range(count)
+    ]
+
+
+def fallback_count() -> float:
+    return metrics.counter("document_scanner.anchor_fallback_sentences")
+
+
+def check_budget(documents) -> list:
+    """
+    Returns (document index, seconds) of the scans that overran the document budget.
+    """
+    overruns = []
+    worst = 0.0
+    fallbacks = fallback_count()
+    for index, chunks in enumerate(documents):
+        start = time.perf_counter()
+        scan_document(chunks)
+        elapsed = time.perf_counter() - start
+        worst = max(worst, elapsed)
+        if elapsed > REGEX_DOCUMENT_BUDGET_SECONDS + BUDGET_SLACK_SECONDS:
+            overruns.append((index, elapsed))
+    print(
+        f"adversarial: {len(documents)} documents | worst scan {worst:.3f}s"
+        f" | anchor fallbacks {fallback_count() - fallbacks:.0f} | overruns {len(overruns)}"
+    )
+    return overruns
+
+
+def check_equivalence(documents) -> list:
+    """
+    Returns the indexes of fuzzed documents whose hits differ from the re.search loop.
+    """
+    mismatches = []
+    fallbacks = fallback_count()
+    for index, chunks in enumerate(documents):
+        if scan_document(chunks).hits != search_loop_hits(chunks):
+            mismatches.append(index)
+    print(f"fuzz: {len(documents)} documents | anchor fallbacks {fallback_count() - fallbacks:.0f} | mismatches {len(mismatches)}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["auto", "re"], default="auto")
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--fuzz-count", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.backend == "re":
+        document_scanner.regex = None
+    long_sentence = " " * (document_scanner.REGEX_TIMEOUT_MIN_CHARS + 1)
+    print(f"regex backend for sentences over {len(long_sentence) - 1} characters: {document_scanner._backend(long_sentence).__name__}")
+    rng = random.Random(args.seed)
+    overruns = check_budget(adversarial_documents(rng, args.count))
+    mismatches = check_equivalence(fuzz_documents(rng, args.fuzz_count))
+    for index, elapsed in overruns:
+        print(f"overrun: adversarial document {index} took {elapsed:.3f}s")
+    if mismatches:
+        print(f"mismatching fuzz documents: {mismatches[:10]}")
+    if overruns or mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
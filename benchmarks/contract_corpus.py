@@ -0,0 +1,57 @@
+import random
+from typing import List
+
+MODULE_NAME = "contract_corpus.py"
+
+# Clauses the metadata filters look for
+METADATA_CLAUSES = [
+    "This Agreement is effective as of January 5, 2023 and shall remain in force for three years",
+    "The Effective Date: 01/15/2024",
+    "This Agreement shall be governed by the laws of the State of New York",
+    "The parties submit to the exclusive jurisdiction of the courts of England and Wales",
+    "The total contract value is $1,250,000.00 payable in quarterly installments",
+    "The Client shall pay a fee of five million dollars upon signature",
+    "Invoices are payable within 30 days of receipt, with the first payment due on 2024-03-01",
+    "The Agreement terminates on December 31, 2026 unless renewed in writing",
+    "Delivery of the Deliverables shall occur no later than Q3 FY2024",
+    "Any dispute shall be resolved by arbitration seated in Singapore",
+    "The annual licence fee is USD 75,000 exclusive of taxes",
+    "This Agreement will automatically renew for successive one-year terms on each anniversary",
+]
+
+# Contract prose the filters should pass over
+BOILERPLATE_CLAUSES = [
+    "The Supplier shall maintain adequate insurance coverage for all services rendered under this section",
+    "Each party shall keep the Confidential Information of the other party secret and use it only for the purposes of this Agreement",
+    "The Customer may request changes to the scope, which will be documented in a change order signed by both parties",
+    "All notices must be in writing and delivered by hand or by registered mail to the addresses set out above",
+    "Neither party shall be liable for any failure to perform caused by events beyond its reasonable control",
+    "The Supplier warrants that the services will be performed with reasonable skill and care by suitably qualified personnel",
+    "No waiver of any provision of this Agreement shall be effective unless made in writing and signed by the waiving party",
+    "The Customer shall provide the Supplier with timely access to its premises, systems and staff as reasonably required",
+    "Each party shall comply with all applicable data protection legislation in connection with this Agreement",
+    "This Agreement constitutes the entire agreement between the parties and supersedes all prior understandings",
+    "The Supplier shall not subcontract any of its obligations without the prior written consent of the Customer",
+    "Intellectual property created by the Supplier in the course of the services shall vest in the Customer on payment",
+]
+
+WORDS_PER_PAGE = 500
+
+
+def synthetic_contract(pages: int, metadata_rate: float = 0.05, seed: int = 0) -> List[str]:
+    """
+    Returns one markdown chunk per page of a synthetic contract, mixing metadata clauses
+    into boilerplate at ``metadata_rate``.
+    """
+    rng = random.Random(seed)
+    chunks = []
+    for page in range(pages):
+        sentences = [f"## Section {page + 1}"]
+        words = 0
+        while words < WORDS_PER_PAGE:
+            pool = METADATA_CLAUSES if rng.random() < metadata_rate else BOILERPLATE_CLAUSES
+            sentence = rng.choice(pool)
+            sentences.append(sentence + ".")
+            words += len(sentence.split())
+        chunks.append(" ".join(sentences))
+    return chunks
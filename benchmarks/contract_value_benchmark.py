@@ -0,0 +1,138 @@
+"""
+Measures the local contract value parser: builds synthetic contracts stating their value
+as a single amount, as an explicit total next to its parts, or only through parts and
+rates, and contracts whose only amount is a penalty, liability cap, insurance amount or
+deposit, with amounts written with symbols, ISO codes, Indian grouping, multipliers and
+number words. Checks that single and totalled values resolve to the stated integer,
+that compositional values and other amounts are always left to the LLM, and reports how
+often the llm_call_for_cv call is skipped.
+
+    python -m services.insights.benchmarks.contract_value_benchmark
+    python -m services.insights.benchmarks.contract_value_benchmark --count 1000 --pages 20
+"""
+import argparse
+import random
+import time
+from services.insights.benchmarks.contract_corpus import synthetic_contract
+from services.insights.contract_value_parser import resolve_contract_value
+from services.insights.document_scanner import scan_document
+
+MODULE_NAME = "contract_value_benchmark.py"
+
+UNITS = ["", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten", "eleven", "twelve",
+         "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen"]
+TENS = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+# Clauses whose amount is not the contract value
+OTHER_AMOUNTS = [
+    "Late payments incur a penalty of {}",
+    "The Supplier shall maintain general liability insurance of not less than {}",
+    "The aggregate liability of either party shall not exceed {} in total",
+    "A security deposit of {} is payable on signature",
+]
+
+
+def spell(value: int) -> str:
+    """
+    Returns a number below one billion in words, e.g. "one hundred and fifty thousand".
+    """
+    def below_thousand(n):
+        words = []
+        if n >= 100:
+            words += [UNITS[n // 100], "hundred"] + (["and"] if n % 100 else [])
+            n %= 100
+        if n >= 20:
+            words += [TENS[n // 10]] + ([UNITS[n % 10]] if n % 10 else [])
+        elif n:
+            words.append(UNITS[n])
+        return words
+
+    words = []
+    for scale, name in ((10 ** 6, "million"), (10 ** 3, "thousand"), (1, "")):
+        if value >= scale:
+            words += below_thousand(value // scale) + ([name] if name else [])
+            value %= scale
+    return " ".join(words)
+
+
+def write_amount(rng: random.Random, value: int) -> str:
+    """
+    Returns ``value`` dollars or rupees written in a random form.
+    """
+    form = rng.randrange(6)
+    if form == 0:
+        return f"${value:,}"
+    if form == 1:
+        return f"USD {value:,}.00"
+    if form == 2 and value % 100000 == 0:
+        return f"₹ {value // 100000} lakh" if value < 10 ** 7 else f"₹ {value / 10 ** 7:g} crore"
+    if form == 3 and value % 100000 == 0:
+        return f"${value / 10 ** 6:g} million"
+    if form == 4 and value < 10 ** 9:
+        return f"{spell(value)} dollars"
+    digits = str(value)[::-1]
+    grouped = digits[:3] + "".join("," + digits[i:i + 2] for i in range(3, len(digits), 2))
+    return f"INR {grouped[::-1]}"
+
+
+def valued_contract(rng: random.Random, pages: int, seed: int):
+    """
+    Returns the chunks of a synthetic contract and its value when it is stated (single
+    or total), None when it is composed from parts or the contract states no value.
+    """
+    chunks = synthetic_contract(pages, metadata_rate=0.0, seed=seed)
+    value = rng.randrange(1, 500) * rng.choice([1000, 100000])
+    shape = rng.randrange(4)
+    if shape == 0:
+        clauses = [f"The Client shall pay the Supplier {write_amount(rng, value)} for the services"]
+    elif shape == 1:
+        part = value // rng.randint(2, 5)
+        clauses = [f"The total contract value is {write_amount(rng, value)}",
+                   f"An advance of {write_amount(rng, part)} is due on signature"]
+    elif shape == 2:
+        part = rng.randrange(1, 100) * 1000
+        clauses = [f"The Client shall pay {write_amount(rng, part)} upfront and {write_amount(rng, value)} annually",
+                   f"Support is billed at {write_amount(rng, rng.randrange(50, 300))} per hour"]
+        value = None
+    else:
+        clauses = [rng.choice(OTHER_AMOUNTS).format(write_amount(rng, value))]
+        value = None
+    for clause in clauses:
+        chunks[rng.randrange(pages)] += " " + clause + "."
+    return chunks, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=300)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    wrong, skipped, stated = [], 0, 0
+    seconds = 0.0
+    for n in range(args.count):
+        chunks, value = valued_contract(rng, args.pages, args.seed + n)
+        filtered_text = scan_document(chunks, names=["contract_value_regex"]).windows["contract_value_regex"]
+        start = time.perf_counter()
+        resolution = resolve_contract_value(chunks, filtered_text)
+        seconds += time.perf_counter() - start
+
+        stated += value is not None
+        skipped += resolution.resolved
+        if resolution.resolved and resolution.value != value:
+            wrong.append((n, resolution.value, value, resolution.reason))
+
+    print(
+        f"{args.count} contracts x {args.pages} pages | stated values {stated}"
+        f" | LLM skipped {skipped / args.count:.1%} ({skipped / max(stated, 1):.1%} of stated)"
+        f" | {seconds / args.count * 1000:.2f} ms per contract | wrong {len(wrong)}"
+    )
+    for n, resolved, expected, reason in wrong[:10]:
+        print(f"wrong: contract {n} resolved to {resolved} ({reason}), expected {expected if expected is not None else 'the LLM'}")
+    if wrong:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Measures the local date resolver: builds synthetic contracts whose labelled dates are
+known, written in the numeric, month-name, ordinal, French, Spanish and German forms,
+checks that no field is resolved to a date other than the labelled one, and reports how
+often the date LLM call is skipped or narrowed and how long resolution takes.
+
+    python -m services.insights.benchmarks.date_resolver_benchmark
+    python -m services.insights.benchmarks.date_resolver_benchmark --count 500 --pages 50
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from services.insights.benchmarks.contract_corpus import synthetic_contract
+from services.insights.date_resolver import resolve_dates
+from services.insights.metadata_fields import DATE_FIELDS
+
+MODULE_NAME = "date_resolver_benchmark.py"
+
+ENGLISH_MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
+FRENCH_MONTHS = ["janvier", "février", "mars", "avril", "mai", "juin", "juillet", "août", "septembre", "octobre", "novembre", "décembre"]
+SPANISH_MONTHS = ["enero", "febrero", "marzo", "abril", "mayo", "junio", "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre"]
+GERMAN_MONTHS = ["Januar", "Februar", "März", "April", "Mai", "Juni", "Juli", "August", "September", "Oktober", "November", "Dezember"]
+
+LABELS = {
+    "Effective Date": ["Effective Date: {}", "This Agreement is effective as of {}", "**Effective Date:** {}"],
+    "Termination Date": ["Termination Date: {}"],
+    "Renewal Date": ["Renewal Date: {}", "This Agreement shall renew on {}"],
+    "Expiration Date": ["Expiration Date: {}", "This Agreement expires on {}"],
+    "Delivery Date": ["Delivery Date: {}"],
+    "Term Date": ["Term Date: {}", "The term shall commence on {}"],
+}
+
+
+def write_date(rng: random.Random, value: date, numeric_order: str) -> str:
+    """
+    Returns ``value`` written in a random form; numeric dates follow ``numeric_order``.
+    """
+    form = rng.randrange(7)
+    if form == 0:
+        return value.isoformat()
+    if form == 1:
+        first, second = (value.day, value.month) if numeric_order == "dmy" else (value.month, value.day)
+        return f"{first:02d}/{second:02d}/{value.year}"
+    if form == 2:
+        return f"{ENGLISH_MONTHS[value.month - 1]} {value.day}, {value.year}"
+    if form == 3:
+        suffix = {1: "st", 2: "nd", 3: "rd"}.get(value.day % 10 if value.day not in (11, 12, 13) else 0, "th")
+        return f"{value.day}{suffix} day of {ENGLISH_MONTHS[value.month - 1]}, {value.year}"
+    if form == 4:
+        return f"{'1er' if value.day == 1 else value.day} {FRENCH_MONTHS[value.month - 1]} {value.year}"
+    if form == 5:
+        return f"{value.day} de {SPANISH_MONTHS[value.month - 1]} de {value.year}"
+    return f"{value.day}. {GERMAN_MONTHS[value.month - 1]} {value.year}"
+
+
+def labelled_contract(rng: random.Random, pages: int, seed: int):
+    """
+    Returns the chunks of a synthetic contract with labelled dates inserted and the
+    ISO date of each labelled field. Some fields are labelled twice with different dates.
+    """
+    # Boilerplate only, the metadata clauses of the corpus carry dates of their own
+    chunks = synthetic_contract(pages, metadata_rate=0.0, seed=seed)
+    numeric_order = rng.choice(["dmy", "mdy"])
+    truth, conflicting = {}, set()
+    for field_name in rng.sample(DATE_FIELDS, rng.randint(0, len(DATE_FIELDS))):
+        value = date(2020, 1, 1) + timedelta(days=rng.randrange(3650))
+        truth[field_name] = value.isoformat()
+        labels = [(value, rng.choice(LABELS[field_name]))]
+        if rng.random() < 0.1:
+            labels.append((value + timedelta(days=rng.randint(1, 400)), rng.choice(LABELS[field_name])))
+            conflicting.add(field_name)
+        for labelled_value, label in labels:
+            page = rng.randrange(pages)
+            chunks[page] += " " + label.format(write_date(rng, labelled_value, numeric_order)) + "."
+    return chunks, truth, conflicting
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    wrong, skipped, narrowed, resolved, labelled = [], 0, 0, 0, 0
+    seconds = 0.0
+    for n in range(args.count):
+        chunks, truth, conflicting = labelled_contract(rng, args.pages, args.seed + n)
+        start = time.perf_counter()
+        resolution = resolve_dates(chunks)
+        seconds += time.perf_counter() - start
+
+        labelled += len(truth)
+        resolved += len(resolution.resolved)
+        skipped += not resolution.pending
+        narrowed += bool(resolution.pending) and resolution.llm_fields is not None
+        for field_name, value in resolution.resolved.items():
+            if field_name in conflicting or truth.get(field_name) != value:
+                wrong.append((n, field_name, value, truth.get(field_name)))
+
+    print(
+        f"{args.count} contracts x {args.pages} pages | labelled fields resolved {resolved}/{labelled}"
+        f" | LLM skipped {skipped / args.count:.1%} | narrowed {narrowed / args.count:.1%}"
+        f" | {seconds / args.count * 1000:.2f} ms per contract | wrong {len(wrong)}"
+    )
+    for n, field_name, value, expected in wrong[:10]:
+        print(f"wrong: contract {n} {field_name} resolved to {value}, labelled {expected}")
+    if wrong:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Measures the local jurisdiction resolver: builds synthetic contracts with governing-law,
+venue and arbitration clauses naming gazetteer places, aliases (U.S., UK) and places
+within their country, next to party descriptions that name a place of incorporation.
+Checks that consistent clauses resolve to the expected jurisdiction, that conflicting
+governing-law clauses are left to the LLM, and reports how often the
+llm_call_for_jurisdiction call is skipped.
+
+    python -m services.insights.benchmarks.jurisdiction_resolver_benchmark
+    python -m services.insights.benchmarks.jurisdiction_resolver_benchmark --count 1000 --pages 20
+"""
+import argparse
+import random
+import time
+from services.insights.benchmarks.contract_corpus import synthetic_contract
+from services.insights.document_scanner import scan_document
+from services.insights.jurisdiction_resolver import resolve_jurisdiction
+
+MODULE_NAME = "jurisdiction_resolver_benchmark.py"
+
+STATES = ["New York", "California", "Delaware", "Texas", "Ontario", "Maharashtra", "Bavaria", "New South Wales"]
+STATE_COUNTRIES = {"New York": ("United States", "U.S."), "California": ("United States", "USA"), "Delaware": ("United States", "U.S.A."),
+                   "Texas": ("United States", "US"), "Ontario": ("Canada", "Canada"), "Maharashtra": ("India", "India"),
+                   "Bavaria": ("Germany", "Germany"), "New South Wales": ("Australia", "Australia")}
+COUNTRIES = {"Singapore": "Singapore", "United Kingdom": "UK", "England and Wales": "England and Wales", "Switzerland": "Switzerland",
+             "United Arab Emirates": "U.A.E.", "Hong Kong": "Hong Kong"}
+
+GOVERNING_LAW = [
+    "This Agreement shall be governed by and construed in accordance with the laws of {}",
+    "This Agreement is governed by the laws of the State of {}, without regard to its conflict of laws principles",
+    "The governing law of this Agreement shall be {}",
+]
+VENUE = [
+    "The parties submit to the exclusive jurisdiction of the courts of {}",
+    "Venue shall lie exclusively in {}",
+    "Any action shall be brought in the state and federal courts located in {}",
+]
+ARBITRATION = ["The seat of arbitration shall be {}", "Any dispute shall be finally resolved by arbitration seated in {}"]
+INCORPORATION = "{} Holdings Inc., a company organized under the laws of {}, is the Supplier"
+
+
+def jurisdiction_contract(rng: random.Random, pages: int, seed: int):
+    """
+    Returns the chunks of a synthetic contract and its expected jurisdiction, None when
+    its governing-law clauses conflict and the LLM must decide.
+    """
+    chunks = synthetic_contract(pages, metadata_rate=0.0, seed=seed)
+    clauses = [INCORPORATION.format("Acme", rng.choice(STATES + list(COUNTRIES)))]
+    shape = rng.randrange(4)
+    if shape == 0:
+        state = rng.choice(STATES)
+        alias = STATE_COUNTRIES[state][1]
+        clauses.append(rng.choice(GOVERNING_LAW).format(f"{state}, {alias}" if rng.random() < 0.5 else state))
+        expected = state
+    elif shape == 1:
+        law, venue = rng.sample(STATES, 2)
+        clauses += [rng.choice(GOVERNING_LAW).format(law), rng.choice(VENUE).format(venue)]
+        expected = f"{law} and {venue}"
+    elif shape == 2:
+        country = rng.choice(list(COUNTRIES))
+        clauses += [rng.choice(GOVERNING_LAW).format(COUNTRIES[country]), rng.choice(ARBITRATION).format(COUNTRIES[country])]
+        expected = country
+    else:
+        first, second = rng.sample(STATES, 2)
+        clauses += [rng.choice(GOVERNING_LAW).format(first), rng.choice(GOVERNING_LAW).format(second)]
+        expected = None
+    for clause in clauses:
+        chunks[rng.randrange(pages)] += " " + clause + "."
+    return chunks, expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=300)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    wrong, skipped, missed = [], 0, 0
+    seconds = 0.0
+    for n in range(args.count):
+        chunks, expected = jurisdiction_contract(rng, args.pages, args.seed + n)
+        filtered_text = scan_document(chunks, names=["jurisdiction_regex"]).windows["jurisdiction_regex"]
+        start = time.perf_counter()
+        resolution = resolve_jurisdiction(chunks, filtered_text)
+        seconds += time.perf_counter() - start
+
+        skipped += resolution.resolved
+        missed += expected is not None and not resolution.resolved
+        if resolution.resolved and resolution.value != expected:
+            wrong.append((n, resolution.value, expected))
+
+    print(
+        f"{args.count} contracts x {args.pages} pages | LLM skipped {skipped / args.count:.1%}"
+        f" | consistent contracts left to the LLM {missed} | {seconds / args.count * 1000:.2f} ms per contract | wrong {len(wrong)}"
+    )
+    for n, resolved, expected in wrong[:10]:
+        print(f"wrong: contract {n} resolved to {resolved}, expected {expected if expected is not None else 'the LLM'}")
+    if wrong:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Measures the in-process BM25 retriever that, with LOCAL_RETRIEVAL_ENABLED, replaces the
+per-question Pinecone query for files within LOCAL_RETRIEVAL_MAX_CHUNKS: the time to index a file, the time per question,
+and the R-precision of the chunks it returns: of the best min(top_k, matching) chunks,
+the share holding the clause a question asks about, next to that share for chunks drawn
+at random.
+
+    python -m services.insights.benchmarks.local_retriever_benchmark
+    python -m services.insights.benchmarks.local_retriever_benchmark --pages 20 200 300 --top-k 10
+"""
+import argparse
+import time
+from services.insights.benchmarks.contract_corpus import synthetic_contract
+from services.insights.local_retriever import LocalRetriever
+
+MODULE_NAME = "local_retriever_benchmark.py"
+
+# Field questions as the hybrid fallback asks them, with the text of the clause answering them
+QUERIES = {
+    "Effective Date": "effective",
+    "Termination Date": "terminates",
+    "Renewal Date": "renew",
+    "Delivery Date": "delivery of the deliverables",
+    "Payment Due Date": "payment due",
+    "Jurisdiction": "jurisdiction",
+    "Governing law": "governed by",
+    "Contract Value": "contract value",
+    "What is the annual licence fee?": "licence fee",
+}
+
+
+def measure(pages: int, top_k: int, repeat: int) -> dict:
+    chunks = synthetic_contract(pages, metadata_rate=0.02, seed=pages)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        retriever = LocalRetriever(chunks)
+    build_seconds = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        contexts = {query: retriever.retrieve(query, top_k) for query in QUERIES}
+    query_seconds = (time.perf_counter() - start) / (repeat * len(QUERIES))
+
+    precision, base_rate = [], []
+    for query, marker in QUERIES.items():
+        matching = sum(marker in chunk.lower() for chunk in chunks)
+        if contexts[query] and matching:
+            best = contexts[query][:min(top_k, matching)]
+            precision.append(sum(marker in chunk.lower() for chunk in best) / len(best))
+        base_rate.append(matching / len(chunks))
+    return {
+        "pages": pages,
+        "build_ms": build_seconds * 1000,
+        "query_us": query_seconds * 1e6,
+        "precision": sum(precision) / max(len(precision), 1),
+        "base_rate": sum(base_rate) / len(base_rate),
+        "scored": len(precision),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[20, 100, 200, 300])
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'build ms':>9} {'query us':>9} {'precision':>10} {'random':>7} {'scored':>9}")
+    for pages in args.pages:
+        result = measure(pages, args.top_k, args.repeat)
+        print(f"{result['pages']:>6} {result['build_ms']:>9.2f} {result['query_us']:>9.1f} {result['precision']:>10.2f} "
+              f"{result['base_rate']:>7.2f} {result['scored']:>5}/{len(QUERIES)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Compares the literal-prefiltered document scanner with the per-sentence re.search loop
+it replaces, on synthetic contracts or on text files.
+
+    python -m services.insights.benchmarks.regex_prefilter_benchmark --pages 10 100 500
+    python -m services.insights.benchmarks.regex_prefilter_benchmark --files contract.md
+"""
+import argparse
+import re
+import time
+from services.insights import document_scanner, regex_prefilter
+from services.insights.benchmarks.contract_corpus import synthetic_contract
+from services.insights.document_index import split_sentences
+from services.insights.document_scanner import FIELD_SCAN_SPECS, scan_document
+
+MODULE_NAME = "regex_prefilter_benchmark.py"
+
+
+def search_loop_hits(chunks):
+    """
+    The hits of the previous implementation: every filter searched over every sentence
+    outside the window of its last hit.
+    """
+    sentences = split_sentences("\n".join(chunks))
+    hits = {}
+    for name, spec in FIELD_SCAN_SPECS.items():
+        hits[name] = []
+        i = 0
+        while i < len(sentences):
+            if re.search(spec.pattern, sentences[i], spec.flags):
+                hits[name].append(i)
+                i = min(len(sentences), i + spec.sentences_after + 1)
+            else:
+                i += 1
+    return hits
+
+
+def scanner_hits(chunks, prefilter: bool):
+    """
+    The hits of the scanner with or without the prefilter. The document budget is
+    lifted: an unfiltered scan of a long contract can spend it, and the sentences left
+    would be matched by anchors only.
+    """
+    document_scanner.REGEX_PREFILTER_ENABLED = prefilter
+    budget = document_scanner.REGEX_DOCUMENT_BUDGET_SECONDS
+    document_scanner.REGEX_DOCUMENT_BUDGET_SECONDS = float("inf")
+    try:
+        return scan_document(chunks).hits
+    finally:
+        document_scanner.REGEX_PREFILTER_ENABLED = regex_prefilter.REGEX_PREFILTER_ENABLED
+        document_scanner.REGEX_DOCUMENT_BUDGET_SECONDS = budget
+
+
+def timed(fn, *args, repeat: int = 3):
+    """
+    Returns the result and best wall time of ``repeat`` runs.
+    """
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def run(label: str, chunks, repeat: int):
+    baseline, baseline_seconds = timed(search_loop_hits, chunks, repeat=repeat)
+    single_pass, single_pass_seconds = timed(scanner_hits, chunks, False, repeat=repeat)
+    prefiltered, prefiltered_seconds = timed(scanner_hits, chunks, True, repeat=repeat)
+    if not baseline == single_pass == prefiltered:
+        raise AssertionError(f"{label}: scanner hits differ from the re.search loop")
+    print(
+        f"{label:>12} | re.search loop {baseline_seconds:8.3f}s | single pass {single_pass_seconds:8.3f}s"
+        f" | prefiltered {prefiltered_seconds:8.3f}s | speedup x{baseline_seconds / prefiltered_seconds:5.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="*", default=[1, 10, 100])
+    parser.add_argument("--files", nargs="*", default=[])
+    parser.add_argument("--metadata-rate", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = "pyahocorasick" if regex_prefilter.ahocorasick is not None else "trie regex"
+    print(f"anchor search: {engine}")
+    for pages in args.pages:
+        run(f"{pages} pages", synthetic_contract(pages, args.metadata_rate), args.repeat)
+    for path in args.files:
+        with open(path, encoding="utf-8") as handle:
+            run(path[-12:], [handle.read()], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmarks the text preparation and regex filter stage: clean_and_split_sentences and
+extract_regex_chunks_with_words for each of date_pattern, jurisdiction_regex and
+contract_value_regex, through split_sentences and scan_document that those methods call.
+Reports sentences/sec, MB/sec, peak memory and hit sentences per pattern on synthetic
+contracts of 1, 10, 100 and 500 pages and on anonymised contract files. Runs offline.
+
+Results are compared with a JSON baseline, and the run fails when a throughput falls
+more than --max-regression below it. Baselines are machine specific: record one with
+--update-baseline on the machine that checks against it.
+
+    python -m services.insights.benchmarks.text_stage_benchmark --update-baseline
+    python -m services.insights.benchmarks.text_stage_benchmark
+    python -m services.insights.benchmarks.text_stage_benchmark --pages 10 --files contract.md --max-regression 0.1
+"""
+import argparse
+import json
+import os
+import platform
+import time
+import tracemalloc
+from services.insights.benchmarks.contract_corpus import synthetic_contract
+from services.insights.document_index import split_sentences
+from services.insights.document_scanner import FIELD_SCAN_SPECS, scan_document
+
+MODULE_NAME = "text_stage_benchmark.py"
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "text_stage.json")
+STAGES = ["clean_and_split_sentences", *FIELD_SCAN_SPECS]
+
+
+def stage_fn(stage: str):
+    """
+    Returns the function a stage runs on the chunks of a contract.
+    """
+    if stage == "clean_and_split_sentences":
+        return lambda chunks: split_sentences("\n".join(chunks))
+    return lambda chunks: scan_document(chunks, [stage])
+
+
+def measure(stage: str, chunks, repeat: int) -> dict:
+    """
+    Returns the best throughput of ``repeat`` runs of a stage, its peak traced memory and,
+    for the regex filters, the number of sentences windows were built around.
+    """
+    fn = stage_fn(stage)
+    sentence_count = len(split_sentences("\n".join(chunks)))
+    megabytes = sum(len(chunk.encode("utf-8")) for chunk in chunks) / 1e6
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(chunks)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    # Traced separately, tracemalloc slows the allocations it records
+    tracemalloc.start()
+    fn(chunks)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    measured = {
+        "seconds": round(best, 6),
+        "sentences_per_sec": round(sentence_count / best, 1),
+        "mb_per_sec": round(megabytes / best, 3),
+        "peak_memory_mb": round(peak / 1e6, 3),
+    }
+    if stage != "clean_and_split_sentences":
+        measured["hit_sentences"] = len(result.hits[stage])
+    return measured
+
+
+def corpus(pages_list, files, metadata_rate: float) -> dict:
+    """
+    Returns the chunks of each benchmark document keyed by its label.
+    """
+    documents = {f"{pages} pages": synthetic_contract(pages, metadata_rate) for pages in pages_list}
+    for path in files:
+        with open(path, encoding="utf-8") as handle:
+            documents[os.path.basename(path)] = [handle.read()]
+    return documents
+
+
+def regressions(results: dict, baseline: dict, max_regression: float) -> list:
+    """
+    Returns a line for every stage whose throughput fell more than ``max_regression`` below
+    the baseline, and for every pattern whose hit sentences changed.
+    """
+    lines = []
+    for label, stages in results.items():
+        for stage, measured in stages.items():
+            expected = baseline.get(label, {}).get(stage)
+            if expected is None:
+                continue
+            floor = expected["sentences_per_sec"] * (1 - max_regression)
+            if measured["sentences_per_sec"] < floor:
+                lines.append(
+                    f"{label} {stage}: {measured['sentences_per_sec']:.0f} sentences/sec"
+                    f" is below {floor:.0f} ({expected['sentences_per_sec']:.0f} baseline - {max_regression:.0%})"
+                )
+            if measured.get("hit_sentences") != expected.get("hit_sentences"):
+                lines.append(f"{label} {stage}: {measured.get('hit_sentences')} hit sentences, baseline {expected.get('hit_sentences')}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="*", default=[1, 10, 100, 500])
+    parser.add_argument("--files", nargs="*", default=[])
+    parser.add_argument("--metadata-rate", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = {}
+    for label, chunks in corpus(args.pages, args.files, args.metadata_rate).items():
+        results[label] = {stage: measure(stage, chunks, args.repeat) for stage in STAGES}
+        for stage, measured in results[label].items():
+            hits = f" | hits {measured['hit_sentences']:>5}" if "hit_sentences" in measured else ""
+            print(
+                f"{label:>12} | {stage:>25} | {measured['sentences_per_sec']:>10.0f} sentences/s"
+                f" | {measured['mb_per_sec']:>7.2f} MB/s | peak {measured['peak_memory_mb']:>7.2f} MB{hits}"
+            )
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump({"machine": platform.node(), "python": platform.python_version(), "results": results}, handle, indent=2, sort_keys=True)
+        print(f"baseline written to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}, record one with --update-baseline")
+        return
+    with open(args.baseline, encoding="utf-8") as handle:
+        baseline = json.load(handle)["results"]
+    failures = regressions(results, baseline, args.max_regression)
+    for line in failures:
+        print(f"regression: {line}")
+    if failures:
+        raise SystemExit(1)
+    print(f"within {args.max_regression:.0%} of the baseline")
+
+
+if __name__ == "__main__":
+    main()
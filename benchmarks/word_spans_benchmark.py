@@ -0,0 +1,103 @@
+"""
+Compares the offset-based head/tail trimming of word_spans with the nltk.word_tokenize
+trimming it replaced on contract sentences: how many trimmed windows end elsewhere and by
+how many nltk words at most, and the speed of both. Fails when a cut is more than
+--max-words-off words away from nltk's.
+
+    python -m services.insights.benchmarks.word_spans_benchmark --pages 100
+    python -m services.insights.benchmarks.word_spans_benchmark --files contract.md
+"""
+import argparse
+import time
+from services.insights.benchmarks.contract_corpus import synthetic_contract
+from services.insights.document_index import split_sentences
+from services.insights.document_scanner import FIELD_SCAN_SPECS
+from services.insights.word_spans import head_words, tail_words, word_spans
+
+MODULE_NAME = "word_spans_benchmark.py"
+
+
+def nltk_tokenizer():
+    """
+    Returns nltk.word_tokenize, or the word tokenizer alone when the Punkt data is
+    missing; the filtered sentences hold no periods, so Punkt never splits them further.
+    """
+    from nltk.tokenize import NLTKWordTokenizer, word_tokenize
+    try:
+        word_tokenize("Probe sentence")
+        return word_tokenize
+    except LookupError:
+        return NLTKWordTokenizer().tokenize
+
+
+def normalize(text: str) -> str:
+    """
+    Drops the spacing and quote rewriting nltk applies, leaving the selected characters.
+    """
+    return "".join(text.replace("``", '"').replace("''", '"').split())
+
+
+def tokens_covered(tokens, text: str) -> int:
+    """
+    Returns how many of the nltk tokens the trimmed text spans, from its start.
+    """
+    length, covered = len(normalize(text)), 0
+    for token in tokens:
+        length -= len(normalize(token))
+        if length < 0:
+            break
+        covered += 1
+    return covered
+
+
+def compare(sentences, tokenize):
+    """
+    Returns the (sentence, word limit, nltk words off) of the trimmed windows whose cut
+    differs from nltk's.
+    """
+    mismatches = []
+    for sentence in sentences:
+        tokens = tokenize(sentence)
+        spans = word_spans(sentence)
+        for max_words in sorted({spec.max_words for spec in FIELD_SCAN_SPECS.values()}):
+            expected = min(max_words, len(tokens))
+            head_off = abs(tokens_covered(tokens, head_words(sentence, max_words, spans)) - expected)
+            tail_off = abs(tokens_covered(tokens[::-1], tail_words(sentence, max_words, spans)) - expected)
+            if head_off or tail_off:
+                mismatches.append((sentence, max_words, max(head_off, tail_off)))
+    return mismatches
+
+
+def timed(fn, sentences):
+    start = time.perf_counter()
+    for sentence in sentences:
+        fn(sentence)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--files", nargs="*", default=[])
+    parser.add_argument("--max-words-off", type=int, default=2)
+    args = parser.parse_args()
+
+    chunks = synthetic_contract(args.pages, metadata_rate=0.3)
+    for path in args.files:
+        with open(path, encoding="utf-8") as handle:
+            chunks.append(handle.read())
+    sentences = split_sentences("\n".join(chunks))
+    tokenize = nltk_tokenizer()
+
+    mismatches = compare(sentences, tokenize)
+    for sentence, max_words, words_off in mismatches[:10]:
+        print(f"{words_off} words off at {max_words} words: {sentence!r}")
+    worst = max((words_off for _, _, words_off in mismatches), default=0)
+    print(f"{len(sentences)} sentences, {len(mismatches)} windows cut elsewhere, at most {worst} words off")
+    print(f"nltk {timed(tokenize, sentences):.3f}s | word_spans {timed(word_spans, sentences):.3f}s")
+    if worst > args.max_words_off:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
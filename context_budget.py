@@ -0,0 +1,129 @@
+import math
+from functools import lru_cache
+from typing import List, Union
+from config.config import config
+from services.insights.llm_metrics import metrics
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+MODULE_NAME = "context_budget.py"
+
+# Prompt context budgets in tokens, keyed by field name or by LLM entry point
+DEFAULT_CONTEXT_TOKEN_BUDGETS = {
+    "default": 4_000,
+    "llm_call_for_dates": 8_000,
+    "llm_call_for_jurisdiction": 3_000,
+    "llm_call_for_cv": 4_000,
+    "call_llm_for_fields": 12_000,
+}
+CONTEXT_TOKEN_BUDGETS = {**DEFAULT_CONTEXT_TOKEN_BUDGETS, **getattr(config, "CONTEXT_TOKEN_BUDGETS", {})}
+# A chunk crossing the budget is truncated to fit only when at least this many tokens remain
+MIN_TRUNCATED_CHUNK_TOKENS = getattr(config, "CONTEXT_MIN_TRUNCATED_CHUNK_TOKENS", 64)
+
+# Joins the sentences of a regex filter window. Normalised sentences hold no newline and
+# no period, so the window is split back into its sentences on it
+SENTENCE_SEPARATOR = "\n"
+
+
+@lru_cache(maxsize=8)
+def _encoding(model_name: str):
+    """
+    Returns the tiktoken encoding of a model, or None when tiktoken is unavailable.
+    """
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # The encoding files could not be loaded, e.g. no network on first use
+        return None
+
+
+def count_tokens(text: str, model_name: str = "gpt-4o") -> int:
+    """
+    Counts the tokens of ``text``, estimating four characters per token without tiktoken.
+    """
+    if not text:
+        return 0
+    encoding = _encoding(model_name)
+    if encoding is None:
+        return math.ceil(len(text) / 4)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model_name: str = "gpt-4o") -> str:
+    """
+    Returns the longest prefix of ``text`` holding at most ``max_tokens`` tokens.
+    """
+    encoding = _encoding(model_name)
+    if encoding is None:
+        return text[:max_tokens * 4]
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+
+
+def context_token_budget(name: str) -> int:
+    """
+    Returns the context budget of a field or LLM entry point.
+    """
+    return CONTEXT_TOKEN_BUDGETS.get(name, CONTEXT_TOKEN_BUDGETS["default"])
+
+
+def record_context_usage(function_name: str, tokens_in: int, tokens_kept: int):
+    """
+    Records the context tokens offered and kept for one call in the metrics registry.
+    """
+    metrics.increment("context_budget.tokens_in", tokens_in, function_name=function_name)
+    metrics.increment("context_budget.tokens_kept", tokens_kept, function_name=function_name)
+    metrics.observe("context_budget.tokens_saved", tokens_in - tokens_kept, function_name=function_name)
+
+
+def _dedupe_key(chunk: str) -> str:
+    return " ".join(chunk.split()).lower()
+
+
+def assemble_context(chunks: List[str], budget: int, function_name: str, model_name: str = "gpt-4o", whole_chunks: bool = False) -> List[str]:
+    """
+    Deduplicates ranked chunks, best first, and keeps those that fit the token budget.
+    The chunk that crosses the budget is truncated rather than dropped. With
+    ``whole_chunks`` it is skipped and later chunks that fit are kept, only a chunk
+    larger than the whole budget being truncated.
+    """
+    kept = []
+    seen = set()
+    tokens_in = 0
+    tokens_kept = 0
+    for chunk in chunks:
+        tokens = count_tokens(chunk, model_name)
+        tokens_in += tokens
+        key = _dedupe_key(chunk)
+        if not key or key in seen:
+            continue
+        seen.add(key)
+
+        remaining = budget - tokens_kept
+        if tokens <= remaining:
+            kept.append(chunk)
+            tokens_kept += tokens
+        elif remaining >= MIN_TRUNCATED_CHUNK_TOKENS and (not whole_chunks or tokens > budget):
+            kept.append(truncate_to_tokens(chunk, remaining, model_name))
+            tokens_kept += remaining
+
+    record_context_usage(function_name, tokens_in, tokens_kept)
+    return kept
+
+
+def assemble_text_context(text: Union[str, list], budget: int, function_name: str, model_name: str = "gpt-4o") -> Union[str, list]:
+    """
+    Applies assemble_context to a regex filter window, whole sentence by whole sentence
+    in document order, so a long sentence early in the window does not crowd out the
+    later ones. Empty filter results are returned unchanged.
+    """
+    if not text or not isinstance(text, str):
+        return text
+    sentences = text.split(SENTENCE_SEPARATOR)
+    return SENTENCE_SEPARATOR.join(assemble_context(sentences, budget, function_name, model_name, whole_chunks=True))
@@ -0,0 +1,237 @@
+import re
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import List, Optional, Union
+from config.config import config
+from services.insights.llm_metrics import metrics
+
+MODULE_NAME = "contract_value_parser.py"
+
+LOCAL_CONTRACT_VALUE_ENABLED = getattr(config, "LOCAL_CONTRACT_VALUE_ENABLED", True)
+CONTRACT_VALUE_MAX_HINTS = getattr(config, "CONTRACT_VALUE_MAX_HINTS", 20)
+
+_CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "¥": "JPY", "₹": "INR", "RMB": "CNY"}
+_CURRENCY_WORDS = {"dollar": "USD", "pound": "GBP", "euro": "EUR", "rupee": "INR", "dirham": "AED", "yuan": "CNY", "yen": "JPY"}
+_MULTIPLIERS = {"thousand": 10 ** 3, "lakh": 10 ** 5, "million": 10 ** 6, "crore": 10 ** 7, "billion": 10 ** 9}
+_UNITS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9,
+    "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16,
+    "seventeen": 17, "eighteen": 18, "nineteen": 19, "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
+    "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90,
+}
+
+_NUMBER = r"\d{1,3}(?:,\d{2,3})+(?:\.\d+)?|\d+(?:\.\d+)?"
+_MULTIPLIER = r"(?:thousand|lakhs?|million|crores?|billion)"
+# The symbol and ISO-code branch of contract_value_regex
+_ISO_CODES = ("AED", "USD", "INR", "GBP", "EUR", "CNY", "RMB", "JPY", "SAR")
+# The lookaheads on the first characters let re skip most positions without trying the alternations
+_SYMBOL_AMOUNT = re.compile(
+    rf"(?=[$€£¥₹acegijrsu])(?P<currency>[$€£¥₹]|(?<!\w)(?:{'|'.join(_ISO_CODES)}))\s?(?P<number>{_NUMBER})(?:\s*(?P<multiplier>{_MULTIPLIER})\b)?",
+    re.IGNORECASE,
+)
+# The spelled-out branch: number words or digits directly before a currency word
+_CURRENCY_WORD = re.compile(r"(?=[dprey])(?<!\w)(?P<currency>dollar|pound|euro|rupee|dirham|yuan|yen)s?\b", re.IGNORECASE)
+# Substrings one of which every amount contains, checked before running the regexes
+_AMOUNT_MARKERS = ("$", "€", "£", "¥", "₹", *(code.lower() for code in _ISO_CODES), *_CURRENCY_WORDS)
+_WORD_SEPARATOR = re.compile(r"\s+and\s+|\s+|-", re.IGNORECASE)
+_NUMBER_WORD = rf"(?:{'|'.join(_UNITS)}|hundred|{_MULTIPLIER}|{_NUMBER})"
+_SPELLED_NUMBER = re.compile(rf"\b(?P<words>{_NUMBER_WORD}(?:(?:\s+and\s+|\s+|-){_NUMBER_WORD})*)\s+$", re.IGNORECASE)
+_SPELLED_LOOKBEHIND_CHARS = 200
+
+# "total contract value of ...", "... in the aggregate"
+_TOTAL_BEFORE = re.compile(r"\b(?:total|aggregate)\b[^.;\n$€£¥₹]{0,60}$", re.IGNORECASE)
+_TOTAL_AFTER = re.compile(r"^[^.;\n]{0,15}\b(?:in\s+total|in\s+the\s+aggregate)\b", re.IGNORECASE)
+# Amounts per unit of time or quantity only add up to a total through the contract terms
+_RATE_AFTER = re.compile(
+    r"^\s*(?:\w+\s+){0,3}?(?:per|each|every|an?)\s+(?:hour|day|week|month|quarter|year|annum|unit|user|seat|licen[cs]e|item|installment)"
+    r"|^\s*(?:\w+\s+){0,3}?(?:hourly|daily|weekly|monthly|quarterly|annually|yearly|upfront|up\s+front|in\s+advance)\b"
+    r"|^\s*(?:\w+\s+){0,3}?(?:plus|and)\s",
+    re.IGNORECASE,
+)
+# Phrases in the sentence of an amount after which the prompt wants "null" or a judgement call
+_UNCERTAIN = re.compile(r"\b(?:subject\s+to\s+funding|confidential|to\s+be\s+(?:negotiated|agreed|determined)|tbd|estimated?|approximately|up\s+to)\b", re.IGNORECASE)
+# Words in the sentence of an amount that make it the price of the contract
+_VALUE_CUE = re.compile(r"\b(?:price|fees?|consideration|contract\s+(?:value|sum|amount)|pay(?:s|able|ments?)?|paid)\b", re.IGNORECASE)
+# Amounts the contract names that are not its value: penalties, liability caps, insurance, deposits
+_OTHER_CUE = re.compile(
+    r"\b(?:penalt(?:y|ies)|late|fines?|liabilit(?:y|ies)|liable|damages|indemni\w*|insurance|insured|deposits?|security|bond|retention|interest)\b",
+    re.IGNORECASE,
+)
+_SENTENCE_BREAK = re.compile(r"[.;]\s|\n")
+_SENTENCE_CHARS = 160
+_CONTEXT_CHARS = 60
+
+
+@dataclass(frozen=True)
+class Amount:
+    """
+    A currency amount found in the contract, as an integer of its currency.
+    """
+    value: int
+    currency: str
+    is_total: bool
+    is_rate: bool
+    is_uncertain: bool
+    is_value: bool
+    is_other: bool
+    context: str
+
+    def hint(self) -> str:
+        kind = (
+            "penalty, cap or deposit" if self.is_other else "stated total" if self.is_total
+            else "rate or part" if self.is_rate else "amount"
+        )
+        return f"{self.currency} {self.value} ({kind}): \"{self.context}\""
+
+
+@dataclass
+class ContractValueResolution:
+    """
+    The contract value when the amounts of the contract settle it without arithmetic
+    over the terms, else None with the parsed amounts to hand to the LLM as hints.
+    """
+    value: Optional[Union[int, str]] = None
+    reason: str = "llm"
+    amounts: List[Amount] = field(default_factory=list)
+
+    @property
+    def resolved(self) -> bool:
+        return self.value is not None
+
+    @property
+    def hints(self) -> List[str]:
+        """
+        One hint per distinct amount, at most CONTRACT_VALUE_MAX_HINTS.
+        """
+        distinct = {}
+        for amount in self.amounts:
+            distinct.setdefault((amount.value, amount.currency, amount.is_total, amount.is_rate), amount)
+        return [amount.hint() for amount in list(distinct.values())[:CONTRACT_VALUE_MAX_HINTS]]
+
+    def extraction(self) -> dict:
+        return {"Contract Value": self.value}
+
+
+def _decimal(number: str) -> Decimal:
+    return Decimal(number.replace(",", ""))
+
+
+def words_to_number(words: str) -> Optional[Decimal]:
+    """
+    Returns the value of a spelled-out number such as "one hundred and fifty thousand",
+    "5 million" or "two crore fifty lakh", or None when it does not read as one number.
+    """
+    total, current = Decimal(0), None
+    for token in _WORD_SEPARATOR.split(words.strip().lower()):
+        if token in _UNITS or re.fullmatch(_NUMBER, token):
+            value = Decimal(_UNITS[token]) if token in _UNITS else _decimal(token)
+            # "five five" or "20 30" are two numbers, not one
+            if current is not None and (value >= 10 and current % 100 != 0 or value < 10 and current % 10 != 0):
+                return None
+            current = (current or 0) + value
+        elif token == "hundred":
+            current = (current or 1) * 100
+        elif token.rstrip("s") in _MULTIPLIERS:
+            total += (current if current is not None else 1) * _MULTIPLIERS[token.rstrip("s")]
+            current = None
+        else:
+            return None
+    return total + (current or 0)
+
+
+def _integer(value: Decimal) -> int:
+    return int(value.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def _context(text: str, start: int, end: int) -> str:
+    return " ".join(text[max(0, start - _CONTEXT_CHARS):end + _CONTEXT_CHARS].split())
+
+
+def _amount(text: str, start: int, end: int, value: Decimal, currency: str) -> Amount:
+    before = text[max(0, start - _SENTENCE_CHARS):start]
+    after = text[end:end + _SENTENCE_CHARS]
+    sentence = _SENTENCE_BREAK.split(before)[-1] + _SENTENCE_BREAK.split(after)[0]
+    return Amount(
+        value=_integer(value),
+        currency=currency,
+        is_total=bool(_TOTAL_BEFORE.search(before) or _TOTAL_AFTER.search(after)),
+        is_rate=bool(_RATE_AFTER.search(after)),
+        is_uncertain=bool(_UNCERTAIN.search(sentence)),
+        is_value=bool(_VALUE_CUE.search(sentence)),
+        is_other=bool(_OTHER_CUE.search(sentence)),
+        context=_context(text, start, end),
+    )
+
+
+def parse_amounts(text: str) -> List[Amount]:
+    """
+    Returns the amounts contract_value_regex would capture in a text, with thousands
+    separators, decimals, multipliers and number words resolved to integers.
+    """
+    amounts, spans = [], []
+    lowered = text.lower()
+    if not any(marker in lowered for marker in _AMOUNT_MARKERS):
+        return amounts
+    for match in _SYMBOL_AMOUNT.finditer(text):
+        try:
+            value = _decimal(match.group("number"))
+        except InvalidOperation:
+            continue
+        if match.group("multiplier"):
+            value *= _MULTIPLIERS[match.group("multiplier").lower().rstrip("s")]
+        currency = match.group("currency").upper()
+        amounts.append(_amount(text, match.start(), match.end(), value, _CURRENCY_SYMBOLS.get(currency, currency)))
+        spans.append(match.span())
+    for match in _CURRENCY_WORD.finditer(text):
+        lookbehind = max(0, match.start() - _SPELLED_LOOKBEHIND_CHARS)
+        words = _SPELLED_NUMBER.search(text, lookbehind, match.start())
+        value = None
+        while words is not None:
+            value = words_to_number(words.group("words"))
+            if value is not None:
+                break
+            # Drop the leading word, e.g. the "3" of "clause 3 five million dollars"
+            separator = _WORD_SEPARATOR.search(text, words.start("words"), match.start())
+            words = _SPELLED_NUMBER.match(text, separator.end(), match.start()) if separator else None
+        if value is None:
+            continue
+        start = words.start("words")
+        # "$5 million dollars" is the symbol amount already found
+        if any(span_start <= start < span_end or start <= span_start < match.start() for span_start, span_end in spans):
+            continue
+        amounts.append(_amount(text, start, match.end(), value, _CURRENCY_WORDS[match.group("currency").lower()]))
+    return amounts
+
+
+def resolve_contract_value(chunks: Union[str, List[str]], filtered_text: Union[str, list]) -> ContractValueResolution:
+    """
+    Settles the contract value from the amounts in the document chunks when it needs no
+    arithmetic over the contract terms: a single stated total, or a single amount that is
+    not a rate and that a sentence calls a price, fee or consideration. Returns "null" when
+    the contract value filter found nothing for the LLM to read. Every other case, such as
+    a lone penalty, liability cap, insurance amount or deposit, is left to the LLM, with
+    the parsed amounts as hints.
+    """
+    if not LOCAL_CONTRACT_VALUE_ENABLED:
+        return ContractValueResolution()
+    chunks = [chunks] if isinstance(chunks, str) else chunks
+    filtered_text = filtered_text if isinstance(filtered_text, str) else ""
+
+    amounts = [amount for chunk in chunks for amount in parse_amounts(chunk)]
+    resolution = ContractValueResolution(amounts=amounts)
+    totals = {(amount.value, amount.currency) for amount in amounts if amount.is_total and not amount.is_other}
+    values = {(amount.value, amount.currency) for amount in amounts}
+    if not filtered_text.strip():
+        resolution.value, resolution.reason = "null", "no_amount"
+    elif not amounts or any(amount.is_uncertain for amount in amounts):
+        pass
+    elif len(totals) == 1:
+        resolution.value, resolution.reason = next(iter(totals))[0], "explicit_total"
+    elif (not totals and len(values) == 1 and any(amount.is_value for amount in amounts)
+          and not any(amount.is_rate or amount.is_other for amount in amounts)):
+        resolution.value, resolution.reason = next(iter(values))[0], "single_amount"
+
+    metrics.increment("contract_value_parser.files")
+    metrics.increment(f"contract_value_parser.{resolution.reason}")
+    metrics.increment("contract_value_parser.llm_skipped", 1 if resolution.resolved else 0)
+    return resolution
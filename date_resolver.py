@@ -0,0 +1,196 @@
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Union
+from config.config import config
+from services.insights.llm_metrics import metrics
+from services.insights.metadata_fields import DATE_FIELDS
+
+MODULE_NAME = "date_resolver.py"
+
+LOCAL_DATE_RESOLUTION_ENABLED = getattr(config, "LOCAL_DATE_RESOLUTION_ENABLED", True)
+
+_ENGLISH_MONTHS = {
+    "january": 1, "jan": 1, "february": 2, "feb": 2, "march": 3, "mar": 3, "april": 4, "apr": 4,
+    "may": 5, "june": 6, "jun": 6, "july": 7, "jul": 7, "august": 8, "aug": 8, "september": 9,
+    "sept": 9, "sep": 9, "october": 10, "oct": 10, "november": 11, "nov": 11, "december": 12, "dec": 12,
+}
+_FRENCH_MONTHS = {
+    "janvier": 1, "février": 2, "fevrier": 2, "mars": 3, "avril": 4, "mai": 5, "juin": 6, "juillet": 7,
+    "août": 8, "aout": 8, "septembre": 9, "octobre": 10, "novembre": 11, "décembre": 12, "decembre": 12,
+}
+_SPANISH_MONTHS = {
+    "enero": 1, "febrero": 2, "marzo": 3, "abril": 4, "mayo": 5, "junio": 6, "julio": 7, "agosto": 8,
+    "septiembre": 9, "setiembre": 9, "octubre": 10, "noviembre": 11, "diciembre": 12,
+}
+_GERMAN_MONTHS = {
+    "januar": 1, "jänner": 1, "februar": 2, "märz": 3, "maerz": 3, "april": 4, "mai": 5, "juni": 6,
+    "juli": 7, "august": 8, "september": 9, "oktober": 10, "november": 11, "dezember": 12,
+}
+
+
+def _words(names) -> str:
+    # Longest first, so "sept" is not cut to "sep"
+    return "|".join(sorted(map(re.escape, names), key=len, reverse=True))
+
+
+# The date forms date_pattern captures after a field label
+_DATE = re.compile(
+    rf"""
+      (?P<iso_y>\d{{4}})[-/.](?P<iso_m>\d{{1,2}})[-/.](?P<iso_d>\d{{1,2}})(?!\d)
+    | (?P<num_a>\d{{1,2}})[-/.](?P<num_b>\d{{1,2}})[-/.](?P<num_y>\d{{4}}|\d{{2}})(?!\d)
+    | (?P<mdy_m>{_words(_ENGLISH_MONTHS)})\.?\s+(?P<mdy_d>\d{{1,2}})(?:st|nd|rd|th)?,?\s+(?P<mdy_y>\d{{4}})(?!\d)
+    | (?P<dmy_d>\d{{1,2}})(?:st|nd|rd|th)?(?:\s+day)?(?:\s+of)?\s+(?P<dmy_m>{_words(_ENGLISH_MONTHS)})\.?,?\s+(?P<dmy_y>\d{{4}})(?!\d)
+    | (?P<fr_d>\d{{1,2}})(?:er|ère|ème|e)?\s+(?P<fr_m>{_words(_FRENCH_MONTHS)})\s+(?P<fr_y>\d{{4}})(?!\d)
+    | (?P<es_d>\d{{1,2}})\s+de\s+(?P<es_m>{_words(_SPANISH_MONTHS)})(?:\s+de)?\s+(?P<es_y>\d{{4}})(?!\d)
+    | (?P<de_d>\d{{1,2}})\.\s*(?P<de_m>{_words(_GERMAN_MONTHS)})\s+(?P<de_y>\d{{4}})(?!\d)
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+_NUMERIC_DATE = re.compile(r"(?<!\d)(\d{1,2})[-/.](\d{1,2})[-/.](?:\d{4}|\d{2})(?!\d)")
+
+# Labels after which the date belongs to the field without interpretation, the labelled
+# branches of date_pattern. Phrases the date prompt asks the LLM to tell apart, such as
+# "terminates on" (termination or expiration), are left to the LLM.
+_FIELD_LABELS = {
+    "Effective Date": r"effective\s+date|(?:is|shall\s+be|becomes?|made)\s+effective\s+(?:as\s+of|on|from)|effective\s+as\s+of",
+    "Termination Date": r"termination\s+date",
+    "Renewal Date": r"renewal\s+date|renew(?:ed)?\s+on",
+    "Expiration Date": r"expiration\s+date|expiry\s+date|expires?\s+on",
+    "Delivery Date": r"delivery\s+date",
+    "Term Date": r"term\s+date|term\s+(?:shall|will)\s+(?:begin|commence|start)\s+on",
+}
+_FIELD_GROUPS = {f"f{index}": field_name for index, field_name in enumerate(_FIELD_LABELS)}
+# The lookahead on the first letters of the labels lets re skip most positions without
+# trying the alternation
+_LABEL = re.compile(
+    r"(?<!\w)(?=[bdeimrst])(?:" + "|".join(f"(?P<{group}>{_FIELD_LABELS[name]})" for group, name in _FIELD_GROUPS.items()) + r")"
+    r"[\s*_:;|\-–—]*(?:(?:is|means|shall\s+be|will\s+be)\s+)?",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class DateResolution:
+    """
+    Date fields resolved from labelled dates and the remaining fields the LLM must be asked for.
+    """
+    resolved: Dict[str, str] = field(default_factory=dict)
+    ambiguous: List[str] = field(default_factory=list)
+
+    @property
+    def pending(self) -> List[str]:
+        return [name for name in DATE_FIELDS if name not in self.resolved]
+
+    @property
+    def llm_fields(self) -> Optional[List[str]]:
+        """
+        The fields to ask the LLM for, None when it is asked for all of them.
+        """
+        pending = self.pending
+        return None if len(pending) == len(DATE_FIELDS) else pending
+
+    def merge(self, llm_answer) -> dict:
+        """
+        Returns every date field: local values first, then the LLM answer for the pending ones.
+        """
+        llm_answer = llm_answer if isinstance(llm_answer, dict) else {}
+        merged = {}
+        for name in DATE_FIELDS:
+            if name in self.resolved:
+                merged[name] = self.resolved[name]
+            else:
+                merged[name] = llm_answer.get(name, "null")
+        return merged
+
+
+def _year(value: str) -> int:
+    year = int(value)
+    return year + 2000 if len(value) == 2 else year
+
+
+def _iso(year: int, month: int, day: int) -> Optional[str]:
+    try:
+        return date(year, month, day).isoformat()
+    except ValueError:
+        return None
+
+
+def numeric_convention(texts: Iterable[str]) -> Optional[str]:
+    """
+    Returns "dmy" or "mdy" when the numeric dates of a document that cannot be read both
+    ways agree on the order of day and month, else None.
+    """
+    day_first = month_first = False
+    for text in texts:
+        for first, second in _NUMERIC_DATE.findall(text):
+            day_first = day_first or int(first) > 12 >= int(second)
+            month_first = month_first or int(second) > 12 >= int(first)
+    if day_first == month_first:
+        return None
+    return "dmy" if day_first else "mdy"
+
+
+def parse_date(match: re.Match, convention: Optional[str] = None) -> Optional[str]:
+    """
+    Returns the ISO date of a _DATE match, or None when it is invalid or its day and
+    month cannot be told apart.
+    """
+    groups = match.groupdict()
+    if groups["iso_y"]:
+        return _iso(int(groups["iso_y"]), int(groups["iso_m"]), int(groups["iso_d"]))
+    if groups["num_a"]:
+        first, second, year = int(groups["num_a"]), int(groups["num_b"]), _year(groups["num_y"])
+        if first > 12 or (first != second and second <= 12 and convention == "dmy"):
+            return _iso(year, second, first)
+        if second > 12 or first == second or convention == "mdy":
+            return _iso(year, first, second)
+        return None
+    for prefix, months in (("mdy", _ENGLISH_MONTHS), ("dmy", _ENGLISH_MONTHS), ("fr", _FRENCH_MONTHS), ("es", _SPANISH_MONTHS), ("de", _GERMAN_MONTHS)):
+        if groups[f"{prefix}_m"]:
+            return _iso(int(groups[f"{prefix}_y"]), months[groups[f"{prefix}_m"].lower()], int(groups[f"{prefix}_d"]))
+    return None
+
+
+def labelled_dates(texts: Iterable[str]) -> Dict[str, List[Optional[str]]]:
+    """
+    Returns the dates following each field label, None for dates that cannot be read unambiguously.
+    """
+    texts = list(texts)
+    found = {}
+    convention = ...
+    for text in texts:
+        for label in _LABEL.finditer(text):
+            value = _DATE.match(text, label.end())
+            if value is None:
+                continue
+            if convention is ... and value.group("num_a"):
+                convention = numeric_convention(texts)
+            field_name = _FIELD_GROUPS[label.lastgroup]
+            found.setdefault(field_name, []).append(parse_date(value, None if convention is ... else convention))
+    return found
+
+
+def resolve_dates(chunks: Union[str, List[str]]) -> DateResolution:
+    """
+    Resolves the date fields the contract states with a label, e.g. "Effective Date: 2024-01-01",
+    from the document chunks. A field is resolved when all its labelled dates agree and
+    ambiguous when they do not. Every other field is left to the LLM, which reads relative
+    dates such as "for a period of two (2) years" from the date-filtered text.
+    """
+    if not LOCAL_DATE_RESOLUTION_ENABLED:
+        return DateResolution()
+    chunks = [chunks] if isinstance(chunks, str) else chunks
+
+    resolution = DateResolution()
+    for field_name, values in labelled_dates(chunks).items():
+        if None not in values and len(set(values)) == 1:
+            resolution.resolved[field_name] = values[0]
+        else:
+            resolution.ambiguous.append(field_name)
+
+    metrics.increment("date_resolver.files")
+    metrics.increment("date_resolver.resolved_fields", len(resolution.resolved))
+    metrics.increment("date_resolver.pending_fields", len(resolution.pending))
+    metrics.increment("date_resolver.llm_skipped", 0 if resolution.pending else 1)
+    return resolution
@@ -0,0 +1,153 @@
+import re
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence
+from services.insights.context_budget import count_tokens
+
+MODULE_NAME = "document_index.py"
+
+_MARKDOWN_IMAGE = re.compile(r'!\[.*?\]\(.*?\)')
+_MARKDOWN_LINK = re.compile(r'\[.*?\]\(.*?\)')
+_MARKDOWN_SYMBOLS = re.compile(r'[*_~`#+\-=|>\[\](){}!\\/<>]')
+_WHITESPACE = re.compile(r'\s+')
+_SENTENCE_END = re.compile(r'\.(?:\s|\||\*|,)*')
+
+
+def normalize_text(text: str) -> str:
+    """
+    Removes markdown links, images and special characters and collapses whitespace.
+    """
+    text = _MARKDOWN_IMAGE.sub('', text)
+    text = _MARKDOWN_LINK.sub('', text)
+    text = _MARKDOWN_SYMBOLS.sub('', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Cleans markdown/special characters and splits text into sentences.
+    """
+    return [s.strip() for s in _SENTENCE_END.split(normalize_text(text)) if s.strip()]
+
+
+def _sentence_offsets(text: str):
+    """
+    Returns the start and end offsets of the sentences split_sentences finds in normalised text.
+    """
+    starts, ends = array('I'), array('I')
+    position = 0
+    for boundary in _SENTENCE_END.finditer(text + "."):
+        start, end = position, boundary.start()
+        position = boundary.end()
+        # Normalised text holds no whitespace but single spaces
+        start += text.startswith(" ", start)
+        end -= end > start and text[end - 1] == " "
+        if start < end:
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
+
+class _Sentences(Sequence):
+    """
+    The sentences of a DocumentIndex, sliced from its text on access.
+    """
+
+    def __init__(self, index: "DocumentIndex"):
+        self._index = index
+
+    def __len__(self):
+        return len(self._index.sentence_starts)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return self._index.text[self._index.sentence_starts[i]:self._index.sentence_ends[i]]
+
+
+class DocumentIndex:
+    """
+    The normalised text of one file with the offsets of each chunk, the offsets, chunk, page
+    and token count of each sentence and the sentences each regex filter hit. Built once per
+    file and shared by the extraction stages; chunks and sentences are kept as array offsets
+    into the text, not as strings.
+    """
+
+    def __init__(self, text: str, chunk_starts: array, chunk_ends: array, sentence_starts: array, sentence_ends: array,
+                 sentence_chunks: array, page_numbers: Sequence[int]):
+        self.text = text
+        self.chunk_starts = chunk_starts
+        self.chunk_ends = chunk_ends
+        self.sentence_starts = sentence_starts
+        self.sentence_ends = sentence_ends
+        self.sentence_chunks = sentence_chunks
+        self.page_numbers = array('I', page_numbers)
+        self.sentences = _Sentences(self)
+        # Sentence indexes of the hits of each regex filter, filled in by scan_document
+        self.hits: Dict[str, array] = {}
+        self._sentence_tokens: Optional[array] = None
+
+    @classmethod
+    def build(cls, chunks: List[str], page_numbers: Optional[Sequence[int]] = None) -> "DocumentIndex":
+        """
+        Normalises and segments the chunks. ``page_numbers`` gives the page of each chunk,
+        by default its position counted from 1.
+        """
+        pieces, piece_starts, piece_chunks = [], array('I'), array('I')
+        chunk_starts, chunk_ends = array('I'), array('I')
+        length = 0
+        for chunk_id, chunk in enumerate(chunks):
+            piece = normalize_text(chunk)
+            if piece:
+                length += bool(pieces)
+                piece_starts.append(length)
+                piece_chunks.append(chunk_id)
+                pieces.append(piece)
+            chunk_starts.append(length)
+            length += len(piece)
+            chunk_ends.append(length)
+        # Equal to normalising the newline-joined chunks, as split_sentences does
+        text = " ".join(pieces)
+
+        sentence_starts, sentence_ends = _sentence_offsets(text)
+        sentence_chunks = array('I', (piece_chunks[bisect_right(piece_starts, start) - 1] for start in sentence_starts))
+        if page_numbers is None:
+            page_numbers = range(1, len(chunks) + 1)
+        return cls(text, chunk_starts, chunk_ends, sentence_starts, sentence_ends, sentence_chunks, page_numbers)
+
+    def __len__(self):
+        return len(self.sentence_starts)
+
+    @property
+    def chunk_count(self) -> int:
+        return len(self.chunk_starts)
+
+    def chunk_text(self, chunk_id: int) -> str:
+        """
+        Returns the normalised text of a chunk, empty for chunks holding only markup.
+        """
+        return self.text[self.chunk_starts[chunk_id]:self.chunk_ends[chunk_id]]
+
+    def sentence(self, i: int) -> str:
+        return self.text[self.sentence_starts[i]:self.sentence_ends[i]]
+
+    def chunk_of(self, i: int) -> int:
+        return self.sentence_chunks[i]
+
+    def page_of(self, i: int) -> int:
+        return self.page_numbers[self.sentence_chunks[i]]
+
+    @property
+    def sentence_tokens(self) -> array:
+        """
+        Token counts of the sentences, counted on first use.
+        """
+        if self._sentence_tokens is None:
+            self._sentence_tokens = array('I', (count_tokens(sentence) for sentence in self.sentences))
+        return self._sentence_tokens
+
+    def token_count(self, start: int = 0, end: Optional[int] = None) -> int:
+        """
+        Returns the tokens of the sentences from ``start`` up to ``end``.
+        """
+        return sum(self.sentence_tokens[start:end])
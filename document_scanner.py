@@ -0,0 +1,205 @@
+import re
+import time
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Union
+from config.config import config
+from services.insights.context_budget import SENTENCE_SEPARATOR
+from services.insights.document_index import DocumentIndex
+from services.insights.llm_metrics import metrics
+from services.insights.metadata_patterns import contract_value_regex, date_pattern, jurisdiction_regex
+from services.insights.regex_prefilter import REGEX_PREFILTER_ENABLED, AnchorPrefilter, restrict_pattern
+from services.insights.word_spans import head_words, tail_words, word_spans
+from utils.logger import _log_message
+
+try:
+    import regex
+except ImportError:
+    regex = None
+
+MODULE_NAME = "document_scanner.py"
+
+# Matching time limits. The regex backend stops a search once its limit passes; re cannot
+# be interrupted, so without it sentences longer than REGEX_MAX_SENTENCE_CHARS are not run.
+# Sentences that are not matched in time fall back to their literal anchors.
+REGEX_SENTENCE_TIMEOUT_SECONDS = getattr(config, "REGEX_SENTENCE_TIMEOUT_SECONDS", 0.05)
+REGEX_DOCUMENT_BUDGET_SECONDS = getattr(config, "REGEX_DOCUMENT_BUDGET_SECONDS", 10.0)
+REGEX_MAX_SENTENCE_CHARS = getattr(config, "REGEX_MAX_SENTENCE_CHARS", 1500)
+# Sentences up to this length are matched with re, about 2.5x faster than the regex module.
+# The worst adversarial sentence of 500 characters takes re about 15 ms, well within the
+# sentence timeout, so only longer sentences need the timeout of the regex module.
+REGEX_TIMEOUT_MIN_CHARS = getattr(config, "REGEX_TIMEOUT_MIN_CHARS", 500)
+
+
+@dataclass(frozen=True)
+class FieldScanSpec:
+    """
+    A regex filter and the window of sentences kept around each of its hits.
+    The first and last sentences of a window are trimmed to ``max_words`` words.
+    """
+    pattern: str
+    flags: int
+    sentences_before: int
+    sentences_after: int
+    max_words: int
+
+
+# Keyed by the pattern names MetaDataExtractor.extract_regex_chunks_with_words accepts
+FIELD_SCAN_SPECS = {
+    "date_pattern": FieldScanSpec(date_pattern, re.VERBOSE, 2, 2, 45),
+    "jurisdiction_regex": FieldScanSpec(jurisdiction_regex, re.VERBOSE, 1, 1, 30),
+    "contract_value_regex": FieldScanSpec(contract_value_regex, re.VERBOSE | re.IGNORECASE, 2, 1, 50),
+}
+
+@dataclass
+class ScanResult:
+    """
+    Sentences of a document, the indexes of the sentences each filter's windows were
+    built around and the combined context window of each filter ([] when it matched nothing).
+    """
+    sentences: Sequence[str]
+    hits: Dict[str, List[int]]
+    windows: Dict[str, Union[str, list]]
+
+
+def _backend(sentence: str):
+    """
+    Returns the module to match a sentence with: re for sentences up to
+    REGEX_TIMEOUT_MIN_CHARS, else the regex module when installed, as it supports match timeouts.
+    """
+    if regex is None or len(sentence) <= REGEX_TIMEOUT_MIN_CHARS:
+        return re
+    return regex
+
+
+@lru_cache(maxsize=1024)
+def _compiled_filter(name: str, branches, backend=re):
+    """
+    Returns a filter restricted to ``branches`` (None keeps the whole filter), compiled
+    with ``backend``.
+    """
+    spec = FIELD_SCAN_SPECS[name]
+    return backend.compile(restrict_pattern(spec.pattern, spec.flags, branches), spec.flags)
+
+
+@lru_cache(maxsize=8)
+def _anchor_prefilter(names: tuple) -> AnchorPrefilter:
+    """
+    Returns the literal prefilter of the filters.
+    """
+    return AnchorPrefilter({name: (FIELD_SCAN_SPECS[name].pattern, FIELD_SCAN_SPECS[name].flags) for name in names})
+
+
+def _match_deadline(sentence: str, document_deadline: float, backend) -> Optional[float]:
+    """
+    Returns the time by which matching a sentence must end (None when the backend cannot
+    enforce one), raising TimeoutError when the sentence must not be matched at all.
+    """
+    now = time.perf_counter()
+    if now >= document_deadline:
+        raise TimeoutError("Regex matching budget of the document is spent")
+    if backend is re:
+        if len(sentence) > REGEX_MAX_SENTENCE_CHARS:
+            raise TimeoutError(f"Sentence of {len(sentence)} characters is too long to match with re")
+        return None
+    return min(now + REGEX_SENTENCE_TIMEOUT_SECONDS, document_deadline)
+
+
+def _timeout(deadline: Optional[float]) -> dict:
+    """
+    Returns the timeout keyword of a regex module call ending by ``deadline``.
+    """
+    if deadline is None:
+        return {}
+    remaining = deadline - time.perf_counter()
+    if remaining <= 0:
+        raise TimeoutError("Regex matching deadline passed")
+    return {"timeout": remaining}
+
+
+def _sentence_hits(sentence: str, patterns: dict, deadline: Optional[float] = None) -> List[str]:
+    """
+    Returns the filters matching a sentence, searching each with its own compiled
+    pattern. Raises TimeoutError when the searches do not end by ``deadline``.
+    """
+    return [name for name, pattern in patterns.items() if pattern.search(sentence, **_timeout(deadline))]
+
+
+def _field_window(sentences: Sequence[str], hit_indexes: List[int], spec: FieldScanSpec, spans: dict) -> Union[str, list]:
+    """
+    Joins the windows around the hits of one filter with SENTENCE_SEPARATOR, never
+    repeating a sentence. ``spans`` caches the word offsets of sentences across filters.
+    """
+    combined_text = []
+    seen_sentences = set()
+    for i in hit_indexes:
+        start = max(0, i - spec.sentences_before)
+        end = min(len(sentences), i + spec.sentences_after + 1)
+        for j, index in enumerate(range(start, end)):
+            sent = sentences[index]
+            if sent in seen_sentences:
+                continue
+            if j == 0 and i > 0:  # Sentence before
+                if index not in spans:
+                    spans[index] = word_spans(sent)
+                combined_text.append(tail_words(sent, spec.max_words, spans[index]))
+            elif j == end - start - 1 and i + 1 < len(sentences):  # Sentence after
+                if index not in spans:
+                    spans[index] = word_spans(sent)
+                combined_text.append(head_words(sent, spec.max_words, spans[index]))
+            else:
+                combined_text.append(sent)
+            seen_sentences.add(sent)
+    return SENTENCE_SEPARATOR.join(combined_text) if combined_text else []
+
+
+def scan_document(document: Union[List[str], DocumentIndex], names: Optional[Sequence[str]] = None, logger=None) -> ScanResult:
+    """
+    Runs every regex filter over the sentences of a document, segmented once, returning the hit sentence indexes and context window of each filter. The hits are
+    also recorded on the DocumentIndex; a list of chunks is indexed first.
+    """
+    start_time = time.perf_counter()
+    names = tuple(names or FIELD_SCAN_SPECS)
+    index = document if isinstance(document, DocumentIndex) else DocumentIndex.build(document)
+    sentences = index.sentences
+    document_deadline = start_time + REGEX_DOCUMENT_BUDGET_SECONDS
+
+    # Branches none of whose required literals occur in a sentence are never run on it
+    prefilter = _anchor_prefilter(names)
+    active_branches = prefilter.active_branches(sentences) if REGEX_PREFILTER_ENABLED else None
+
+    hits = {name: [] for name in names}
+    # A filter is not searched again until past the window of its last hit
+    next_index = dict.fromkeys(names, 0)
+    fallback_sentences = 0
+    for i, sentence in enumerate(sentences):
+        branches = active_branches[i] if active_branches is not None else dict.fromkeys(names)
+        active = tuple((name, branches[name]) for name in names if next_index[name] <= i and name in branches)
+        if not active:
+            continue
+        # Compiled before the sentence's deadline starts, a first compile is not matching time
+        backend = _backend(sentence)
+        patterns = {name: _compiled_filter(name, branches, backend) for name, branches in active}
+        try:
+            matched = _sentence_hits(sentence, patterns, _match_deadline(sentence, document_deadline, backend))
+        except TimeoutError:
+            matched = prefilter.anchor_matches(sentence, [name for name, _ in active])
+            fallback_sentences += 1
+        for name in matched:
+            hits[name].append(i)
+            next_index[name] = i + FIELD_SCAN_SPECS[name].sentences_after + 1
+    index.hits.update((name, array('I', indexes)) for name, indexes in hits.items())
+    spans = {}
+    windows = {name: _field_window(sentences, hits[name], FIELD_SCAN_SPECS[name], spans) for name in names}
+
+    elapsed = time.perf_counter() - start_time
+    metrics.observe("document_scanner.seconds", elapsed)
+    metrics.observe("document_scanner.sentences", len(sentences))
+    metrics.increment("document_scanner.anchor_fallback_sentences", fallback_sentences)
+    if logger and fallback_sentences:
+        logger.warning(_log_message(f"{fallback_sentences} sentences exceeded the regex time budget and were matched by anchors only", "scan_document", MODULE_NAME))
+    if logger:
+        hit_counts = {name: len(indexes) for name, indexes in hits.items()}
+        logger.info(_log_message(f"Scanned {len(sentences)} sentences in {elapsed:.3f}s, hits: {hit_counts}", "scan_document", MODULE_NAME))
+    return ScanResult(sentences, hits, windows)
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional
+from config.config import config
+from services.insights.document_index import DocumentIndex, normalize_text, split_sentences
+from services.insights.llm_metrics import metrics
+
+MODULE_NAME = "extraction_provenance.py"
+
+# Provenance settings, overridable from config
+EXTRACTION_PROVENANCE_ENABLED = getattr(config, "EXTRACTION_PROVENANCE_ENABLED", True)
+EXTRACTION_PROVENANCE_PATH = getattr(config, "EXTRACTION_PROVENANCE_PATH", os.path.join(tempfile.gettempdir(), "extraction_provenance.sqlite3"))
+EXTRACTION_PROVENANCE_TTL_SECONDS = getattr(config, "EXTRACTION_PROVENANCE_TTL_SECONDS", 180 * 24 * 60 * 60)
+
+
+def content_hash(text: str) -> str:
+    """
+    Returns the content address of a normalised chunk or sentence.
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def support_hashes(texts: Iterable[str]) -> dict:
+    """
+    Returns the chunk and sentence hashes of the context an answer was extracted from.
+    """
+    texts = list(texts)
+    return {
+        "chunks": sorted({content_hash(normalize_text(text)) for text in texts}),
+        "sentences": sorted({content_hash(sentence) for text in texts for sentence in split_sentences(text)}),
+    }
+
+
+class DocumentFingerprint:
+    """
+    Chunk and sentence hashes of one version of a document.
+    """
+
+    def __init__(self, index: DocumentIndex):
+        self._index = index
+        self.chunk_hashes = [content_hash(index.chunk_text(chunk_id)) for chunk_id in range(index.chunk_count)]
+        self._chunk_set = set(self.chunk_hashes)
+        self._sentence_set = None
+
+    def _sentences(self) -> set:
+        if self._sentence_set is None:
+            self._sentence_set = {content_hash(sentence) for sentence in self._index.sentences}
+        return self._sentence_set
+
+    def contains(self, support: dict) -> bool:
+        """
+        Checks that every chunk of the supporting context, or else every one of its
+        sentences, occurs unchanged in this version. Empty support never does.
+        """
+        if not support.get("chunks"):
+            return False
+        if all(chunk_hash in self._chunk_set for chunk_hash in support["chunks"]):
+            return True
+        # Retrieved chunks may be cut differently from the uploaded ones
+        sentences = support.get("sentences")
+        return bool(sentences) and all(sentence_hash in self._sentences() for sentence_hash in sentences)
+
+
+@dataclass
+class FileProvenance:
+    """
+    What one extraction of a file was derived from: the hashes of its chunks, the input
+    hash and LLM result of each regex-filtered call, and the answer of each question
+    field with the chunks and sentences of the context it was extracted from.
+    """
+    chunk_hashes: List[str]
+    stages: Dict[str, dict] = field(default_factory=dict)
+    fields: Dict[str, dict] = field(default_factory=dict)
+
+    def record_stage(self, stage: str, input_text, result):
+        # Stored through JSON so later in-place merges do not reach the record
+        self.stages[stage] = {"input": content_hash(input_text if isinstance(input_text, str) else ""), "result": json.loads(json.dumps(result))}
+
+    def stage_result(self, stage: str, input_text):
+        """
+        Returns the recorded result of a regex-filtered call when its input is unchanged, else None.
+        """
+        record = self.stages.get(stage)
+        if record is None or record["input"] != content_hash(input_text if isinstance(input_text, str) else ""):
+            return None
+        return json.loads(json.dumps(record["result"]))
+
+    def record_field(self, field_name: str, answer: dict, support: dict):
+        self.fields[field_name] = {"answer": json.loads(json.dumps(answer)), "support": support}
+
+    def field_answer(self, field_name: str, fingerprint: DocumentFingerprint) -> Optional[dict]:
+        """
+        Returns the recorded answer of a field when its supporting text is unchanged, else None.
+        """
+        record = self.fields.get(field_name)
+        if record is None or not fingerprint.contains(record["support"]):
+            return None
+        return json.loads(json.dumps(record["answer"]))
+
+
+class SupportLedger:
+    """
+    Per-file record of the context retrieved for each question field during a run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._files = defaultdict(dict)
+
+    def record(self, file_id, field_name: str, texts: List[str]):
+        if not EXTRACTION_PROVENANCE_ENABLED:
+            return
+        support = support_hashes(texts)
+        with self._lock:
+            self._files[file_id][field_name] = support
+
+    def pop(self, file_id) -> Dict[str, dict]:
+        """
+        Returns and forgets the supports recorded for a file.
+        """
+        with self._lock:
+            return self._files.pop(file_id, {})
+
+
+support_ledger = SupportLedger()
+
+
+class ProvenanceStore:
+    """
+    SQLite store of FileProvenance records keyed by file_id. Records expire after
+    ``ttl_seconds``. Disk errors never fail an extraction; they are counted and the
+    file is extracted from scratch.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = self._open(path)
+
+    def _open(self, path):
+        try:
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS extraction_provenance (
+                    file_id TEXT PRIMARY KEY,
+                    record TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+            return conn
+        except sqlite3.Error:
+            metrics.increment("extraction_provenance.disk_errors")
+            return None
+
+    def load(self, file_id) -> Optional[FileProvenance]:
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT record FROM extraction_provenance WHERE file_id = ? AND created_at > ?",
+                    (str(file_id), time.time() - self.ttl_seconds),
+                ).fetchone()
+        except sqlite3.Error:
+            metrics.increment("extraction_provenance.disk_errors")
+            return None
+        return FileProvenance(**json.loads(row[0])) if row else None
+
+    def save(self, file_id, provenance: FileProvenance):
+        if self._conn is None:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO extraction_provenance (file_id, record, created_at) VALUES (?, ?, ?)",
+                    (str(file_id), json.dumps(asdict(provenance)), now),
+                )
+                self._conn.execute("DELETE FROM extraction_provenance WHERE created_at <= ?", (now - self.ttl_seconds,))
+        except sqlite3.Error:
+            metrics.increment("extraction_provenance.disk_errors")
+
+
+_provenance_store = None
+_provenance_store_lock = threading.Lock()
+
+
+def get_provenance_store() -> Optional[ProvenanceStore]:
+    """
+    Returns the process-wide provenance store, or None when provenance is disabled.
+    """
+    global _provenance_store
+    if not EXTRACTION_PROVENANCE_ENABLED:
+        return None
+    if _provenance_store is None:
+        with _provenance_store_lock:
+            if _provenance_store is None:
+                _provenance_store = ProvenanceStore(EXTRACTION_PROVENANCE_PATH, EXTRACTION_PROVENANCE_TTL_SECONDS)
+    return _provenance_store
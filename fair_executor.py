@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+from config.config import config
+from opentelemetry import context as ot_context
+from services.insights.llm_metrics import metrics
+
+MODULE_NAME = "fair_executor.py"
+
+# Threads running retrieval and LLM calls across every file in flight
+LLM_EXECUTOR_MAX_WORKERS = getattr(config, "LLM_EXECUTOR_MAX_WORKERS", 32)
+# Relative share of the workers per org_id when orgs compete, 1 for orgs not listed
+LLM_EXECUTOR_ORG_WEIGHTS = getattr(config, "LLM_EXECUTOR_ORG_WEIGHTS", {})
+
+
+@dataclass
+class _WorkItem:
+    future: Future
+    fn: Callable
+    args: tuple
+    kwargs: dict
+    parent_ctx: Any
+    queued_at: float = field(default_factory=time.perf_counter)
+
+
+class FairExecutor:
+    """
+    Process-wide worker pool with a global concurrency limit and deficit round robin
+    across the queues of each org: every turn an org is credited its weight and runs
+    that many tasks, so an org with a large backfill cannot starve the others.
+
+    Tasks run under the OpenTelemetry context of their submitter, as with
+    submit_with_context. They must not wait on other tasks of the pool, which could
+    then have no worker left to run them.
+    """
+
+    def __init__(self, max_workers: int = LLM_EXECUTOR_MAX_WORKERS, weights: Optional[Dict[str, float]] = None):
+        self.max_workers = max_workers
+        self.weights = LLM_EXECUTOR_ORG_WEIGHTS if weights is None else weights
+        self._condition = threading.Condition()
+        self._queues: Dict[str, deque] = {}
+        # Orgs with queued tasks, the one being served first
+        self._ring = deque()
+        self._deficits: Dict[str, float] = {}
+        self._workers = []
+        self._idle_workers = 0
+
+    def _weight(self, org_id: str) -> float:
+        return max(float(self.weights.get(org_id, 1)), 0.01)
+
+    def submit(self, org_id, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Queues ``fn(*args, **kwargs)`` for ``org_id`` and returns its future.
+        """
+        org_id = str(org_id)
+        item = _WorkItem(Future(), fn, args, kwargs, ot_context.get_current())
+        with self._condition:
+            if org_id not in self._queues:
+                self._queues[org_id] = deque()
+                self._deficits[org_id] = 0.0
+                self._ring.append(org_id)
+            self._queues[org_id].append(item)
+            depth = sum(len(queue) for queue in self._queues.values())
+            # Idle workers may already be woken for earlier tasks of a burst, so one is
+            # started for every queued task beyond them
+            if depth > self._idle_workers and len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._work, name=f"fair-executor-{len(self._workers)}", daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            self._condition.notify()
+        metrics.observe("fair_executor.queue_depth", depth)
+        return item.future
+
+    def _next_item(self) -> _WorkItem:
+        """
+        Pops the next task by deficit round robin. Called with the condition held and
+        at least one task queued.
+        """
+        while True:
+            org_id = self._ring[0]
+            if self._deficits[org_id] >= 1:
+                self._deficits[org_id] -= 1
+                queue = self._queues[org_id]
+                item = queue.popleft()
+                if not queue:
+                    # An org that runs out of tasks keeps no credit for its next turn
+                    self._ring.popleft()
+                    del self._queues[org_id], self._deficits[org_id]
+                return item
+            self._ring.rotate(-1)
+            self._deficits[self._ring[0]] += self._weight(self._ring[0])
+
+    def _work(self):
+        while True:
+            with self._condition:
+                self._idle_workers += 1
+                while not self._ring:
+                    self._condition.wait()
+                self._idle_workers -= 1
+                item = self._next_item()
+            if not item.future.set_running_or_notify_cancel():
+                continue
+            metrics.observe("fair_executor.wait_seconds", time.perf_counter() - item.queued_at)
+            token = ot_context.attach(item.parent_ctx)
+            try:
+                item.future.set_result(item.fn(*item.args, **item.kwargs))
+            except BaseException as e:
+                item.future.set_exception(e)
+            finally:
+                ot_context.detach(token)
+
+    def queue_depths(self) -> Dict[str, int]:
+        """
+        Returns the number of queued tasks of each org.
+        """
+        with self._condition:
+            return {org_id: len(queue) for org_id, queue in self._queues.items()}
+
+
+fair_executor = FairExecutor()
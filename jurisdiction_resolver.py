@@ -0,0 +1,214 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Union
+from config.config import config
+from services.insights.llm_metrics import metrics
+from services.insights.metadata_patterns import jurisdiction_regex
+
+MODULE_NAME = "jurisdiction_resolver.py"
+
+LOCAL_JURISDICTION_ENABLED = getattr(config, "LOCAL_JURISDICTION_ENABLED", True)
+
+# The country each group of place names in jurisdiction_regex belongs to, keyed by the
+# start of the group's comment; places of other groups are countries or regions
+_GROUP_PARENTS = {
+    "US States": "United States",
+    "Canadian": "Canada",
+    "Australian": "Australia",
+    "Indian": "India",
+    "UK": "United Kingdom",
+    "Chinese": "China",
+    "Brazilian": "Brazil",
+    "Mexican": "Mexico",
+    "German": "Germany",
+    "Russian": "Russia",
+}
+# Other names of gazetteer places, and jurisdictions named as one
+_ALIASES = {
+    "United States": ["USA", "U.S.A.", "US", "U.S.", "United States of America"],
+    "United Kingdom": ["UK", "U.K.", "Great Britain"],
+    "United Arab Emirates": ["UAE", "U.A.E."],
+    "China": ["PRC", "P.R.C.", "People's Republic of China"],
+    "South Korea": ["ROK", "R.O.K.", "Republic of Korea"],
+    "District of Columbia": ["Washington D.C.", "Washington, D.C.", "D.C.", "DC"],
+    "Russia": ["Russian Federation"],
+    "Czech Republic": ["Czechia"],
+}
+_COMPOSITE_PLACES = {"England and Wales": "United Kingdom"}
+
+
+@dataclass(frozen=True)
+class Place:
+    name: str
+    parent: Optional[str] = None
+
+
+def _gazetteer_entries():
+    """
+    Yields (name, group) for the place names listed in jurisdiction_regex. Optional parts
+    such as "United States(?: of America)?" give both names.
+    """
+    block = jurisdiction_regex[jurisdiction_regex.index("# Countries"):]
+    group = ""
+    for line in block.splitlines():
+        line = line.strip()
+        if line.startswith("#"):
+            group = line.lstrip("# ")
+            continue
+        for entry in line.split("|"):
+            entry = entry.strip()
+            if not entry or entry.startswith(")"):
+                continue
+            entry = entry.replace(r"\s+", " ").replace(r"\.", ".")
+            optional = re.fullmatch(r"(.*?)\(\?:(.*)\)\?", entry)
+            if optional:
+                yield optional.group(1), group
+                yield optional.group(1) + optional.group(2), group
+            else:
+                yield entry, group
+
+
+def build_gazetteer() -> Dict[str, Place]:
+    """
+    Returns the places of jurisdiction_regex and their aliases keyed by every name they
+    go by. A name listed in a country's group, e.g. Georgia or England, takes that parent.
+    """
+    gazetteer = {}
+    for name, group in _gazetteer_entries():
+        parent = next((country for prefix, country in _GROUP_PARENTS.items() if group.startswith(prefix)), None)
+        if name not in gazetteer or parent:
+            gazetteer[name] = Place(name, parent)
+    for name, parent in _COMPOSITE_PLACES.items():
+        gazetteer[name] = Place(name, parent)
+    for canonical, aliases in _ALIASES.items():
+        for alias in aliases:
+            gazetteer[alias] = gazetteer[canonical]
+    return gazetteer
+
+
+_GAZETTEER = build_gazetteer()
+# Case-sensitive: place names are capitalised and "US" is not "us"
+_PLACE = re.compile(
+    r"(?<![\w.])(?:" + "|".join(re.escape(name).replace(r"\ ", r"\s+") for name in sorted(_GAZETTEER, key=len, reverse=True)) + r")(?![\w])"
+)
+
+# Clause triggers in priority order: governing law, courts and venue, arbitration seat
+_CLAUSES = [
+    ("governing_law", re.compile(
+        r"\b(?:governed\s+by|construed(?:\s+and\s+enforced)?\s+(?:in\s+accordance\s+with|under)|interpreted\s+(?:in\s+accordance\s+with|under)"
+        r"|governing\s+law\s+(?:shall\s+be|is|of)|applicable\s+law\s+(?:shall\s+be|is))"
+        r"(?:\s+and\s+construed\s+in\s+accordance\s+with)?(?:\s+the)?(?:\s+(?:internal|substantive))?(?:\s+laws?\s+of)?\s+",
+        re.IGNORECASE,
+    )),
+    ("venue", re.compile(
+        r"\b(?:(?:exclusive|non[-\s]?exclusive|sole)\s+jurisdiction\s+of|jurisdiction\s+of|venue\s+(?:shall|will)\s+(?:be|lie)(?:\s+exclusively)?\s+in"
+        r"|courts?\s+(?:of|in|located\s+in|sitting\s+in))\s+",
+        re.IGNORECASE,
+    )),
+    ("arbitration_seat", re.compile(
+        r"\b(?:(?:seat|place|venue)\s+of\s+(?:the\s+)?arbitration(?:\s+(?:shall\s+be|will\s+be|is))?|arbitration\s+(?:seated|held|conducted)\s+in|seated\s+in)\s+",
+        re.IGNORECASE,
+    )),
+]
+# A clause reads up to the end of its sentence; periods of abbreviations such as U.S. do not end it
+_CLAUSE_END = re.compile(r"(?<![A-Z])\.(?:\s|$)|;|\n")
+_CLAUSE_CHARS = 160
+# Substrings one of which every clause contains, checked before running the triggers
+_CLAUSE_MARKERS = ("govern", "constru", "interpret", "applicable law", "jurisdiction", "venue", "court", "arbitrat", "seat")
+
+
+@dataclass(frozen=True)
+class Candidate:
+    place: Place
+    clause: str
+    priority: int
+    context: str
+
+
+@dataclass
+class JurisdictionResolution:
+    """
+    The jurisdiction when the governing-law, venue and arbitration clauses name places
+    that do not conflict, else None with the candidates found.
+    """
+    value: Optional[str] = None
+    reason: str = "llm"
+    candidates: List[Candidate] = field(default_factory=list)
+
+    @property
+    def resolved(self) -> bool:
+        return self.value is not None
+
+    def extraction(self) -> dict:
+        return {"Jurisdiction": self.value}
+
+
+def clause_candidates(text: str) -> List[Candidate]:
+    """
+    Returns the gazetteer places named in the jurisdiction clauses of a text.
+    """
+    lowered = text.lower()
+    if not any(marker in lowered for marker in _CLAUSE_MARKERS):
+        return []
+    candidates = []
+    for priority, (clause, trigger) in enumerate(_CLAUSES):
+        for match in trigger.finditer(text):
+            end = _CLAUSE_END.search(text, match.end(), match.end() + _CLAUSE_CHARS)
+            span_end = end.start() if end else min(len(text), match.end() + _CLAUSE_CHARS)
+            for place in _PLACE.finditer(text, match.end(), span_end):
+                candidates.append(Candidate(_GAZETTEER[" ".join(place.group().split())], clause, priority, " ".join(text[match.start():span_end].split())))
+    return candidates
+
+
+def _related(a: Place, b: Place) -> bool:
+    return a.name == b.name or a.parent == b.name or b.parent == a.name
+
+
+def _most_specific(places: List[Place]) -> List[Place]:
+    """
+    Collapses places into their most specific members: New York and United States give New York.
+    """
+    kept = []
+    for place in places:
+        for index, other in enumerate(kept):
+            if _related(place, other):
+                if place.parent == other.name:
+                    kept[index] = place
+                break
+        else:
+            kept.append(place)
+    return kept
+
+
+def resolve_jurisdiction(chunks: Union[str, List[str]], filtered_text: Union[str, list]) -> JurisdictionResolution:
+    """
+    Resolves the jurisdiction from the governing-law, venue and arbitration-seat clauses of
+    the document chunks. Each kind of clause must name one place, up to its hierarchy
+    (New York and the United States are one); the places of the different kinds are
+    joined in priority order, e.g. "California and Delaware" for California law and
+    Delaware courts. Returns "null" when the jurisdiction filter found nothing for the LLM
+    to read, and leaves conflicting clauses or clauses naming no known place to the LLM.
+    """
+    if not LOCAL_JURISDICTION_ENABLED:
+        return JurisdictionResolution()
+    chunks = [chunks] if isinstance(chunks, str) else chunks
+    filtered_text = filtered_text if isinstance(filtered_text, str) else ""
+
+    candidates = [candidate for chunk in chunks for candidate in clause_candidates(chunk)]
+    resolution = JurisdictionResolution(candidates=candidates)
+    tiers = [_most_specific([candidate.place for candidate in candidates if candidate.priority == priority]) for priority in range(len(_CLAUSES))]
+    if not filtered_text.strip():
+        resolution.value, resolution.reason = "null", "no_clause"
+    elif not candidates:
+        resolution.reason = "no_place"
+    elif any(len(places) > 1 for places in tiers):
+        resolution.reason = "conflict"
+    else:
+        places = _most_specific([places[0] for places in tiers if places])
+        resolution.value = " and ".join(place.name for place in places)
+        resolution.reason = "single_place" if len(places) == 1 else "clause_places"
+
+    metrics.increment("jurisdiction_resolver.files")
+    metrics.increment(f"jurisdiction_resolver.{resolution.reason}")
+    metrics.increment("jurisdiction_resolver.llm_skipped", 1 if resolution.resolved else 0)
+    return resolution
@@ -0,0 +1,180 @@
+import json
+import os
+import tempfile
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+from config.config import config
+from utils.logger import _log_message
+from services.insights.llm_call import build_chat_messages, client
+
+MODULE_NAME = "llm_batch.py"
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = getattr(config, "OPENAI_BATCH_COMPLETION_WINDOW", "24h")
+BATCH_POLL_INTERVAL_SECONDS = getattr(config, "OPENAI_BATCH_POLL_INTERVAL_SECONDS", 30)
+BATCH_TIMEOUT_SECONDS = getattr(config, "OPENAI_BATCH_TIMEOUT_SECONDS", 24 * 60 * 60)
+# Batch API limit on the number of requests in one input file
+BATCH_MAX_REQUESTS = getattr(config, "OPENAI_BATCH_MAX_REQUESTS", 50_000)
+
+TERMINAL_BATCH_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def build_batch_line(custom_id: str, system_prompt: str, user_prompt: str, model_name: str, temperature: float, response_format: Optional[dict] = None) -> dict:
+    """
+    Builds one Batch API input line for a chat completion request.
+    """
+    body = {
+        "model": model_name,
+        "temperature": temperature,
+        "messages": build_chat_messages(system_prompt, user_prompt),
+    }
+    if response_format is not None:
+        body["response_format"] = response_format
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": body,
+    }
+
+
+def write_batch_file(lines: List[dict], directory: Optional[str] = None) -> str:
+    """
+    Writes the batch input lines to a JSONL file and returns its path.
+    """
+    fd, path = tempfile.mkstemp(prefix="metadata_batch_", suffix=".jsonl", dir=directory)
+    with os.fdopen(fd, "w", encoding="utf-8") as batch_file:
+        for line in lines:
+            batch_file.write(json.dumps(line, ensure_ascii=False) + "\n")
+    return path
+
+
+def parse_batch_output(output_text: str) -> Dict[str, Optional[str]]:
+    """
+    Maps each custom_id of a Batch API output file to the answer content, or None when
+    the request failed.
+    """
+    results = {}
+    for raw_line in output_text.splitlines():
+        if not raw_line.strip():
+            continue
+        line = json.loads(raw_line)
+        response = line.get("response") or {}
+        if line.get("error") or response.get("status_code") != 200:
+            results[line["custom_id"]] = None
+            continue
+        results[line["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+    return results
+
+
+class OpenAIBatchBackend:
+    """
+    Runs batch input files through the OpenAI Batch API.
+    """
+
+    def __init__(self, openai_client=None):
+        self.client = openai_client or client
+
+    def submit(self, input_path: str) -> str:
+        with open(input_path, "rb") as input_file:
+            uploaded = self.client.files.create(file=input_file, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW,
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return self.client.batches.retrieve(batch_id).status
+
+    def results(self, batch_id: str) -> Dict[str, Optional[str]]:
+        batch = self.client.batches.retrieve(batch_id)
+        results = {}
+        if batch.output_file_id:
+            results.update(parse_batch_output(self.client.files.content(batch.output_file_id).text))
+        if batch.error_file_id:
+            for custom_id in parse_batch_output(self.client.files.content(batch.error_file_id).text):
+                results.setdefault(custom_id, None)
+        return results
+
+
+class LocalBatchBackend:
+    """
+    File-backed stand-in for the Batch API, for tests and local runs.
+
+    Submitted input files are copied into ``work_dir`` and answered line by line with
+    ``responder(body) -> content``; the output is written in the Batch API output format.
+    """
+
+    def __init__(self, work_dir: str, responder: Optional[Callable[[dict], str]] = None):
+        self.work_dir = work_dir
+        self.responder = responder or (lambda body: "{}")
+        os.makedirs(work_dir, exist_ok=True)
+
+    def _path(self, batch_id: str, kind: str) -> str:
+        return os.path.join(self.work_dir, f"{batch_id}.{kind}.jsonl")
+
+    def submit(self, input_path: str) -> str:
+        batch_id = f"batch_local_{uuid.uuid4().hex}"
+        with open(input_path, encoding="utf-8") as input_file, open(self._path(batch_id, "output"), "w", encoding="utf-8") as output_file:
+            for raw_line in input_file:
+                if not raw_line.strip():
+                    continue
+                line = json.loads(raw_line)
+                try:
+                    content = self.responder(line["body"])
+                    output = {
+                        "custom_id": line["custom_id"],
+                        "response": {"status_code": 200, "body": {"choices": [{"message": {"role": "assistant", "content": content}}]}},
+                        "error": None,
+                    }
+                except Exception as e:
+                    output = {"custom_id": line["custom_id"], "response": None, "error": {"message": str(e)}}
+                output_file.write(json.dumps(output, ensure_ascii=False) + "\n")
+        return batch_id
+
+    def status(self, batch_id: str) -> str:
+        return "completed" if os.path.exists(self._path(batch_id, "output")) else "failed"
+
+    def results(self, batch_id: str) -> Dict[str, Optional[str]]:
+        with open(self._path(batch_id, "output"), encoding="utf-8") as output_file:
+            return parse_batch_output(output_file.read())
+
+
+def run_batch(lines: List[dict], backend, logger, poll_interval: float = BATCH_POLL_INTERVAL_SECONDS, timeout: float = BATCH_TIMEOUT_SECONDS) -> Dict[str, Optional[str]]:
+    """
+    Submits the request lines, waits for every batch to finish and returns the answers
+    keyed by custom_id. Requests of failed or expired batches map to None.
+    """
+    results = {line["custom_id"]: None for line in lines}
+    batch_ids = []
+    for offset in range(0, len(lines), BATCH_MAX_REQUESTS):
+        input_path = write_batch_file(lines[offset:offset + BATCH_MAX_REQUESTS])
+        try:
+            batch_ids.append(backend.submit(input_path))
+        finally:
+            os.remove(input_path)
+    logger.info(_log_message(f"Submitted {len(lines)} requests in batches: {batch_ids}", "run_batch", MODULE_NAME))
+
+    deadline = time.monotonic() + timeout
+    pending = list(batch_ids)
+    while pending:
+        for batch_id in list(pending):
+            status = backend.status(batch_id)
+            if status not in TERMINAL_BATCH_STATUSES:
+                continue
+            pending.remove(batch_id)
+            if status == "completed":
+                results.update(backend.results(batch_id))
+            else:
+                logger.error(_log_message(f"Batch {batch_id} ended with status: {status}", "run_batch", MODULE_NAME))
+        if not pending:
+            break
+        if time.monotonic() >= deadline:
+            logger.error(_log_message(f"Timed out waiting for batches: {pending}", "run_batch", MODULE_NAME))
+            break
+        time.sleep(poll_interval)
+
+    return results
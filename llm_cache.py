@@ -0,0 +1,222 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from config.config import config
+
+MODULE_NAME = "llm_cache.py"
+
+# Cache settings, overridable from config
+LLM_CACHE_ENABLED = getattr(config, "LLM_CACHE_ENABLED", True)
+LLM_CACHE_PATH = getattr(config, "LLM_CACHE_PATH", os.path.join(tempfile.gettempdir(), "llm_response_cache.sqlite3"))
+LLM_CACHE_TTL_SECONDS = getattr(config, "LLM_CACHE_TTL_SECONDS", 7 * 24 * 60 * 60)
+LLM_CACHE_MEMORY_ENTRIES = getattr(config, "LLM_CACHE_MEMORY_ENTRIES", 2048)
+LLM_CACHE_DISK_MAX_BYTES = getattr(config, "LLM_CACHE_DISK_MAX_BYTES", 256 * 1024 * 1024)
+
+# Number of disk writes between two size checks of the on-disk tier
+_EVICTION_CHECK_INTERVAL = 64
+
+
+def make_cache_key(model_name: str, temperature: float, system_prompt: str, user_prompt: str, response_format: Optional[dict] = None) -> str:
+    """
+    Returns the content address of an LLM request.
+    """
+    request = [model_name, float(temperature), system_prompt, user_prompt]
+    if response_format is not None:
+        request.append(response_format)
+    payload = json.dumps(request, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Two-tier LLM response cache: an in-process LRU in front of a persistent SQLite store.
+
+    Entries expire after ``ttl_seconds``. The memory tier is bounded by entry count, the
+    disk tier by total payload size, evicting the least recently used entries first.
+    Disk errors never fail a lookup; they are counted and the memory tier keeps working.
+    """
+
+    def __init__(self, path: Optional[str], ttl_seconds: float, max_memory_entries: int, max_disk_bytes: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._writes_since_eviction = 0
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "expired": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+            "disk_errors": 0,
+        }
+        self._conn = self._open(path) if path else None
+
+    def _open(self, path):
+        try:
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_access ON llm_cache (last_access)")
+            return conn
+        except sqlite3.Error:
+            self._counters["disk_errors"] += 1
+            return None
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns the cached response for ``key``, or None on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+                self._counters["expired"] += 1
+
+            value = self._disk_get(key, now)
+            if value is not None:
+                self._counters["disk_hits"] += 1
+                self._memory_set(key, value, now + self.ttl_seconds)
+                return value
+
+            self._counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value: str):
+        """
+        Stores a response in both tiers.
+        """
+        if value is None:
+            return
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        with self._lock:
+            self._counters["writes"] += 1
+            self._memory_set(key, value, expires_at)
+            self._disk_set(key, value, expires_at, now)
+
+    def invalidate(self, key: str):
+        """
+        Drops ``key`` from both tiers, e.g. when the cached response turned out to be unusable.
+        """
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            except sqlite3.Error:
+                self._counters["disk_errors"] += 1
+
+    def stats(self) -> dict:
+        """
+        Returns the hit/miss counters together with the derived hit rate.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def _memory_set(self, key, value, expires_at):
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self._counters["memory_evictions"] += 1
+
+    def _disk_get(self, key, now):
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute("SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._counters["expired"] += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            return value
+        except sqlite3.Error:
+            self._counters["disk_errors"] += 1
+            return None
+
+    def _disk_set(self, key, value, expires_at, now):
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, last_access, size) VALUES (?, ?, ?, ?, ?)",
+                (key, value, expires_at, now, len(value.encode("utf-8"))),
+            )
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction >= _EVICTION_CHECK_INTERVAL:
+                self._writes_since_eviction = 0
+                self._evict_disk(now)
+        except sqlite3.Error:
+            self._counters["disk_errors"] += 1
+
+    def _evict_disk(self, now):
+        self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+        total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total_size <= self.max_disk_bytes:
+            return
+        # Walk the least recently used entries until enough space is reclaimed
+        excess = total_size - self.max_disk_bytes
+        reclaimed = 0
+        stale_keys = []
+        for key, size in self._conn.execute("SELECT key, size FROM llm_cache ORDER BY last_access ASC"):
+            stale_keys.append((key,))
+            reclaimed += size
+            if reclaimed >= excess:
+                break
+        self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", stale_keys)
+        self._counters["disk_evictions"] += len(stale_keys)
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[LLMResponseCache]:
+    """
+    Returns the process-wide response cache, or None when caching is disabled.
+    """
+    global _response_cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = LLMResponseCache(
+                    LLM_CACHE_PATH, LLM_CACHE_TTL_SECONDS, LLM_CACHE_MEMORY_ENTRIES, LLM_CACHE_DISK_MAX_BYTES
+                )
+    return _response_cache
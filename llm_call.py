@@ -1,8 +1,27 @@
+import asyncio
 import json
 import time
-from typing import List
-from openai import OpenAI
+from dataclasses import dataclass
+from functools import partial
+from typing import List, Optional
+from openai import AsyncOpenAI, OpenAI
+from services.insights.context_budget import assemble_context, assemble_text_context, context_token_budget
 from services.insights.json_parser import LLMOutputParser
+from services.insights.llm_cache import get_response_cache, make_cache_key
+from services.insights.llm_metrics import metrics
+from services.insights.llm_rate_limiter import estimate_tokens, rate_limiter
+from services.insights.model_router import ESCALATION_MODEL, answer_confidence, escalation_reason, is_low_confidence, route_model, routing_ledger
+from services.insights.llm_retry import LLMCallError, LLMErrorKind, async_run_with_retry, classify_error, run_with_retry
+from services.insights.metadata_fields import (
+    CONTRACT_VALUE_RESPONSE_SCHEMA,
+    DATE_FIELDS,
+    JURISDICTION_RESPONSE_SCHEMA,
+    dates_response_schema,
+    question_field,
+    question_response_schema,
+    response_schema,
+    unwrap_question,
+)
 from config.config import config
 from utils.logger import _log_message
 import mlflow
@@ -18,8 +37,9 @@ mlflow.openai.autolog()
 OPENAI_API_KEY = config.OPENAI_API_KEY
 OPENAI_MODEL_NAME = config.OPENAI_MODEL_NAME
 
-# Initialize OpenAI client
+# Initialize OpenAI clients
 client = OpenAI(api_key=OPENAI_API_KEY)
+async_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
 
 MODULE_NAME = "llm_call.py"
 
@@ -29,6 +49,128 @@ PRICING = {
     "gpt-4o-mini": {"input": 0.150, "cached_input": 0.075, "output": 0.600}
 }
 
+# JSON mode: the model is constrained to emit a single JSON object
+JSON_OBJECT_FORMAT = {"type": "json_object"}
+# Constrain answers to the declared per-field JSON schemas (strict structured outputs)
+LLM_STRUCTURED_OUTPUTS = getattr(config, "LLM_STRUCTURED_OUTPUTS", True)
+
+
+def structured_response_format(schema):
+    """
+    Returns the structured-output response_format to send, or None when disabled.
+    """
+    return schema if LLM_STRUCTURED_OUTPUTS else None
+
+
+@dataclass
+class LLMCallResult:
+    """
+    An LLM answer with the model that produced it, its cost and its confidence.
+    Cache hits carry no cost and no confidence.
+    """
+    answer: str
+    model_name: str
+    cost: float = 0.0
+    confidence: Optional[float] = None
+
+
+def build_chat_messages(system_prompt: str, user_prompt: str) -> list:
+    """
+    Builds the chat messages sent to the completions endpoint.
+    """
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def _log_llm_request(system_prompt, user_prompt, model_name, temperature, function_name, logger):
+    """
+    Logs the details of an outgoing LLM request.
+    """
+    logger.info(_log_message(f"Invoking OpenAI LLM API: {function_name}", function_name, MODULE_NAME))
+
+    # Log API configuration details
+    logger.debug(_log_message(f"Model: {model_name}, Temperature: {temperature}", function_name, MODULE_NAME))
+    logger.debug(_log_message(f"System Prompt: {system_prompt}", function_name, MODULE_NAME))
+    logger.debug(_log_message(f"User Prompt: {user_prompt}", function_name, MODULE_NAME))
+
+
+def _handle_llm_response(response, model_name, function_name, start_time, logger):
+    """
+    Extracts the answer from a completion response and logs its cost and duration.
+    Returns (answer, cost in USD).
+    """
+    llm_answer = response.choices[0].message.content
+
+    # Log and validate response
+    logger.info(_log_message(f"LLM Response: {llm_answer}", function_name, MODULE_NAME))
+
+    # Token cost computation
+    cost = 0.0
+    if hasattr(response, "usage"):
+        cost = compute_costs(response, model_name, function_name, logger)
+
+    duration = time.perf_counter() - start_time
+    logger.info(_log_message(f"LLM call completed in {duration:.2f} seconds", function_name, MODULE_NAME))
+
+    return llm_answer, cost
+
+
+def _total_tokens(response):
+    """
+    Returns the tokens a completion was charged for, or None when usage is missing.
+    """
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    return usage.prompt_tokens + usage.completion_tokens
+
+
+def _cache_lookup(system_prompt, user_prompt, model_name, temperature, function_name, use_cache, logger, response_format=None):
+    """
+    Returns (cache, key, cached answer) for a request. Only deterministic calls are cached
+    unless the caller opts in explicitly.
+    """
+    if use_cache is None:
+        use_cache = temperature == 0
+    cache = get_response_cache() if use_cache else None
+    if cache is None:
+        return None, None, None
+
+    key = make_cache_key(model_name, temperature, system_prompt, user_prompt, response_format)
+    cached_answer = cache.get(key)
+    if cached_answer is not None:
+        logger.info(_log_message(f"LLM cache hit: {function_name}", function_name, MODULE_NAME))
+        logger.debug(_log_message(f"LLM cache stats: {cache.stats()}", function_name, MODULE_NAME))
+    return cache, key, cached_answer
+
+
+def invalidate_cached_response(system_prompt, user_prompt, model_name, temperature, response_format=None):
+    """
+    Drops a cached answer that could not be used, so retries reach the model again.
+    """
+    cache = get_response_cache()
+    if cache is not None:
+        cache.invalidate(make_cache_key(model_name, temperature, system_prompt, user_prompt, response_format))
+
+
+def _completion_kwargs(system_prompt, user_prompt, model_name, temperature, response_format, logprobs=False):
+    """
+    Returns the keyword arguments of a chat completion request.
+    """
+    kwargs = {
+        "model": model_name,
+        "temperature": temperature,
+        "messages": build_chat_messages(system_prompt, user_prompt),
+    }
+    if response_format is not None:
+        kwargs["response_format"] = response_format
+    if logprobs:
+        kwargs["logprobs"] = True
+    return kwargs
+
+
 @mlflow.trace(name="LLM Call - Generate MetaData")
 def open_ai_llm_call(
     system_prompt: str,
@@ -36,49 +178,125 @@ def open_ai_llm_call(
     model_name: str,
     temperature: float,
     function_name: str,
-    logger
-) -> str:
+    logger,
+    use_cache: Optional[bool] = None,
+    raise_on_error: bool = False,
+    response_format: Optional[dict] = None,
+    detailed: bool = False
+):
     """
     Calls OpenAI's LLM API with the provided prompts and logs relevant details.
+    Responses are served from the LLM response cache when ``use_cache`` is set,
+    which defaults to temperature 0 calls only. With ``raise_on_error`` failures are
+    raised as a classified LLMCallError instead of returning None, so the retry
+    engine can tell rate limits and timeouts from bad answers. ``response_format`` is
+    passed through to the completions endpoint, e.g. to request JSON mode. With
+    ``detailed`` the call also requests logprobs and returns an LLMCallResult.
     """
     try:
         start_time = time.perf_counter()
-        logger.info(_log_message(f"Invoking OpenAI LLM API: {function_name}", function_name, MODULE_NAME))
+        cache, cache_key, cached_answer = _cache_lookup(system_prompt, user_prompt, model_name, temperature, function_name, use_cache, logger, response_format)
+        if cached_answer is not None:
+            return LLMCallResult(cached_answer, model_name) if detailed else cached_answer
 
-        # Log API configuration details
-        logger.debug(_log_message(f"Model: {model_name}, Temperature: {temperature}", function_name, MODULE_NAME))
-        logger.debug(_log_message(f"System Prompt: {system_prompt}", function_name, MODULE_NAME))
-        logger.debug(_log_message(f"User Prompt: {user_prompt}", function_name, MODULE_NAME))
+        _log_llm_request(system_prompt, user_prompt, model_name, temperature, function_name, logger)
+
+        # Pace the request against the shared per-model quota
+        reservation = rate_limiter.acquire(model_name, estimate_tokens(system_prompt, user_prompt))
 
         # Make the API call
         response = client.chat.completions.create(
-            model=model_name,
-            temperature=temperature,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
+            **_completion_kwargs(system_prompt, user_prompt, model_name, temperature, response_format, logprobs=detailed)
         )
+        rate_limiter.reconcile(reservation, _total_tokens(response))
+
+        llm_answer, cost = _handle_llm_response(response, model_name, function_name, start_time, logger)
+        if not llm_answer:
+            raise LLMCallError(LLMErrorKind.EMPTY_RESPONSE, "LLM returned an empty response")
+        if cache is not None:
+            cache.set(cache_key, llm_answer)
+        if detailed:
+            return LLMCallResult(llm_answer, model_name, cost, answer_confidence(response))
+        return llm_answer
+
+    except Exception as e:
+        logger.error(_log_message(f"Error during OpenAI API call: {e}", function_name, MODULE_NAME))
+        if raise_on_error:
+            raise classify_error(e) from e
+        return None
 
-        llm_answer = response.choices[0].message.content
 
-        # Log and validate response
-        logger.info(_log_message(f"LLM Response: {llm_answer}", function_name, MODULE_NAME))
+@mlflow.trace(name="LLM Call - Generate MetaData (Async)")
+async def async_open_ai_llm_call(
+    system_prompt: str,
+    user_prompt: str,
+    model_name: str,
+    temperature: float,
+    function_name: str,
+    logger,
+    use_cache: Optional[bool] = None,
+    raise_on_error: bool = False,
+    response_format: Optional[dict] = None,
+    detailed: bool = False
+):
+    """
+    Async variant of open_ai_llm_call backed by the AsyncOpenAI client. The response cache
+    is read and written in a worker thread, its SQLite tier would block the event loop.
+    """
+    try:
+        start_time = time.perf_counter()
+        cache, cache_key, cached_answer = await asyncio.to_thread(
+            _cache_lookup, system_prompt, user_prompt, model_name, temperature, function_name, use_cache, logger, response_format
+        )
+        if cached_answer is not None:
+            return LLMCallResult(cached_answer, model_name) if detailed else cached_answer
 
-        # Token cost computation
-        if hasattr(response, "usage"):
-            compute_costs(response, model_name, function_name, logger)
+        _log_llm_request(system_prompt, user_prompt, model_name, temperature, function_name, logger)
 
-        duration = time.perf_counter() - start_time
-        logger.info(_log_message(f"LLM call completed in {duration:.2f} seconds", function_name, MODULE_NAME))
+        # Pace the request against the shared per-model quota
+        reservation = await rate_limiter.acquire_async(model_name, estimate_tokens(system_prompt, user_prompt))
 
+        # Make the API call without holding a worker thread
+        response = await async_client.chat.completions.create(
+            **_completion_kwargs(system_prompt, user_prompt, model_name, temperature, response_format, logprobs=detailed)
+        )
+        rate_limiter.reconcile(reservation, _total_tokens(response))
+
+        llm_answer, cost = _handle_llm_response(response, model_name, function_name, start_time, logger)
+        if not llm_answer:
+            raise LLMCallError(LLMErrorKind.EMPTY_RESPONSE, "LLM returned an empty response")
+        if cache is not None:
+            await asyncio.to_thread(cache.set, cache_key, llm_answer)
+        if detailed:
+            return LLMCallResult(llm_answer, model_name, cost, answer_confidence(response))
         return llm_answer
 
     except Exception as e:
         logger.error(_log_message(f"Error during OpenAI API call: {e}", function_name, MODULE_NAME))
+        if raise_on_error:
+            raise classify_error(e) from e
         return None
 
 
+def record_prompt_cache_usage(function_name, prompt_tokens, cached_tokens):
+    """
+    Records prompt and cached token counts per function_name in the metrics registry.
+    """
+    metrics.increment("llm_prompt_cache.prompt_tokens", prompt_tokens, function_name=function_name)
+    metrics.increment("llm_prompt_cache.cached_tokens", cached_tokens, function_name=function_name)
+    if prompt_tokens:
+        metrics.observe("llm_prompt_cache.cached_ratio", cached_tokens / prompt_tokens, function_name=function_name)
+
+
+def prompt_cache_hit_rate(function_name) -> float:
+    """
+    Returns the share of prompt tokens served from OpenAI's prompt cache for function_name.
+    """
+    prompt_tokens = metrics.counter("llm_prompt_cache.prompt_tokens", function_name=function_name)
+    cached_tokens = metrics.counter("llm_prompt_cache.cached_tokens", function_name=function_name)
+    return cached_tokens / prompt_tokens if prompt_tokens else 0.0
+
+
 @mlflow.trace(name="Compute Costs")
 def compute_costs(response, model_name, function_name, logger):
     """
@@ -99,174 +317,495 @@ def compute_costs(response, model_name, function_name, logger):
         cost_output = (completion_tokens / 1_000_000) * model_pricing["output"]
         total_cost = cost_cached_input + cost_uncached_input + cost_output
 
+        record_prompt_cache_usage(function_name, prompt_tokens, cached_tokens)
+
         logger.debug(_log_message("########### Token Usage Details ###########", function_name, MODULE_NAME))
         logger.debug(_log_message(f"Cached Tokens: {cached_tokens}, Cost: ${cost_cached_input:.6f}", function_name, MODULE_NAME))
         logger.debug(_log_message(f"Uncached Tokens: {uncached_tokens}, Cost: ${cost_uncached_input:.6f}", function_name, MODULE_NAME))
         logger.debug(_log_message(f"Output Tokens: {completion_tokens}, Cost: ${cost_output:.6f}", function_name, MODULE_NAME))
         logger.debug(_log_message(f"Total Cost: ${total_cost:.6f}", function_name, MODULE_NAME))
+        logger.debug(_log_message(f"Cached Token Ratio: {cached_tokens / prompt_tokens if prompt_tokens else 0:.2%}", function_name, MODULE_NAME))
+        return total_cost
     except Exception as e:
         logger.error(_log_message(f"Error computing API costs: {e}", function_name, MODULE_NAME))
+        return 0.0
 
 
-@mlflow.trace(name="LLM Call - Prepare Prompts")
-def llm_call(query: str, retrieved_chunks: List[str], file_id, user_id, org_id, logger, feedback: str = "") -> str:
+def build_llm_call_prompts(query: dict, retrieved_chunks: List[str], feedback: str = ""):
     """
-    Prepares the prompts and invokes the OpenAI LLM API.
+    Builds the system and user prompts for a single metadata question.
     """
     retrieved_chunks_text = "\n\n".join(retrieved_chunks)
     question = list(query.keys())[0]
     instructions = list(query.values())[0]
 
+    # Static instructions first and per-file content last, so the shared prefix is as
+    # long as possible and OpenAI prompt caching can kick in across files
     user_prompt = f"""Answer the query based on the instructions.
+        Output should be a minimal one line json, DO NOT provide any extra words.
+        ###Output Format:
+        Strictly do not include "```" or "```json" or any markers in your response.
         Question: {question} 
         {instructions}
         Here is relevant information:
         {retrieved_chunks_text}. 
-        Output should be a minimal one line json, DO NOT provide any extra words. {feedback}.
-        ###Outpput Format:
-        Strictly do not include "```" or "```json" or any markers in your response."""
-
+        {feedback}"""
 
-    logger.debug(_log_message(f"User Prompt: {user_prompt}", "llm_call", MODULE_NAME))
-    # logger.debug(_log_message(f"Retrieved Chunks: {retrieved_chunks_text}", "llm_call", MODULE_NAME))
     system_prompt = """You are an assistant that extracts precise and relevant information from contracts and agreements, providing minimal and accurate answers in a clear format."""
 
-    logger.debug(_log_message(f"Calling llm_call with Query: {query}", "llm_call", MODULE_NAME))
-
-    return open_ai_llm_call(system_prompt, user_prompt, "gpt-4o", 0, "llm_call", logger)
+    return system_prompt, user_prompt
 
 
-def llm_call_for_dates(retrieved_chunks: str, date_extraction_prompt, file_id, user_id, org_id, logger, feedback: str = "") -> str:
+def build_dates_prompts(retrieved_chunks: str, date_extraction_prompt, feedback: str = "", fields: Optional[List[str]] = None, resolved: Optional[dict] = None):
     """
-    Calls the LLM API specifically for date-related queries.
+    Builds the system and user prompts for the date extraction call. ``fields`` narrows
+    the call to the fields still pending; ``resolved`` gives the dates already known.
     """
     system_prompt = """You are an assistant that understands and extracts relevant dates from the legal agreement's and contract's context provided to you.
         You also provide the dates extractes in a specific format as per the instructions provided to you."""
 
+    if fields is not None:
+        date_extraction_prompt += f"""
+    Only extract these fields: {", ".join(fields)}."""
+        if resolved:
+            date_extraction_prompt += f"""
+    These dates are already known from the contract and can be used to calculate the others: {json.dumps(resolved)}."""
+
     user_prompt = f"""
     {date_extraction_prompt}
+    Output should be a minimal json, DO NOT provide any extra words.
     Below is the text paragraph consisting of all the dates filtered from the legal agreement's and contract's context provided to you.
     {retrieved_chunks}. 
-    Output should be a minimal json, DO NOT provide any extra words. {feedback}"""
-
-    retries = 2
-    backoff_factor = 2
-    logger.debug(_log_message(f"Calling llm_call_for_dates", "llm_call_for_dates", MODULE_NAME))
-    llm_response = open_ai_llm_call(system_prompt, user_prompt, "gpt-4o", 0.5, "llm_call_for_dates", logger)
-    for attempt in range(retries):
-        try:
-            logger.debug(_log_message(f"Received LLM Response (Attempt {attempt+1}): {llm_response}", "llm_call_for_dates", MODULE_NAME))
-            parser = LLMOutputParser(logger)
-            json_response = parser.parse(llm_response)
-            logger.info(_log_message(f"Parsed JSON Response: {json_response}", "llm_call_for_dates", MODULE_NAME))
-            return json_response
+    {feedback}"""
 
-        except Exception as e:
-            feedback = f"Previous error encountered: {e}."
-            logger.warning(
-                _log_message(f"Attempt {attempt+1} failed with error: {e}. Retrying...", "llm_call_for_dates", MODULE_NAME)
-            )
-            time.sleep(backoff_factor ** attempt)
+    return system_prompt, user_prompt
 
-    logger.error(_log_message("All retries failed. Exiting call_llm.", "call_llm", MODULE_NAME))
-    return None
 
-def llm_call_for_jurisdiction(retrieved_chunks: str, jurisdiction_extraction_prompt, file_id, user_id, org_id, logger, feedback: str = "") -> str:
+def build_jurisdiction_prompts(retrieved_chunks: str, jurisdiction_extraction_prompt, feedback: str = ""):
     """
-    Calls the LLM API specifically for date-related queries.
+    Builds the system and user prompts for the jurisdiction extraction call.
     """
     system_prompt = """You are an assistant that understands and extracts jurisdiction from the legal contract context"""
 
     user_prompt = f"""
     {jurisdiction_extraction_prompt}
+    Output should be a minimal json, DO NOT provide any extra words.
     Below is the text paragraph consisting of all the required context filtered from the legal agreement's, contract's context and is provided to you.
     {retrieved_chunks}. 
-    Output should be a minimal json, DO NOT provide any extra words. {feedback}"""
-
-    retries = 2
-    backoff_factor = 2
-    logger.debug(_log_message(f"Calling llm_call_for_dates", "llm_call_for_dates", MODULE_NAME))
-    llm_response = open_ai_llm_call(system_prompt, user_prompt, "gpt-4o", 0.5, "llm_call_for_dates", logger)
-    for attempt in range(retries):
-        try:
-            logger.debug(_log_message(f"Received LLM Response (Attempt {attempt+1}): {llm_response}", "llm_call_for_dates", MODULE_NAME))
-            parser = LLMOutputParser(logger)
-            json_response = parser.parse(llm_response)
-            logger.info(_log_message(f"Parsed JSON Response: {json_response}", "llm_call_for_dates", MODULE_NAME))
-            return json_response
+    {feedback}"""
 
-        except Exception as e:
-            feedback = f"Previous error encountered: {e}."
-            logger.warning(
-                _log_message(f"Attempt {attempt+1} failed with error: {e}. Retrying...", "llm_call_for_dates", MODULE_NAME)
-            )
-            time.sleep(backoff_factor ** attempt)
+    return system_prompt, user_prompt
 
-    logger.error(_log_message("All retries failed. Exiting call_llm.", "call_llm", MODULE_NAME))
-    return None
 
-def llm_call_for_cv(retrieved_chunks: str, cv_extraction_prompt, file_id, user_id, org_id, logger, feedback: str = "") -> str:
+def build_cv_prompts(retrieved_chunks: str, cv_extraction_prompt, feedback: str = "", hints: Optional[List[str]] = None):
     """
-    Calls the LLM API specifically for date-related queries.
+    Builds the system and user prompts for the contract value extraction call. ``hints``
+    lists the amounts already parsed from the contract.
     """
     system_prompt = """You are an assistant that understands, calculates and extracts the contract value from the legal agreement's, contract's context provided to you."""
 
+    if hints:
+        amounts = "\n    ".join(f"- {hint}" for hint in hints)
+        cv_extraction_prompt += f"""
+    These amounts were parsed from the contract as integers, use them for the calculation:
+    {amounts}"""
+
     user_prompt = f"""
     {cv_extraction_prompt}
+    Output should be a minimal json, DO NOT provide any extra words.
     Below is the text paragraph consisting of all the dates filtered from the legal agreement's and contract's context provided to you.
     {retrieved_chunks}. 
-    Output should be a minimal json, DO NOT provide any extra words. {feedback}"""
-
-    retries = 2
-    backoff_factor = 2
-    logger.debug(_log_message(f"Calling llm_call_for_dates", "llm_call_for_dates", MODULE_NAME))
-    llm_response = open_ai_llm_call(system_prompt, user_prompt, "gpt-4o", 0.5, "llm_call_for_dates", logger)
-    for attempt in range(retries):
-        try:
-            logger.debug(_log_message(f"Received LLM Response (Attempt {attempt+1}): {llm_response}", "llm_call_for_dates", MODULE_NAME))
+    {feedback}"""
+
+    return system_prompt, user_prompt
+
+
+def build_packed_prompts(questions: List[dict], retrieved_chunks: List[str], feedback: str = ""):
+    """
+    Builds the system and user prompts that answer several metadata questions in one call.
+    The answer is a single JSON object keyed by each question's output field.
+    """
+    retrieved_chunks_text = "\n\n".join(retrieved_chunks)
+    fields = [question_field(question) for question in questions]
+    output_keys = json.dumps({field: "" for field in fields})
+    question_blocks = "\n".join(
+        "###Field: {}\n        Question: {}\n        {}".format(field, *unwrap_question(question))
+        for field, question in zip(fields, questions)
+    )
+
+    user_prompt = f"""Answer every question below based on its instructions.
+        Return a single minimal one line JSON object holding exactly these keys: {output_keys}
+        The value of each key follows the expected output of its question, DO NOT provide any extra words.
+        ###Output Format:
+        Strictly do not include "```" or "```json" or any markers in your response.
+        {question_blocks}
+        Here is relevant information:
+        {retrieved_chunks_text}. 
+        {feedback}"""
+
+    system_prompt = """You are an assistant that extracts precise and relevant information from contracts and agreements, providing minimal and accurate answers in a clear format."""
+
+    return system_prompt, user_prompt
+
+
+def parse_llm_response(llm_response, function_name, logger, structured: bool = False):
+    """
+    Parses the raw LLM answer into JSON. Raises a MALFORMED_JSON LLMCallError on bad output.
+    Structured answers are valid JSON by construction and skip the lenient LLMOutputParser.
+    """
+    logger.debug(_log_message(f"Received LLM Response: {llm_response}", function_name, MODULE_NAME))
+    try:
+        if structured:
+            json_response = json.loads(llm_response)
+        else:
             parser = LLMOutputParser(logger)
             json_response = parser.parse(llm_response)
-            logger.info(_log_message(f"Parsed JSON Response: {json_response}", "llm_call_for_dates", MODULE_NAME))
-            return json_response
+    except Exception as e:
+        raise LLMCallError(LLMErrorKind.MALFORMED_JSON, str(e)) from e
+    logger.info(_log_message(f"Parsed JSON Response: {json_response}", function_name, MODULE_NAME))
+    return json_response
 
-        except Exception as e:
-            feedback = f"Previous error encountered: {e}."
-            logger.warning(
-                _log_message(f"Attempt {attempt+1} failed with error: {e}. Retrying...", "llm_call_for_dates", MODULE_NAME)
-            )
-            time.sleep(backoff_factor ** attempt)
 
-    logger.error(_log_message("All retries failed. Exiting call_llm.", "call_llm", MODULE_NAME))
-    return None
+@mlflow.trace(name="LLM Call - Prepare Prompts")
+def llm_call(
+    query: str,
+    retrieved_chunks: List[str],
+    file_id,
+    user_id,
+    org_id,
+    logger,
+    feedback: str = "",
+    raise_on_error: bool = False,
+    response_format: Optional[dict] = None,
+    model_name: str = ESCALATION_MODEL,
+    detailed: bool = False
+):
+    """
+    Prepares the prompts and invokes the OpenAI LLM API.
+    """
+    system_prompt, user_prompt = build_llm_call_prompts(query, retrieved_chunks, feedback)
+
+    logger.debug(_log_message(f"User Prompt: {user_prompt}", "llm_call", MODULE_NAME))
+    logger.debug(_log_message(f"Calling llm_call with Query: {query}", "llm_call", MODULE_NAME))
+
+    return open_ai_llm_call(system_prompt, user_prompt, model_name, 0, "llm_call", logger, raise_on_error=raise_on_error, response_format=response_format, detailed=detailed)
+
+
+@mlflow.trace(name="LLM Call - Prepare Prompts (Async)")
+async def async_llm_call(
+    query: str,
+    retrieved_chunks: List[str],
+    file_id,
+    user_id,
+    org_id,
+    logger,
+    feedback: str = "",
+    raise_on_error: bool = False,
+    response_format: Optional[dict] = None,
+    model_name: str = ESCALATION_MODEL,
+    detailed: bool = False
+):
+    """
+    Async variant of llm_call.
+    """
+    system_prompt, user_prompt = build_llm_call_prompts(query, retrieved_chunks, feedback)
+
+    logger.debug(_log_message(f"User Prompt: {user_prompt}", "async_llm_call", MODULE_NAME))
+    logger.debug(_log_message(f"Calling async_llm_call with Query: {query}", "async_llm_call", MODULE_NAME))
+
+    return await async_open_ai_llm_call(system_prompt, user_prompt, model_name, 0, "llm_call", logger, raise_on_error=raise_on_error, response_format=response_format, detailed=detailed)
+
+
+def _parse_or_invalidate(llm_response, system_prompt, user_prompt, model_name, temperature, function_name, use_cache, logger, response_format=None):
+    """
+    Parses an answer; a malformed answer is dropped from the response cache before the
+    error propagates, so the retry reaches the model instead of the cached answer.
+    """
+    try:
+        return parse_llm_response(llm_response, function_name, logger, structured=response_format is not None)
+    except LLMCallError:
+        if use_cache or (use_cache is None and temperature == 0):
+            invalidate_cached_response(system_prompt, user_prompt, model_name, temperature, response_format)
+        raise
+
+
+def _llm_call_with_retries(build_prompts, function_name, logger, feedback: str = "", use_cache: bool = False, response_format: Optional[dict] = None, file_id=None) -> str:
+    """
+    Invokes the LLM through the shared retry policy. Every attempt re-sends the prompt,
+    carrying the previous parse error as feedback.
+    """
+    logger.debug(_log_message(f"Calling {function_name}", function_name, MODULE_NAME))
+
+    def attempt(attempt_feedback):
+        system_prompt, user_prompt = build_prompts(attempt_feedback)
+        result = open_ai_llm_call(system_prompt, user_prompt, "gpt-4o", 0.5, function_name, logger, use_cache=use_cache, raise_on_error=True, response_format=response_format, detailed=True)
+        routing_ledger.record_call(file_id, result.model_name, result.cost)
+        return _parse_or_invalidate(result.answer, system_prompt, user_prompt, "gpt-4o", 0.5, function_name, use_cache, logger, response_format)
+
+    return run_with_retry(attempt, function_name, logger, feedback)
+
+
+async def _async_llm_call_with_retries(build_prompts, function_name, logger, feedback: str = "", use_cache: bool = False, response_format: Optional[dict] = None, file_id=None) -> str:
+    """
+    Async variant of _llm_call_with_retries; backs off without blocking the event loop.
+    """
+    logger.debug(_log_message(f"Calling {function_name}", function_name, MODULE_NAME))
+
+    async def attempt(attempt_feedback):
+        system_prompt, user_prompt = build_prompts(attempt_feedback)
+        result = await async_open_ai_llm_call(system_prompt, user_prompt, "gpt-4o", 0.5, function_name, logger, use_cache=use_cache, raise_on_error=True, response_format=response_format, detailed=True)
+        routing_ledger.record_call(file_id, result.model_name, result.cost)
+        return _parse_or_invalidate(result.answer, system_prompt, user_prompt, "gpt-4o", 0.5, function_name, use_cache, logger, response_format)
+
+    return await async_run_with_retry(attempt, function_name, logger, feedback)
 
 
+def llm_call_for_dates(retrieved_chunks: str, date_extraction_prompt, file_id, user_id, org_id, logger, feedback: str = "", use_cache: bool = False,
+                       fields: Optional[List[str]] = None, resolved: Optional[dict] = None) -> str:
+    """
+    Calls the LLM API specifically for date-related queries. The call runs at
+    temperature 0.5, so the response cache is opt-in through ``use_cache``.
+    """
+    retrieved_chunks = assemble_text_context(retrieved_chunks, context_token_budget("llm_call_for_dates"), "llm_call_for_dates")
+    build_prompts = partial(build_dates_prompts, retrieved_chunks, date_extraction_prompt, fields=fields, resolved=resolved)
+    return _llm_call_with_retries(build_prompts, "llm_call_for_dates", logger, feedback, use_cache, structured_response_format(dates_response_schema(fields or DATE_FIELDS)), file_id)
+
+
+async def async_llm_call_for_dates(retrieved_chunks: str, date_extraction_prompt, file_id, user_id, org_id, logger, feedback: str = "", use_cache: bool = False,
+                                   fields: Optional[List[str]] = None, resolved: Optional[dict] = None) -> str:
+    """
+    Async variant of llm_call_for_dates.
+    """
+    retrieved_chunks = assemble_text_context(retrieved_chunks, context_token_budget("llm_call_for_dates"), "llm_call_for_dates")
+    build_prompts = partial(build_dates_prompts, retrieved_chunks, date_extraction_prompt, fields=fields, resolved=resolved)
+    return await _async_llm_call_with_retries(build_prompts, "llm_call_for_dates", logger, feedback, use_cache, structured_response_format(dates_response_schema(fields or DATE_FIELDS)), file_id)
+
+
+def llm_call_for_jurisdiction(retrieved_chunks: str, jurisdiction_extraction_prompt, file_id, user_id, org_id, logger, feedback: str = "", use_cache: bool = False) -> str:
+    """
+    Calls the LLM API specifically for jurisdiction-related queries.
+    """
+    retrieved_chunks = assemble_text_context(retrieved_chunks, context_token_budget("llm_call_for_jurisdiction"), "llm_call_for_jurisdiction")
+    build_prompts = partial(build_jurisdiction_prompts, retrieved_chunks, jurisdiction_extraction_prompt)
+    return _llm_call_with_retries(build_prompts, "llm_call_for_jurisdiction", logger, feedback, use_cache, structured_response_format(JURISDICTION_RESPONSE_SCHEMA), file_id)
+
+
+async def async_llm_call_for_jurisdiction(retrieved_chunks: str, jurisdiction_extraction_prompt, file_id, user_id, org_id, logger, feedback: str = "", use_cache: bool = False) -> str:
+    """
+    Async variant of llm_call_for_jurisdiction.
+    """
+    retrieved_chunks = assemble_text_context(retrieved_chunks, context_token_budget("llm_call_for_jurisdiction"), "llm_call_for_jurisdiction")
+    build_prompts = partial(build_jurisdiction_prompts, retrieved_chunks, jurisdiction_extraction_prompt)
+    return await _async_llm_call_with_retries(build_prompts, "llm_call_for_jurisdiction", logger, feedback, use_cache, structured_response_format(JURISDICTION_RESPONSE_SCHEMA), file_id)
+
+
+def llm_call_for_cv(retrieved_chunks: str, cv_extraction_prompt, file_id, user_id, org_id, logger, feedback: str = "", use_cache: bool = False,
+                    hints: Optional[List[str]] = None) -> str:
+    """
+    Calls the LLM API specifically for contract value queries.
+    """
+    retrieved_chunks = assemble_text_context(retrieved_chunks, context_token_budget("llm_call_for_cv"), "llm_call_for_cv")
+    build_prompts = partial(build_cv_prompts, retrieved_chunks, cv_extraction_prompt, hints=hints)
+    return _llm_call_with_retries(build_prompts, "llm_call_for_cv", logger, feedback, use_cache, structured_response_format(CONTRACT_VALUE_RESPONSE_SCHEMA), file_id)
+
+
+async def async_llm_call_for_cv(retrieved_chunks: str, cv_extraction_prompt, file_id, user_id, org_id, logger, feedback: str = "", use_cache: bool = False,
+                                hints: Optional[List[str]] = None) -> str:
+    """
+    Async variant of llm_call_for_cv.
+    """
+    retrieved_chunks = assemble_text_context(retrieved_chunks, context_token_budget("llm_call_for_cv"), "llm_call_for_cv")
+    build_prompts = partial(build_cv_prompts, retrieved_chunks, cv_extraction_prompt, hints=hints)
+    return await _async_llm_call_with_retries(build_prompts, "llm_call_for_cv", logger, feedback, use_cache, structured_response_format(CONTRACT_VALUE_RESPONSE_SCHEMA), file_id)
+
+
+
+def _first_tier_escalations(fields, answers, confidence, file_id, logger) -> set:
+    """
+    Records first-tier answers with the routing ledger and returns the fields to escalate.
+    """
+    answers = answers if isinstance(answers, dict) else {}
+    escalated = set()
+    for field in fields:
+        reason = escalation_reason(field, answers[field], confidence) if field in answers else "missing"
+        routing_ledger.record_first_tier(file_id, field, reason)
+        if reason:
+            escalated.add(field)
+            logger.info(_log_message(f"Escalating {field} to {ESCALATION_MODEL}: {reason}", "model_router", MODULE_NAME))
+    return escalated
+
+
+def _drop_low_confidence(result, system_prompt, user_prompt, response_format):
+    """
+    Drops a low-confidence first-tier answer from the response cache, so a later run
+    does not reuse it without its confidence.
+    """
+    if is_low_confidence(result.confidence):
+        invalidate_cached_response(system_prompt, user_prompt, result.model_name, 0, response_format)
+
 
 @mlflow.trace(name="LLM Call - Wrapper Function")
-def call_llm(query: str, retrieved_chunks: List[str], file_id, user_id, org_id, logger) -> str:
+def call_llm(query: str, retrieved_chunks: List[str], file_id, user_id, org_id, logger, model_name: Optional[str] = None) -> str:
     """
     Wrapper function to handle retries and error scenarios for the LLM API call.
+    The question goes to its field's first-tier model, or to ``model_name`` when given.
+    A first-tier answer that is null, invalid or low confidence is escalated.
     """
     logger.info(_log_message("Starting call_llm...", "call_llm", MODULE_NAME))
-    retries = 2
-    backoff_factor = 2
+    retrieved_chunks = assemble_context(retrieved_chunks, context_token_budget(question_field(query)), "call_llm")
 
-    for attempt in range(retries):
-        try:
-            llm_response = llm_call(query, retrieved_chunks, file_id, user_id, org_id, logger)
-            logger.debug(_log_message(f"Received LLM Response (Attempt {attempt+1}): {llm_response}", "call_llm", MODULE_NAME))
-            parser = LLMOutputParser(logger)
-            json_response = parser.parse(llm_response)
-            logger.info(_log_message(f"Parsed JSON Response: {json_response}", "call_llm", MODULE_NAME))
-            return json_response
+    response_format = structured_response_format(question_response_schema(query))
+    field = question_field(query)
+    first_model = model_name or route_model(field)
 
-        except Exception as e:
-            logger.warning(
-                _log_message(f"Attempt {attempt+1} failed with error: {e}. Retrying...", "call_llm", MODULE_NAME)
+    def attempt_on(attempt_model):
+        def attempt(feedback):
+            result = llm_call(
+                query, retrieved_chunks, file_id, user_id, org_id, logger, feedback,
+                raise_on_error=True, response_format=response_format, model_name=attempt_model, detailed=True
             )
-            time.sleep(backoff_factor ** attempt)
+            routing_ledger.record_call(file_id, result.model_name, result.cost)
+            system_prompt, user_prompt = build_llm_call_prompts(query, retrieved_chunks, feedback)
+            answer = _parse_or_invalidate(result.answer, system_prompt, user_prompt, attempt_model, 0, "call_llm", None, logger, response_format)
+            _drop_low_confidence(result, system_prompt, user_prompt, response_format)
+            return answer, result.confidence
+        return attempt
+
+    answer, confidence = run_with_retry(attempt_on(first_model), "call_llm", logger) or (None, None)
+    if first_model == ESCALATION_MODEL or not _first_tier_escalations([field], answer, confidence, file_id, logger):
+        return answer
+
+    answer, _ = run_with_retry(attempt_on(ESCALATION_MODEL), "call_llm", logger) or (None, None)
+    return answer
+
+
+@mlflow.trace(name="LLM Call - Wrapper Function (Async)")
+async def async_call_llm(query: str, retrieved_chunks: List[str], file_id, user_id, org_id, logger, model_name: Optional[str] = None) -> str:
+    """
+    Async variant of call_llm; backs off without blocking the event loop.
+    """
+    logger.info(_log_message("Starting async_call_llm...", "call_llm", MODULE_NAME))
+    retrieved_chunks = assemble_context(retrieved_chunks, context_token_budget(question_field(query)), "call_llm")
+
+    response_format = structured_response_format(question_response_schema(query))
+    field = question_field(query)
+    first_model = model_name or route_model(field)
+
+    def attempt_on(attempt_model):
+        async def attempt(feedback):
+            result = await async_llm_call(
+                query, retrieved_chunks, file_id, user_id, org_id, logger, feedback,
+                raise_on_error=True, response_format=response_format, model_name=attempt_model, detailed=True
+            )
+            routing_ledger.record_call(file_id, result.model_name, result.cost)
+            system_prompt, user_prompt = build_llm_call_prompts(query, retrieved_chunks, feedback)
+            answer = _parse_or_invalidate(result.answer, system_prompt, user_prompt, attempt_model, 0, "call_llm", None, logger, response_format)
+            _drop_low_confidence(result, system_prompt, user_prompt, response_format)
+            return answer, result.confidence
+        return attempt
+
+    answer, confidence = await async_run_with_retry(attempt_on(first_model), "call_llm", logger) or (None, None)
+    if first_model == ESCALATION_MODEL or not _first_tier_escalations([field], answer, confidence, file_id, logger):
+        return answer
+
+    answer, _ = await async_run_with_retry(attempt_on(ESCALATION_MODEL), "call_llm", logger) or (None, None)
+    return answer
+
+
+def _packed_response_format(questions):
+    """
+    Returns the combined schema of the packed fields, or plain JSON mode when structured outputs are disabled.
+    """
+    return structured_response_format(response_schema("packed_fields", [question_field(question) for question in questions])) or JSON_OBJECT_FORMAT
+
+
+def _parse_packed_answer(result, system_prompt, user_prompt, use_cache, logger, response_format) -> dict:
+    """
+    Parses a packed answer, which must be a single JSON object.
+    """
+    answers = _parse_or_invalidate(result.answer, system_prompt, user_prompt, result.model_name, 0, "call_llm_for_fields", use_cache, logger, response_format)
+    if not isinstance(answers, dict):
+        invalidate_cached_response(system_prompt, user_prompt, result.model_name, 0, response_format)
+        raise LLMCallError(LLMErrorKind.MALFORMED_JSON, "Packed answer is not a JSON object")
+    _drop_low_confidence(result, system_prompt, user_prompt, response_format)
+    return answers
+
+
+def _accepted_packed_answers(questions, outcome, model_name, file_id, logger):
+    """
+    Returns the packed answers to keep. First-tier answers that need escalation are left
+    out, so the caller re-asks those fields on the escalation model.
+    """
+    answers, confidence = outcome or (None, None)
+    if model_name == ESCALATION_MODEL:
+        return answers
+    fields = [question_field(question) for question in questions]
+    escalated = _first_tier_escalations(fields, answers, confidence, file_id, logger)
+    return {field: answers[field] for field in fields if field not in escalated}
+
+
+@mlflow.trace(name="LLM Call - Packed Fields")
+def call_llm_for_fields(
+    questions: List[dict],
+    retrieved_chunks: List[str],
+    file_id,
+    user_id,
+    org_id,
+    logger,
+    use_cache: Optional[bool] = None,
+    model_name: str = ESCALATION_MODEL
+) -> dict:
+    """
+    Answers several metadata questions with a single LLM call over their shared context.
+    Returns the parsed answer keyed by field, or None when every attempt failed. On a
+    first-tier ``model_name`` only the answers that need no escalation are returned.
+    """
+    logger.info(_log_message(f"Starting call_llm_for_fields for {len(questions)} fields on {model_name}...", "call_llm_for_fields", MODULE_NAME))
+    retrieved_chunks = assemble_context(retrieved_chunks, context_token_budget("call_llm_for_fields"), "call_llm_for_fields")
+    response_format = _packed_response_format(questions)
+
+    def attempt(feedback):
+        system_prompt, user_prompt = build_packed_prompts(questions, retrieved_chunks, feedback)
+        result = open_ai_llm_call(
+            system_prompt, user_prompt, model_name, 0, "call_llm_for_fields", logger,
+            use_cache=use_cache, raise_on_error=True, response_format=response_format, detailed=True
+        )
+        routing_ledger.record_call(file_id, result.model_name, result.cost)
+        return _parse_packed_answer(result, system_prompt, user_prompt, use_cache, logger, response_format), result.confidence
+
+    outcome = run_with_retry(attempt, "call_llm_for_fields", logger)
+    return _accepted_packed_answers(questions, outcome, model_name, file_id, logger)
+
+
+@mlflow.trace(name="LLM Call - Packed Fields (Async)")
+async def async_call_llm_for_fields(
+    questions: List[dict],
+    retrieved_chunks: List[str],
+    file_id,
+    user_id,
+    org_id,
+    logger,
+    use_cache: Optional[bool] = None,
+    model_name: str = ESCALATION_MODEL
+) -> dict:
+    """
+    Async variant of call_llm_for_fields.
+    """
+    logger.info(_log_message(f"Starting async_call_llm_for_fields for {len(questions)} fields on {model_name}...", "call_llm_for_fields", MODULE_NAME))
+    retrieved_chunks = assemble_context(retrieved_chunks, context_token_budget("call_llm_for_fields"), "call_llm_for_fields")
+    response_format = _packed_response_format(questions)
+
+    async def attempt(feedback):
+        system_prompt, user_prompt = build_packed_prompts(questions, retrieved_chunks, feedback)
+        result = await async_open_ai_llm_call(
+            system_prompt, user_prompt, model_name, 0, "call_llm_for_fields", logger,
+            use_cache=use_cache, raise_on_error=True, response_format=response_format, detailed=True
+        )
+        routing_ledger.record_call(file_id, result.model_name, result.cost)
+        return _parse_packed_answer(result, system_prompt, user_prompt, use_cache, logger, response_format), result.confidence
 
-    logger.error(_log_message("All retries failed. Exiting call_llm.", "call_llm", MODULE_NAME))
-    return None
+    outcome = await async_run_with_retry(attempt, "call_llm_for_fields", logger)
+    return _accepted_packed_answers(questions, outcome, model_name, file_id, logger)
 
 def payment_due_date_validatior(is_recursive, payment_due_date, expiry_date, current_date, file_id, user_id, org_id, logger):
     if expiry_date == "null":
@@ -0,0 +1,57 @@
+import threading
+from collections import defaultdict
+
+MODULE_NAME = "llm_metrics.py"
+
+
+class MetricsRegistry:
+    """
+    Thread-safe in-process counters and summaries for the LLM pipeline.
+
+    Metrics are keyed by name plus a sorted tuple of label pairs. ``snapshot`` returns a
+    JSON-serialisable view that can be logged or exported.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._summaries = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def increment(self, name: str, value: float = 1, **labels):
+        with self._lock:
+            self._counters[self._key(name, labels)] += value
+
+    def observe(self, name: str, value: float, **labels):
+        with self._lock:
+            summary = self._summaries.setdefault(self._key(name, labels), {"count": 0, "sum": 0.0, "max": 0.0})
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["max"] = max(summary["max"], value)
+
+    def counter(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get(self._key(name, labels), 0.0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in self._counters.items()
+            ]
+            summaries = [
+                {"name": name, "labels": dict(labels), **summary, "avg": summary["sum"] / summary["count"]}
+                for (name, labels), summary in self._summaries.items()
+            ]
+        return {"counters": counters, "summaries": summaries}
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+
+metrics = MetricsRegistry()
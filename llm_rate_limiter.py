@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from config.config import config
+from services.insights.llm_metrics import metrics
+
+MODULE_NAME = "llm_rate_limiter.py"
+
+# Per-model quota (requests and tokens per minute), overridable from config
+DEFAULT_RATE_LIMITS = {
+    "gpt-4o": {"rpm": 5_000, "tpm": 800_000},
+    "gpt-4o-mini": {"rpm": 5_000, "tpm": 4_000_000},
+}
+OPENAI_RATE_LIMITS = getattr(config, "OPENAI_RATE_LIMITS", DEFAULT_RATE_LIMITS)
+# Fraction of the quota we pace to, so smoothed traffic stays just under the limit
+OPENAI_RATE_LIMIT_HEADROOM = getattr(config, "OPENAI_RATE_LIMIT_HEADROOM", 0.9)
+# Completion tokens reserved up front for each request
+ESTIMATED_COMPLETION_TOKENS = getattr(config, "OPENAI_ESTIMATED_COMPLETION_TOKENS", 256)
+
+# Rough chat-format overhead per message
+_TOKENS_PER_MESSAGE = 4
+
+
+def estimate_tokens(system_prompt: str, user_prompt: str, completion_tokens: int = ESTIMATED_COMPLETION_TOKENS) -> int:
+    """
+    Estimates the tokens a chat request will be charged for before it is sent.
+    """
+    prompt_chars = len(system_prompt or "") + len(user_prompt or "")
+    return prompt_chars // 4 + 2 * _TOKENS_PER_MESSAGE + completion_tokens
+
+
+class TokenBucket:
+    """
+    A token bucket refilled continuously at ``per_minute / 60`` per second.
+
+    ``reserve`` always succeeds and returns how long the caller must wait before its
+    reservation is covered. The bucket may go into debt, so callers queue up behind each
+    other in arrival order instead of racing for the next refill.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # A single request larger than the bucket would never fit, charge at most one full bucket
+        self.tokens -= min(amount, self.capacity)
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def refund(self, amount: float, now: float):
+        self._refill(now)
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+@dataclass
+class Reservation:
+    model_name: str
+    estimated_tokens: int
+    wait_seconds: float
+
+
+class ModelRateLimiter:
+    """
+    Process-wide request and token pacing per model, shared by threads and coroutines.
+
+    The bucket state sits behind a short threading lock. Waiting happens outside it,
+    with time.sleep on threads and asyncio.sleep on the event loop.
+    """
+
+    def __init__(self, limits: dict = OPENAI_RATE_LIMITS, headroom: float = OPENAI_RATE_LIMIT_HEADROOM):
+        self._lock = threading.Lock()
+        self._buckets = {
+            model_name: (TokenBucket(limit["rpm"] * headroom), TokenBucket(limit["tpm"] * headroom))
+            for model_name, limit in limits.items()
+        }
+
+    def _reserve(self, model_name: str, estimated_tokens: int) -> Reservation:
+        buckets = self._buckets.get(model_name)
+        if buckets is None:
+            return Reservation(model_name, estimated_tokens, 0.0)
+        request_bucket, token_bucket = buckets
+        with self._lock:
+            now = time.monotonic()
+            wait_seconds = max(request_bucket.reserve(1, now), token_bucket.reserve(estimated_tokens, now))
+        metrics.observe("llm_rate_limiter.queue_wait_seconds", wait_seconds, model=model_name)
+        if wait_seconds:
+            metrics.increment("llm_rate_limiter.throttled_requests", model=model_name)
+        return Reservation(model_name, estimated_tokens, wait_seconds)
+
+    def acquire(self, model_name: str, estimated_tokens: int) -> Reservation:
+        """
+        Blocks the calling thread until the request fits the model's quota.
+        """
+        reservation = self._reserve(model_name, estimated_tokens)
+        if reservation.wait_seconds:
+            time.sleep(reservation.wait_seconds)
+        return reservation
+
+    async def acquire_async(self, model_name: str, estimated_tokens: int) -> Reservation:
+        """
+        Waits on the event loop until the request fits the model's quota.
+        """
+        reservation = self._reserve(model_name, estimated_tokens)
+        if reservation.wait_seconds:
+            await asyncio.sleep(reservation.wait_seconds)
+        return reservation
+
+    def reconcile(self, reservation: Reservation, actual_tokens: int):
+        """
+        Corrects the token bucket once the real usage of a request is known.
+        """
+        buckets = self._buckets.get(reservation.model_name)
+        if buckets is None or actual_tokens is None:
+            return
+        _, token_bucket = buckets
+        with self._lock:
+            token_bucket.refund(reservation.estimated_tokens - actual_tokens, time.monotonic())
+        metrics.increment("llm_rate_limiter.estimated_tokens", reservation.estimated_tokens, model=reservation.model_name)
+        metrics.increment("llm_rate_limiter.actual_tokens", actual_tokens, model=reservation.model_name)
+
+
+rate_limiter = ModelRateLimiter()
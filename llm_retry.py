@@ -0,0 +1,201 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from typing import Optional
+from openai import APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+from config.config import config
+from utils.logger import _log_message
+
+MODULE_NAME = "llm_retry.py"
+
+
+class LLMErrorKind(str, Enum):
+    RATE_LIMIT = "rate_limit"
+    TIMEOUT = "timeout"
+    SERVER_ERROR = "server_error"
+    CONNECTION_ERROR = "connection_error"
+    MALFORMED_JSON = "malformed_json"
+    EMPTY_RESPONSE = "empty_response"
+    CLIENT_ERROR = "client_error"
+    UNKNOWN = "unknown"
+
+
+class LLMCallError(Exception):
+    """
+    A classified failure of an LLM call.
+    """
+
+    def __init__(self, kind: LLMErrorKind, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.kind = kind
+        self.retry_after = retry_after
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retry policy shared by the LLM entry points.
+
+    Transient API errors back off exponentially with full jitter, capped at ``max_delay``
+    and never shorter than the server's Retry-After. Malformed answers are re-asked
+    straight away with the parse error as feedback. No attempt starts once the overall
+    ``deadline_seconds`` would be exceeded.
+    """
+    max_attempts: int = getattr(config, "LLM_RETRY_MAX_ATTEMPTS", 3)
+    base_delay: float = getattr(config, "LLM_RETRY_BASE_DELAY", 0.5)
+    max_delay: float = getattr(config, "LLM_RETRY_MAX_DELAY", 8.0)
+    deadline_seconds: float = getattr(config, "LLM_RETRY_DEADLINE_SECONDS", 60.0)
+    retryable: frozenset = field(default_factory=lambda: frozenset({
+        LLMErrorKind.RATE_LIMIT,
+        LLMErrorKind.TIMEOUT,
+        LLMErrorKind.SERVER_ERROR,
+        LLMErrorKind.CONNECTION_ERROR,
+        LLMErrorKind.MALFORMED_JSON,
+        LLMErrorKind.EMPTY_RESPONSE,
+    }))
+    # Kinds that are re-asked immediately rather than backed off
+    immediate: frozenset = field(default_factory=lambda: frozenset({
+        LLMErrorKind.MALFORMED_JSON,
+        LLMErrorKind.EMPTY_RESPONSE,
+    }))
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """
+    Returns the server requested delay in seconds from Retry-After style headers.
+    """
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(float(retry_after_ms) / 1000, 0.0)
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+        return max(retry_at.timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(error: Exception) -> LLMCallError:
+    """
+    Maps an exception raised while calling or parsing the LLM to an LLMCallError.
+    """
+    if isinstance(error, LLMCallError):
+        return error
+    if isinstance(error, RateLimitError):
+        return LLMCallError(LLMErrorKind.RATE_LIMIT, str(error), parse_retry_after(error.response.headers))
+    if isinstance(error, APITimeoutError):
+        return LLMCallError(LLMErrorKind.TIMEOUT, str(error))
+    if isinstance(error, APIConnectionError):
+        return LLMCallError(LLMErrorKind.CONNECTION_ERROR, str(error))
+    if isinstance(error, APIStatusError):
+        retry_after = parse_retry_after(error.response.headers)
+        if error.status_code >= 500:
+            return LLMCallError(LLMErrorKind.SERVER_ERROR, str(error), retry_after)
+        if error.status_code in (408, 409):
+            return LLMCallError(LLMErrorKind.TIMEOUT, str(error), retry_after)
+        return LLMCallError(LLMErrorKind.CLIENT_ERROR, str(error))
+    if isinstance(error, TimeoutError):
+        return LLMCallError(LLMErrorKind.TIMEOUT, str(error))
+    return LLMCallError(LLMErrorKind.UNKNOWN, str(error))
+
+
+def compute_backoff(policy: RetryPolicy, attempt: int, error: LLMCallError) -> float:
+    """
+    Returns the delay before the next attempt: full-jitter exponential backoff,
+    raised to the server's Retry-After when one was given.
+    """
+    if error.kind in policy.immediate:
+        return 0.0
+    delay = random.uniform(0, min(policy.max_delay, policy.base_delay * (2 ** attempt)))
+    if error.retry_after is not None:
+        delay = max(delay, error.retry_after)
+    return delay
+
+
+def _next_delay(policy, attempt, error, deadline, function_name, logger):
+    """
+    Returns the delay before the next attempt, or None when the call should give up.
+    """
+    if error.kind not in policy.retryable:
+        logger.error(_log_message(f"Not retrying {error.kind.value} failure: {error}", function_name, MODULE_NAME))
+        return None
+    if attempt + 1 >= policy.max_attempts:
+        return None
+    delay = compute_backoff(policy, attempt, error)
+    if time.monotonic() + delay >= deadline:
+        logger.error(_log_message(f"Retry deadline of {policy.deadline_seconds}s reached.", function_name, MODULE_NAME))
+        return None
+    logger.warning(
+        _log_message(f"Attempt {attempt+1} failed with {error.kind.value} error: {error}. Retrying in {delay:.2f}s...", function_name, MODULE_NAME)
+    )
+    return delay
+
+
+def _feedback_for(error: LLMCallError, feedback: str) -> str:
+    """
+    Returns the feedback to send with the next attempt.
+    """
+    if error.kind in (LLMErrorKind.MALFORMED_JSON, LLMErrorKind.EMPTY_RESPONSE):
+        return f"Previous error encountered: {error}."
+    return feedback
+
+
+def run_with_retry(attempt_fn, function_name: str, logger, feedback: str = "", policy: RetryPolicy = DEFAULT_RETRY_POLICY):
+    """
+    Calls ``attempt_fn(feedback)`` until it succeeds, the error is not retryable, the
+    attempts run out or the deadline passes. Returns None when every attempt failed.
+    """
+    deadline = time.monotonic() + policy.deadline_seconds
+    for attempt in range(policy.max_attempts):
+        try:
+            return attempt_fn(feedback)
+        except Exception as e:
+            error = classify_error(e)
+            delay = _next_delay(policy, attempt, error, deadline, function_name, logger)
+            if delay is None:
+                break
+            feedback = _feedback_for(error, feedback)
+            if delay:
+                time.sleep(delay)
+
+    logger.error(_log_message(f"All retries failed. Exiting {function_name}.", function_name, MODULE_NAME))
+    return None
+
+
+async def async_run_with_retry(attempt_fn, function_name: str, logger, feedback: str = "", policy: RetryPolicy = DEFAULT_RETRY_POLICY):
+    """
+    Async variant of run_with_retry. ``attempt_fn`` returns an awaitable and the backoff
+    sleeps on the event loop instead of a worker thread.
+    """
+    deadline = time.monotonic() + policy.deadline_seconds
+    for attempt in range(policy.max_attempts):
+        try:
+            return await attempt_fn(feedback)
+        except Exception as e:
+            error = classify_error(e)
+            delay = _next_delay(policy, attempt, error, deadline, function_name, logger)
+            if delay is None:
+                break
+            feedback = _feedback_for(error, feedback)
+            if delay:
+                await asyncio.sleep(delay)
+
+    logger.error(_log_message(f"All retries failed. Exiting {function_name}.", function_name, MODULE_NAME))
+    return None
@@ -0,0 +1,140 @@
+import re
+import threading
+from typing import Dict, List, Optional
+from config.config import config
+from services.insights.llm_metrics import metrics
+
+try:
+    import numpy as np
+except ImportError:  # every question is then retrieved from Pinecone
+    np = None
+
+MODULE_NAME = "local_retriever.py"
+
+# Off until its recall is shown close to the hybrid Pinecone retrieval it replaces
+LOCAL_RETRIEVAL_ENABLED = getattr(config, "LOCAL_RETRIEVAL_ENABLED", False)
+# Larger files are retrieved from Pinecone, whose dense vectors rank long documents better
+LOCAL_RETRIEVAL_MAX_CHUNKS = getattr(config, "LOCAL_RETRIEVAL_MAX_CHUNKS", 300)
+BM25_K1 = getattr(config, "BM25_K1", 1.5)
+BM25_B = getattr(config, "BM25_B", 0.75)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+# Question words that would otherwise rank chunks by how often they ask or say "what"
+_STOPWORDS = frozenset(
+    "a an and any are as at be by do does for from has have how in is it its of on or that the their there these this "
+    "to was what when where which who whom why will with".split()
+)
+
+
+# Stripped so that "governing law" matches "governed by the laws" and "dates" matches "dated"
+_SUFFIXES = ("ing", "ed", "es", "e", "s")
+
+
+def _stem(token: str) -> str:
+    if token.endswith("ss"):
+        return token
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    return [_stem(token) for token in _TOKEN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+class BM25Index:
+    """
+    Okapi BM25 over the chunks of one document. The weight of every (term, chunk) pair is
+    computed once; a query sums the weights of its terms' postings into one score per chunk.
+    """
+
+    def __init__(self, texts: List[str], k1: float = BM25_K1, b: float = BM25_B):
+        self.size = len(texts)
+        self.vocabulary: Dict[str, int] = {}
+        term_ids, chunk_ids = [], []
+        lengths = np.zeros(self.size)
+        for chunk_id, text in enumerate(texts):
+            tokens = tokenize(text)
+            lengths[chunk_id] = len(tokens)
+            term_ids.extend(self.vocabulary.setdefault(token, len(self.vocabulary)) for token in tokens)
+            chunk_ids.extend([chunk_id] * len(tokens))
+
+        # One entry per distinct (term, chunk), sorted by term: the postings of a term are contiguous
+        pairs, term_frequencies = np.unique(np.array(term_ids, dtype=np.int64) * self.size + np.array(chunk_ids, dtype=np.int64), return_counts=True)
+        terms, self._chunks = pairs // self.size, pairs % self.size
+        document_frequencies = np.bincount(terms, minlength=len(self.vocabulary))
+        idf = np.log1p((self.size - document_frequencies + 0.5) / (document_frequencies + 0.5))
+        length_norm = 1 - b + b * lengths[self._chunks] / max(lengths.mean(), 1.0)
+        self._weights = idf[terms] * term_frequencies * (k1 + 1) / (term_frequencies + k1 * length_norm)
+        self._offsets = np.concatenate(([0], np.cumsum(document_frequencies)))
+
+    def scores(self, query: str):
+        scores = np.zeros(self.size)
+        for token in set(tokenize(query)):
+            term = self.vocabulary.get(token)
+            if term is not None:
+                start, end = self._offsets[term], self._offsets[term + 1]
+                # A term has one posting per chunk, so the indexed add sees no repeated chunk
+                scores[self._chunks[start:end]] += self._weights[start:end]
+        return scores
+
+    def top_k(self, query: str, k: int) -> List[int]:
+        """
+        Returns the ids of the ``k`` best matching chunks, best first, leaving out chunks
+        that share no term with the query.
+        """
+        scores = self.scores(query)
+        best = np.argsort(-scores, kind="stable")[:k]
+        return [int(chunk_id) for chunk_id in best if scores[chunk_id] > 0]
+
+
+class LocalRetriever:
+    """
+    Answers the retrieval of a file's metadata questions from its chunks in memory.
+    """
+
+    def __init__(self, chunks: List[str]):
+        self.chunks = list(chunks)
+        self.index = BM25Index(self.chunks)
+
+    def retrieve(self, query: str, top_k: int) -> List[str]:
+        return [self.chunks[chunk_id] for chunk_id in self.index.top_k(query, top_k)]
+
+
+class LocalRetrieverRegistry:
+    """
+    Per-file local retrievers, built once when a file's extraction starts and dropped when
+    it ends. Files without one are retrieved from Pinecone.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._retrievers: Dict[str, LocalRetriever] = {}
+
+    def register(self, file_id, chunks: List[str]) -> Optional[LocalRetriever]:
+        """
+        Builds the retriever of a file unless local retrieval is disabled, NumPy is missing
+        or the file is empty or above LOCAL_RETRIEVAL_MAX_CHUNKS chunks.
+        """
+        if not LOCAL_RETRIEVAL_ENABLED or np is None or not chunks:
+            return None
+        if len(chunks) > LOCAL_RETRIEVAL_MAX_CHUNKS:
+            metrics.increment("local_retriever.files_too_large")
+            return None
+        retriever = LocalRetriever(chunks)
+        with self._lock:
+            self._retrievers[file_id] = retriever
+        metrics.increment("local_retriever.files")
+        return retriever
+
+    def get(self, file_id) -> Optional[LocalRetriever]:
+        with self._lock:
+            return self._retrievers.get(file_id)
+
+    def pop(self, file_id) -> Optional[LocalRetriever]:
+        with self._lock:
+            return self._retrievers.pop(file_id, None)
+
+
+local_retrievers = LocalRetrieverRegistry()
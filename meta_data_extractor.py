@@ -1,9 +1,31 @@
 from services.insights.contract_metadata_vector_handler import ContractMetadataVectorUpserter
+import asyncio
 import time
 from utils.llm_status_handler.status_handler import set_llm_file_status
 from utils.llm_status_handler.status_handler import set_meta_data
 from services.insights.llm_call import call_llm, llm_call_for_dates, llm_call_for_jurisdiction, llm_call_for_cv, payment_due_date_validatior
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from services.insights.llm_call import async_call_llm, async_llm_call_for_dates, async_llm_call_for_jurisdiction, async_llm_call_for_cv
+from services.insights.llm_call import build_llm_call_prompts, build_dates_prompts, build_jurisdiction_prompts, build_cv_prompts, parse_llm_response
+from services.insights.llm_call import call_llm_for_fields, async_call_llm_for_fields, structured_response_format
+from services.insights.llm_batch import OpenAIBatchBackend, build_batch_line, run_batch
+from services.insights.context_budget import assemble_context, assemble_text_context, context_token_budget
+from services.insights.llm_metrics import metrics
+from services.insights.llm_retry import LLMCallError
+from services.insights.model_router import ESCALATION_MODEL, route_model, route_questions, routing_ledger
+from services.insights.metadata_fields import DATE_FIELDS, PAYMENT_DUE_DATE_QUESTION, is_valid_field_value, question_field, question_response_schema
+from services.insights.metadata_fields import CONTRACT_VALUE_RESPONSE_SCHEMA, JURISDICTION_RESPONSE_SCHEMA, dates_response_schema
+from services.insights.document_index import DocumentIndex, split_sentences
+from services.insights.contract_value_parser import resolve_contract_value
+from services.insights.date_resolver import resolve_dates
+from services.insights.jurisdiction_resolver import resolve_jurisdiction
+from services.insights.document_scanner import scan_document
+from services.insights.stage_scheduler import Stage, async_run_stages, run_stages, stage_executor
+from services.insights.fair_executor import fair_executor
+from services.insights.query_embedding_cache import QUERY_VECTOR_ARGUMENT, accepts_query_vector, get_query_embedding_cache, warm_query_embedding_cache
+from services.insights.local_retriever import local_retrievers
+from services.insights.extraction_provenance import DocumentFingerprint, FileProvenance, get_provenance_store, support_ledger
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime
 from config.config import config
 from utils.hybrid_retriever.hybrid_search_retrieval import get_context_from_pinecone
@@ -11,478 +33,11 @@ from utils.logger import _log_message
 import orjson
 import mlflow
 import psutil
-import re
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 from opentelemetry import context as ot_context
 mlflow.config.enable_async_logging()
 # mlflow.langchain.autolog()
 mlflow.openai.autolog()
     
-date_pattern = r"""
-\b(
-    # === DOCUMENT-SPECIFIC DATE FIELD PATTERNS ===
-    
-    # Effective Date patterns
-    (?:effective\s+date\s*[:;]?\s*(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
-    (?:(?:this\s+agreement\s+(?:is|shall\s+be)\s+)?effective\s+(?:as\s+of|on|from)?[\s:]*.{0,50}?(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
-    
-    # Termination Date patterns
-    (?:termination\s+date\s*[:;]?\s*(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
-    (?:terminates\s+(?:on|at|after|before|by)[\s:]*.{0,50}?(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
-    
-    # Expiration Date patterns
-    (?:expiration\s+date\s*[:;]?\s*(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
-    (?:expires\s+(?:on|at|after|before|by)[\s:]*.{0,50}?(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
-    
-    # Term Date patterns
-    (?:term\s+date\s*[:;]?\s*(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
-    (?:term\s+(?:shall|will)\s+(?:begin|commence|start)\s+(?:on|at|from)[\s:]*.{0,50}?(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
-    
-    # Payment Due Date patterns
-    (?:payment\s+due\s+date\s*[:;]?\s*(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
-    (?:payment\s+(?:is|shall\s+be)\s+due\s+(?:on|by|before|after|within)[\s:]*.{0,50}?(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
-    
-    # Delivery Date patterns
-    (?:delivery\s+date\s*[:;]?\s*(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
-    (?:delivery\s+(?:shall|will)\s+(?:be|occur|take\s+place)\s+(?:on|by|before|after|within)[\s:]*.{0,50}?(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
-    
-    # Renewal Date patterns
-    (?:renewal\s+date\s*[:;]?\s*(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
-    (?:(?:agreement|contract)\s+(?:shall|will|may)\s+(?:renew|be\s+renewed)\s+(?:on|as\s+of|effective)[\s:]*.{0,50}?(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
-
-    # Section headings with dates
-    (?:^|\n|\r)[\s*]*(?:effective|term|termination|expiration|renewal|payment\s+due|delivery)\s+date[\s*:-]*\s*(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4})|
-
-    # === GENERAL DATE PATTERNS ===
-    
-     # ISO 8601 with time components
-    \d{4}[-/]\d{1,2}[-/]\d{1,2}[T ]\d{1,2}:\d{2}(?::\d{2})?(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})? |
-    
-    # YYYY-MM-DD or YYYY/MM/DD or YYYY.MM.DD
-    \d{4}[-/\.]\d{1,2}[-/\.]\d{1,2} |
-    
-    # DD-MM-YYYY or DD/MM/YYYY or DD.MM.YYYY
-    \d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4} |
-    
-    # DD MM YYYY or YYYY MM DD (space separated)
-    \d{1,2}\s+\d{1,2}\s+\d{4} |
-    \d{4}\s+\d{1,2}\s+\d{1,2} |
-    
-    # Month DD, YYYY or DD Month YYYY
-    (?:\d{1,2}(?:st|nd|rd|th)?[ -/]?)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[ -/]?(?:\d{1,2}(?:st|nd|rd|th)?[,]?[ -/])?\d{2,4} |
-    
-    # Month YYYY or Month DD
-    (?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[ -/\.]\d{4} |
-    (?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[ -/\.]\d{1,2}(?:st|nd|rd|th)? |
-
-    # Day of week with date
-    (?:Mon(?:day)?|Tue(?:sday)?|Wed(?:nesday)?|Thu(?:rsday)?|Fri(?:day)?|Sat(?:urday)?|Sun(?:day)?)[,]?\s+(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2}(?:st|nd|rd|th)?[,]?\s+\d{4} |
-    
-    # Quarter notation
-    Q[1-4]\s+\d{4} |
-    \d{4}\s+Q[1-4] |
-    [1-4]Q\s+\d{4} |
-    \d{4}\s+[1-4]Q |
-    (?:First|Second|Third|Fourth|1st|2nd|3rd|4th)\s+quarter\s+\d{4} |
-    \d{4}\s+(?:First|Second|Third|Fourth|1st|2nd|3rd|4th)\s+quarter |
-    
-    # Week notation
-    Week\s+\d{1,2}\s+\d{4} |
-    \d{4}\s+Week\s+\d{1,2} |
-    W\d{1,2}\s+\d{4} |
-    \d{4}\s+W\d{1,2} |
-    W\d{1,2}-\d{4} |
-    
-    # Month/Year formats
-    \d{1,2}/\d{4} |
-    \d{1,2}-\d{4} |
-    
-    # Date ranges
-    \d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}\s+(?:to|through|thru|-)\s+\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2} |
-    \d{1,2}[-/\.]\d{1,2}[-/\.]\d{4}\s+(?:to|through|thru|-)\s+\d{1,2}[-/\.]\d{1,2}[-/\.]\d{4} |
-    (?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2}(?:st|nd|rd|th)?\s+-\s+(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2}(?:st|nd|rd|th)?[,]?\s+\d{4} |
-    
-    # Fiscal year notation
-    FY\s*\d{2,4} |
-    Fiscal\s+Year\s+\d{4} |
-    Fiscal\s+\d{4} |
-    
-    # Chinese/Japanese year format (e.g., 令和5年10月1日)
-    [令和|平成|昭和|大正|明治]\d{1,2}年\d{1,2}月\d{1,2}日 |
-    
-    # Timestamps with dates
-    \d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}\s+\d{1,2}:\d{2}(?::\d{2})?\s*(?:AM|PM|am|pm)? |
-    \d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}\s+\d{1,2}:\d{2}(?::\d{2})?\s*(?:AM|PM|am|pm)? |
-    
-    # Unix timestamp (10-13 digits)
-    \b\d{10,13}\b |
-    
-    # RFC 2822 format
-    (?:Mon|Tue|Wed|Thu|Fri|Sat|Sun),\s+\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}\s+\d{2}:\d{2}(?::\d{2})?\s+(?:[+-]\d{4}|UTC|GMT|[A-Z]{3}) |
-    
-    # French date format (e.g., 1er janvier 2023)
-    \d{1,2}(?:er|ème|e|ère)?\s+(?:janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)\s+\d{4} |
-    
-    # Spanish date format
-    \d{1,2}\s+de\s+(?:enero|febrero|marzo|abril|mayo|junio|julio|agosto|septiembre|octubre|noviembre|diciembre)(?:\s+de)?\s+\d{4} |
-    
-    # German date format
-    \d{1,2}\.\s+(?:Januar|Februar|März|April|Mai|Juni|Juli|August|September|Oktober|November|Dezember)\s+\d{4} |
-    
-    # Year-specific patterns
-    
-    # Year preceded by words
-    (?:year|in|during|of|for|by|before|after|since|until|around|circa|ca\.?|c\.?)\s+\d{4} |
-    
-    # Years with era designations
-    \d{1,4}\s*(?:AD|BC|BCE|CE|B\.C\.(?:E\.)?|C\.E\.|A\.D\.) |
-    (?:AD|BC|BCE|CE|B\.C\.(?:E\.)?|C\.E\.|A\.D\.)\s*\d{1,4} |
-    
-    # Decade references
-    \d{3}0s |
-    \d{4}s |
-    \d{4}-\d{2} |
-    \d{2}s |
-    (?:the\s+)?(?:twenty|nineteen|eighteen|seventeen|sixteen|fifteen|fourteen|thirteen|twelve|twenty-first|twentieth|nineteenth|eighteenth|seventeenth|sixteenth|fifteenth|fourteenth|thirteenth|twelfth)\s+(?:century|hundreds) |
-    (?:the\s+)?(?:twenties|thirties|forties|fifties|sixties|seventies|eighties|nineties) |
-    
-    # Year ranges
-    \d{4}\s*(?:-|to|through|until|and|&|–|—)\s*\d{4} |
-    \d{4}\s*(?:-|to|through|until|and|&|–|—)\s*\d{2} |
-    
-    # Academic/school years
-    (?:academic\s+year\s+)?\d{4}[-/]\d{2,4} |
-    (?:academic\s+year\s+)?\d{4}[-/]\d{2} |
-    (?:AY|SY)\s*\d{4}[-/]\d{2,4} |
-    
-    # Centuries
-    (?:(?:\d{1,2}(?:st|nd|rd|th)?|(?:twenty|nineteen|eighteen|seventeen|sixteen|fifteen|fourteen|thirteen|twelve|twenty-first|twentieth|nineteenth|eighteenth|seventeenth|sixteenth|fifteenth|fourteenth|thirteenth|twelfth))\s+century) |
-    
-    # Year only (must be a complete 4-digit number)
-    \b\d{4}\b |
-    
-    # ----- NEW PATTERNS BELOW -----
-    
-    # Relative time expressions
-    (?:(?:last|next|previous|coming|this)\s+(?:week|month|year|decade|century|spring|summer|fall|autumn|winter)) |
-    (?:(?:\d{1,3}|a|an|one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|twenty|thirty|forty|fifty|sixty|seventy|eighty|ninety|hundred|thousand|few|several|many|couple)\s+(?:second|minute|hour|day|week|fortnight|month|quarter|year|decade|century)s?\s+(?:ago|from\s+now|hence|later|earlier|before|after)) |
-    
-    # Specific day references
-    (?:today|yesterday|tomorrow|day\s+before\s+yesterday|day\s+after\s+tomorrow) |
-    
-    # Days of week references
-    (?:on\s+)?(?:Mon(?:day)?|Tue(?:sday)?|Wed(?:nesday)?|Thu(?:rsday)?|Fri(?:day)?|Sat(?:urday)?|Sun(?:day)?)(?:\s+(?:morning|afternoon|evening|night))? |
-    
-    # Month/season + year patterns
-    (?:(?:early|mid|late|beginning\s+of|end\s+of)\s+)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+(?:of\s+)?\d{4} |
-    
-    # Season + year patterns
-    (?:(?:early|mid|late|beginning\s+of|end\s+of)\s+)?(?:Spring|Summer|Fall|Autumn|Winter)\s+(?:of\s+)?\d{4} |
-    \d{4}\s+(?:Spring|Summer|Fall|Autumn|Winter) |
-    
-    # Holiday references with year
-    (?:Christmas|Easter|Thanksgiving|Halloween|New\s+Year(?:'s)?|Valentine's\s+Day|St\.\s+Patrick's\s+Day|Independence\s+Day|Labor\s+Day|Memorial\s+Day|Veterans\s+Day|MLK\s+Day|Martin\s+Luther\s+King\s+Day|Presidents'\s+Day|Columbus\s+Day|Hanukkah|Passover|Rosh\s+Hashanah|Yom\s+Kippur|Diwali|Eid(?:\s+al-Fitr|\s+al-Adha)?|Ramadan|Chinese\s+New\s+Year|Lunar\s+New\s+Year)\s+(?:of\s+)?\d{4} |
-    \d{4}\s+(?:Christmas|Easter|Thanksgiving|Halloween|New\s+Year(?:'s)?|Valentine's\s+Day|St\.\s+Patrick's\s+Day|Independence\s+Day|Labor\s+Day|Memorial\s+Day|Veterans\s+Day|MLK\s+Day|Martin\s+Luther\s+King\s+Day|Presidents'\s+Day|Columbus\s+Day|Hanukkah|Passover|Rosh\s+Hashanah|Yom\s+Kippur|Diwali|Eid(?:\s+al-Fitr|\s+al-Adha)?|Ramadan|Chinese\s+New\s+Year|Lunar\s+New\s+Year) |
-    
-    # Duration expressions
-    (?:for|during|over|within|in|throughout|across|spanning)\s+(?:\d{1,3}|a|an|one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|twenty|thirty|forty|fifty|sixty|seventy|eighty|ninety|hundred|thousand|few|several|many|couple)\s+(?:second|minute|hour|day|week|month|year|decade|century)s? |
-    
-    # Time periods like "first half of 2023"
-    (?:first|second|third|fourth|1st|2nd|3rd|4th|H1|H2|initial|early|mid|middle|late|latter|final)\s+(?:half|part|portion|quarter)\s+of\s+(?:\d{4}|the\s+year) |
-    (?:Q[1-4]|[1-4]Q)\s+of\s+\d{4} |
-    
-    # Date and day ordinals
-    (?:(?:the\s+)?\d{1,2}(?:st|nd|rd|th)\s+(?:of\s+)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)) |
-    
-    # Approximate dates
-    (?:circa|ca\.|c\.|around|approximately|about|roughly|in\s+or\s+around|somewhere\s+around)\s+\d{4} |
-    
-    # Frequency expressions
-    (?:(?:every|each)\s+(?:other\s+)?(?:second|minute|hour|day|week|month|quarter|year|decade|century|Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday|Mon|Tue|Wed|Thu|Fri|Sat|Sun|January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|Jun|Jul|Aug|Sep|Oct|Nov|Dec)) |
-    (?:daily|weekly|monthly|quarterly|yearly|annually|bi-weekly|bi-monthly|bi-annually|semi-annually|fortnightly) |
-    
-    # Time periods with prepositions
-    (?:from|since|between|after|before|prior\s+to|following|as\s+of|as\s+at|starting|ending|beginning|until|till|up\s+to)\s+(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+(?:\d{1,2}(?:st|nd|rd|th)?\s+)?(?:\d{4})? |
-    
-    # Age references
-    (?:aged|age)\s+\d{1,3} |45 j
-    \d{1,3}\s+(?:years|months|weeks|days)\s+old |
-    
-    # Century parts
-    (?:early|mid|late|beginning\s+of|end\s+of)\s+(?:the\s+)?\d{1,2}(?:st|nd|rd|th)\s+century |
-    (?:early|mid|late|beginning\s+of|end\s+of)\s+(?:the\s+)?(?:twentieth|nineteenth|eighteenth|seventeenth|sixteenth|fifteenth|fourteenth|thirteenth|twelfth|twenty-first)\s+century |
-    
-    # Time spans with "from...to" format
-    from\s+\d{4}\s+to\s+\d{4} |
-    from\s+(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+(?:\d{1,2})?\s+to\s+(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+(?:\d{1,2})?\s+\d{4} |
-    
-    # Recurring dates
-    (?:every|each)\s+(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday|Mon|Tue|Wed|Thu|Fri|Sat|Sun|January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2}(?:st|nd|rd|th)? |
-    
-    # X days/weeks/months/years ago/from now
-    \d{1,3}\s+(?:second|minute|hour|day|week|month|year|decade)s?\s+(?:ago|from\s+now|later|before|after|hence) |
-    
-    # Morning/afternoon/evening references
-    (?:this|tomorrow|yesterday|next|last|previous|coming)\s+(?:morning|afternoon|evening|night) |
-    
-    # Weekend references
-    (?:this|next|last|previous|coming)\s+weekend |
-    
-    # Named periods
-    (?:the\s+)?(?:Great\s+Depression|Renaissance|Medieval\s+period|Middle\s+Ages|Stone\s+Age|Bronze\s+Age|Iron\s+Age|Industrial\s+Revolution|Digital\s+Age|Information\s+Age|Cold\s+War|World\s+War\s+(?:I|II|One|Two|1|2)|Victorian\s+Era|Georgian\s+Era|Edwardian\s+Era|Elizabethan\s+Era|Tudor\s+period|Roman\s+Empire|Byzantine\s+Empire|Ming\s+Dynasty|Qing\s+Dynasty|Han\s+Dynasty|Ottoman\s+Empire|Paleolithic|Mesolithic|Neolithic|post-war\s+era) |
-    
-    # Specific time period references
-    (?:the\s+)?(?:Stone|Bronze|Iron|Dark|Middle|Golden|Modern|Post-modern|Contemporary|Colonial|Post-colonial|Post-war|Pre-war|Antebellum|Post-apocalyptic)\s+(?:Age|Era|Period) |
-    
-    # Business quarters and fiscal periods
-    (?:Q[1-4]|[1-4]Q|first\s+quarter|second\s+quarter|third\s+quarter|fourth\s+quarter|H1|H2|first\s+half|second\s+half)\s+(?:FY)?\s*\d{2,4} |
-    
-    # Anniversary references
-    \d{1,3}(?:st|nd|rd|th)?\s+anniversary |
-    
-    # Vague time references
-    (?:a\s+(?:short|long)\s+(?:time|while)\s+(?:ago|from\s+now)|some\s+time\s+(?:ago|from\s+now)|in\s+recent\s+(?:days|weeks|months|years)|in\s+the\s+(?:near|distant)\s+(?:future|past))
-)\b
-"""
-# date_pattern = r"""
-# \b
-# (
-#     # YYYY-MM-DD or YYYY/MM/DD
-#     \d{4}[-/]\d{1,2}[-/]\d{1,2} |
-    
-#     # DD-MM-YYYY or DD/MM/YYYY
-#     \d{1,2}[-/]\d{1,2}[-/]\d{2,4} |
-    
-#     # Month DD, YYYY or DD Month YYYY
-#     (?:\d{1,2}(?:st|nd|rd|th)?[ -/]?)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[ -/]?(?:\d{1,2}(?:st|nd|rd|th)?[,]?[ -/])?\d{2,4} |
-    
-#     # Month YYYY or Month DD
-#     (?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[ -/]\d{4} |
-#     (?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[ -/]\d{1,2} |
-
-#     # Year only
-#     \b\d{4}\b
-# )
-# \b
-# """
-jurisdiction_regex = r"""
-Comprehensive regex pattern for identifying jurisdiction and governing law clauses in legal documents.
-
-This pattern captures various forms of jurisdiction references including:
-- Governing law clauses
-- Jurisdiction and venue clauses
-- Conflict of laws provisions
-- Forum selection clauses
-- Arbitration seat designations
-- Court references
-- Legal proceeding locations
-- Applicable law statements
-
-Usage:
-    import re
-    jurisdiction_pattern = re.compile(jurisdiction_regex, re.VERBOSE | re.IGNORECASE)
-    matches = jurisdiction_pattern.findall(document_text)
-"""
-
-jurisdiction_regex = r"""
-Comprehensive regex pattern for identifying jurisdiction and governing law clauses in legal documents.
-
-This pattern captures:
-- Governing law clauses
-- Jurisdiction and venue clauses
-- Conflict of laws provisions
-- Forum selection clauses
-- Arbitration seat designations
-- Specific countries, states, provinces, and territories worldwide
-- Court references
-- Legal proceeding locations
-- Applicable law statements
-
-Last updated: 2025-05-05
-Author: sanket2992 (with assistance)
-"""
-
-jurisdiction_regex = r"""(?xi)\b(
-    # Governing law clauses
-    governed\s+by\s+the\s+laws?\s+of |
-    governing\s+law(?:\s+shall\s+be)?(?:\s+of)? |
-    shall\s+be\s+governed\s+by(?:\s+the\s+laws?\s+of)? |
-    construed\s+(?:and\s+enforced\s+)?(?:in\s+accordance\s+)?with\s+the\s+laws?\s+of |
-    interpreted\s+(?:in\s+accordance\s+)?(?:with|under)\s+the\s+laws?\s+of |
-    enforced\s+(?:in\s+accordance\s+)?with\s+the\s+laws?\s+of |
-    applicable\s+laws?\s+(?:shall\s+be\s+that|are\s+those)\s+of |
-    laws?\s+applicable\s+(?:to|in) |
-
-    # Subject‐to/jurisdiction clauses
-    subject\s+to\s+(?:the\s+)?jurisdiction\s+of |
-    (?:exclusive|non[-\s]?exclusive|sole)\s+jurisdiction\s+of |
-    (?:proper|applicable)\s+venue(?:\s+shall\s+be\s+in)? |
-    venue\s+shall\s+be\s+in |
-    jurisdiction\s+and\s+venue\s+(?:shall|will)\s+(?:be|lie|exist|vest)\s+(?:exclusively\s+)?in |
-    courts?\s+of\s+competent\s+jurisdiction\s+(?:in|of|located\s+in) |
-    competent\s+jurisdiction\s+(?:in|of|located\s+in) |
-
-    # Legal/forum clauses
-    (?:legal|judicial)\s+forum(?:\s+of)? |
-    forum\s+for\s+(?:any|all)\s+disputes? |
-    forum\s+(?:selection|clause) |
-    disputes?\s+(?:shall|will|may)\s+be\s+(?:resolved|determined|heard|litigated|adjudicated|decided|settled)\s+
-        (?:in\s+accordance\s+with\s+)?(?:the\s+)?laws?\s+of |
-    choice\s+of\s+law |
-    conflict\s+of\s+laws? |
-    without\s+(?:regard\s+to|giving\s+effect\s+to)\s+(?:its\s+)?conflict\s+of\s+laws?\s+(?:principles|provisions|rules) |
-    irrespective\s+of\s+conflict\s+of\s+laws |
-    excluding\s+(?:the\s+application\s+of\s+)?(?:any\s+)?conflict\s+of\s+laws?\s+(?:principles|provisions|rules) |
-
-    # Submission clauses
-    (?:submitted|subject)\s+to\s+(?:the\s+)?(?:courts?|jurisdiction|tribunals?)(?:\s+of)? |
-    submits?\s+(?:themselves|itself|himself|herself)\s+to\s+the\s+jurisdiction\s+of |
-    consents?\s+to\s+the\s+jurisdiction\s+of |
-    
-    # Legal proceedings clauses
-    (?:any|all)\s+(?:legal\s+)?proceedings?\s+(?:shall|must|will|may)\s+be\s+brought\s+(?:exclusively\s+)?in |
-    (?:any|all)\s+(?:actions?|suits?|claims?|proceedings?)\s+(?:arising|resulting)\s+
-        (?:out\s+of|from|under|in\s+connection\s+with)\s+this |
-    (?:any|all)\s+disputes?\s+(?:arising|resulting)\s+
-        (?:out\s+of|from|under|in\s+connection\s+with)\s+this |
-    (?:any|all)\s+(?:legal\s+)?(?:actions?|proceedings?)\s+to\s+enforce |
-    
-    # Seat/place of arbitration/jurisdiction
-    place\s+of\s+(?:arbitration|jurisdiction|performance) |
-    seat\s+of\s+(?:arbitration|jurisdiction) |
-    arbitration\s+(?:shall|will)\s+be\s+conducted\s+in |
-    arbitration\s+proceedings\s+shall\s+take\s+place\s+in |
-    arbitration\s+venue\s+shall\s+be |
-    
-    # Court types and specific references
-    (?:federal|state|district|circuit|supreme|high|appellate|superior|county|provincial|municipal)\s+courts?\s+
-        (?:sitting|located)\s+in |
-    courts?\s+of\s+the\s+(?:state|province|district|county|city|country|nation)\s+of |
-    
-    # Country-specific jurisdictional terms
-    (?:chancery|common\s+law|crown|administrative|commercial|civil|criminal|family|probate|labor|tax|bankruptcy)\s+
-        courts?\s+of |
-    
-    # "Courts of X" or "laws of X" with multi‐word or acronym regions
-    (?:courts?|laws?|tribunals?)\s+of\s+
-        (?:[A-Z][a-zA-Z\-'.]*(?:\s+(?:and|&|or)\s+[A-Z][a-zA-Z\-'.]*)*
-            (?:\s+(?:County|State|Province|Country|Nation|Republic|Kingdom|Government|Commonwealth|Federation|Union|Emirate|Territory))?|
-        (?:USA|US|U\.S\.|U\.S\.A\.|UK|U\.K\.|UAE|U\.A\.E\.|EU|E\.U\.|PRC|P\.R\.C\.|ROK|R\.O\.K\.|APAC|EMEA|LATAM))
-    |
-    
-    # Specific country and region references
-    # Major countries and regions
-    (?:in|of|under\s+the\s+laws?\s+of|subject\s+to\s+the\s+jurisdiction\s+of)\s+
-    (?:
-        # Countries (major ones and common legal jurisdictions)
-        Afghanistan|Albania|Algeria|Andorra|Angola|Antigua\s+and\s+Barbuda|Argentina|Armenia|Australia|Austria|
-        Azerbaijan|Bahamas|Bahrain|Bangladesh|Barbados|Belarus|Belgium|Belize|Benin|Bhutan|Bolivia|
-        Bosnia\s+and\s+Herzegovina|Botswana|Brazil|Brunei|Bulgaria|Burkina\s+Faso|Burundi|Cabo\s+Verde|Cambodia|
-        Cameroon|Canada|Central\s+African\s+Republic|Chad|Chile|China|Colombia|Comoros|Congo|Costa\s+Rica|
-        Croatia|Cuba|Cyprus|Czech\s+Republic|Denmark|Djibouti|Dominica|Dominican\s+Republic|
-        East\s+Timor|Ecuador|Egypt|El\s+Salvador|Equatorial\s+Guinea|Eritrea|Estonia|Eswatini|Ethiopia|
-        Fiji|Finland|France|Gabon|Gambia|Georgia|Germany|Ghana|Greece|Grenada|Guatemala|Guinea|Guinea-Bissau|
-        Guyana|Haiti|Honduras|Hungary|Iceland|India|Indonesia|Iran|Iraq|Ireland|Israel|Italy|
-        Jamaica|Japan|Jordan|Kazakhstan|Kenya|Kiribati|Korea|Kosovo|Kuwait|Kyrgyzstan|Laos|Latvia|
-        Lebanon|Lesotho|Liberia|Libya|Liechtenstein|Lithuania|Luxembourg|Madagascar|Malawi|Malaysia|
-        Maldives|Mali|Malta|Marshall\s+Islands|Mauritania|Mauritius|Mexico|Micronesia|Moldova|Monaco|
-        Mongolia|Montenegro|Morocco|Mozambique|Myanmar|Namibia|Nauru|Nepal|Netherlands|New\s+Zealand|
-        Nicaragua|Niger|Nigeria|North\s+Korea|North\s+Macedonia|Norway|Oman|Pakistan|Palau|Palestine|
-        Panama|Papua\s+New\s+Guinea|Paraguay|Peru|Philippines|Poland|Portugal|Qatar|Romania|Russia|
-        Rwanda|Saint\s+Kitts\s+and\s+Nevis|Saint\s+Lucia|Saint\s+Vincent\s+and\s+the\s+Grenadines|Samoa|
-        San\s+Marino|Sao\s+Tome\s+and\s+Principe|Saudi\s+Arabia|Senegal|Serbia|Seychelles|Sierra\s+Leone|
-        Singapore|Slovakia|Slovenia|Solomon\s+Islands|Somalia|South\s+Africa|South\s+Korea|South\s+Sudan|
-        Spain|Sri\s+Lanka|Sudan|Suriname|Sweden|Switzerland|Syria|Taiwan|Tajikistan|Tanzania|Thailand|
-        Togo|Tonga|Trinidad\s+and\s+Tobago|Tunisia|Turkey|Turkmenistan|Tuvalu|Uganda|Ukraine|
-        United\s+Arab\s+Emirates|United\s+Kingdom|United\s+States(?:\s+of\s+America)?|Uruguay|Uzbekistan|
-        Vanuatu|Vatican\s+City|Venezuela|Vietnam|Yemen|Zambia|Zimbabwe|
-        Hong\s+Kong|Macau|Puerto\s+Rico|Scotland|Northern\s+Ireland|Wales|England|
-        
-        # US States
-        Alabama|Alaska|Arizona|Arkansas|California|Colorado|Connecticut|Delaware|Florida|Georgia|
-        Hawaii|Idaho|Illinois|Indiana|Iowa|Kansas|Kentucky|Louisiana|Maine|Maryland|
-        Massachusetts|Michigan|Minnesota|Mississippi|Missouri|Montana|Nebraska|Nevada|
-        New\s+Hampshire|New\s+Jersey|New\s+Mexico|New\s+York|North\s+Carolina|North\s+Dakota|
-        Ohio|Oklahoma|Oregon|Pennsylvania|Rhode\s+Island|South\s+Carolina|South\s+Dakota|
-        Tennessee|Texas|Utah|Vermont|Virginia|Washington|West\s+Virginia|Wisconsin|Wyoming|
-        District\s+of\s+Columbia|D\.C\.|Washington\s+D\.C\.|
-        
-        # Canadian Provinces/Territories
-        Alberta|British\s+Columbia|Manitoba|New\s+Brunswick|Newfoundland\s+and\s+Labrador|
-        Northwest\s+Territories|Nova\s+Scotia|Nunavut|Ontario|Prince\s+Edward\s+Island|Quebec|
-        Saskatchewan|Yukon|
-        
-        # Australian States/Territories
-        New\s+South\s+Wales|Queensland|South\s+Australia|Tasmania|Victoria|Western\s+Australia|
-        Australian\s+Capital\s+Territory|Northern\s+Territory|
-        
-        # Indian States/Territories
-        Andhra\s+Pradesh|Arunachal\s+Pradesh|Assam|Bihar|Chhattisgarh|Goa|Gujarat|Haryana|
-        Himachal\s+Pradesh|Jharkhand|Karnataka|Kerala|Madhya\s+Pradesh|Maharashtra|Manipur|
-        Meghalaya|Mizoram|Nagaland|Odisha|Punjab|Rajasthan|Sikkim|Tamil\s+Nadu|Telangana|
-        Tripura|Uttar\s+Pradesh|Uttarakhand|West\s+Bengal|Andaman\s+and\s+Nicobar\s+Islands|
-        Chandigarh|Dadra\s+and\s+Nagar\s+Haveli\s+and\s+Daman\s+and\s+Diu|Delhi|Jammu\s+and\s+Kashmir|
-        Ladakh|Lakshadweep|Puducherry|
-        
-        # UK Countries/Regions
-        England|Scotland|Wales|Northern\s+Ireland|
-        
-        # Chinese Provinces/Regions
-        Anhui|Beijing|Chongqing|Fujian|Gansu|Guangdong|Guangxi|Guizhou|Hainan|Hebei|
-        Heilongjiang|Henan|Hubei|Hunan|Inner\s+Mongolia|Jiangsu|Jiangxi|Jilin|Liaoning|
-        Ningxia|Qinghai|Shaanxi|Shandong|Shanghai|Shanxi|Sichuan|Tianjin|Tibet|Xinjiang|
-        Yunnan|Zhejiang|
-        
-        # Brazilian States
-        Acre|Alagoas|Amapá|Amazonas|Bahia|Ceará|Espírito\s+Santo|Goiás|Maranhão|
-        Mato\s+Grosso|Mato\s+Grosso\s+do\s+Sul|Minas\s+Gerais|Pará|Paraíba|Paraná|
-        Pernambuco|Piauí|Rio\s+de\s+Janeiro|Rio\s+Grande\s+do\s+Norte|Rio\s+Grande\s+do\s+Sul|
-        Rondônia|Roraima|Santa\s+Catarina|São\s+Paulo|Sergipe|Tocantins|
-        
-        # Mexican States
-        Aguascalientes|Baja\s+California|Baja\s+California\s+Sur|Campeche|Chiapas|
-        Chihuahua|Coahuila|Colima|Durango|Guanajuato|Guerrero|Hidalgo|Jalisco|
-        México|Mexico\s+City|Michoacán|Morelos|Nayarit|Nuevo\s+León|Oaxaca|Puebla|
-        Querétaro|Quintana\s+Roo|San\s+Luis\s+Potosí|Sinaloa|Sonora|Tabasco|
-        Tamaulipas|Tlaxcala|Veracruz|Yucatán|Zacatecas|
-        
-        # German States
-        Baden-Württemberg|Bavaria|Berlin|Brandenburg|Bremen|Hamburg|Hesse|
-        Lower\s+Saxony|Mecklenburg-Vorpommern|North\s+Rhine-Westphalia|Rhineland-Palatinate|
-        Saarland|Saxony|Saxony-Anhalt|Schleswig-Holstein|Thuringia|
-        
-        # Russian Regions (Federal Subjects)
-        Moscow|Saint\s+Petersburg|Adygea|Altai|Bashkortostan|Buryatia|Chechnya|
-        Chuvashia|Dagestan|Ingushetia|Kabardino-Balkaria|Kalmykia|Karachay-Cherkessia|
-        Karelia|Khakassia|Komi|Mari\s+El|Mordovia|North\s+Ossetia-Alania|Tatarstan|
-        Tuva|Udmurtia|Sakha|Yakutia
-    )
-)\b"""
-
-contract_value_regex = r"""
-(  # Removed the enclosing \b(...)\b
-    # Symbol-Based Currency Amounts
-    (?:[\$\€\£\¥\₹]|AED|USD|INR|GBP|EUR|CNY|RMB|JPY|SAR)\s?
-    (?:
-        \d{1,3}(?:,\d{3})*(?:\.\d+)? |
-        \d+(?:\.\d+)?\s*(?:million|billion|crore|lakh|thousand)?
-    )
-|
-    # Name-Based Currency Amounts
-    (?:
-        (?:(?:[Oo]ne|[Tt]wo|[Tt]hree|[Ff]our|[Ff]ive|[Ss]ix|[Ss]even|[Ee]ight|[Nn]ine|[Tt]en|
-        [Ee]leven|[Tt]welve|[Tt]hirteen|[Ff]ourteen|[Ff]ifteen|[Ss]ixteen|[Ss]eventeen|
-        [Ee]ighteen|[Nn]ineteen|[Tt]wenty|[Tt]hirty|[Ff]orty|[Ff]ifty|[Ss]ixty|[Ss]eventy|
-        [Ee]ighty|[Nn]inety|[Oo]ne\s+hundred|[Oo]ne\s+thousand|
-        [Oo]ne\s+million|[Oo]ne\s+billion|[Oo]ne\s+crore|[Oo]ne\s+lakh)(\s+and\s+)?)*
-        (?:[Mm]illion|[Bb]illion|[Tt]housand|[Cc]rore|[Ll]akh)?
-    )
-    \s+
-    (?:dollars?|pounds?|euros?|rupees?|dirhams?|yuan|yen)
-)
-"""
-
 metadata_hybrid_queries = [
     {"Effective Date": {
     "What is the effective date of the contract?": """Instructions:
@@ -840,10 +395,87 @@ METADATA_EXTRACTION_PROMPTS = [
 
 
 
+RECURRING_PAYMENT_INSTRUCTIONS = """Instructions:
+                    Two parts, part A and part B:
+                    Part A:
+                        Determine if the contract supports recurring payments based on the given text.
+
+                        Criteria:
+                        1. Identify if the contract mentions payments on a recurring basis using keywords such as 'monthly', 'quarterly', 'annually' or phrases like:
+                        - 'Payments due on the [specific date] of each month.'
+                        - 'Quarterly payments due on [specific months].'
+                        - 'Annual payment due on [specific date] every year.'
+                        
+                        2. Extract the contract expiry date.
+                        3. Extract the payment due dates.
+                        4. If the payment due dates extend beyond the contract expiry date, return 'false'.
+                        5. If the contract explicitly states recurring payments and they fall within the contract period, return 'true'.
+                        6. If no recurring payment terms are found, return 'false'.
+
+                        Return only a single word: 'true' or 'false'.
+
+                    Part B:    
+                        Given the following relevant contract information, determine the next immediate payment due date based on the present date given as Current Date below.
+
+                        Consider the following scenarios:
+                        1. **Fixed Payment Due Date:** If the contract specifies a one-time or fixed payment due date, return that date if it is in the future or have passed.
+                        2. **Recurring Payment Due Dates:** If the contract specifies recurring payments (e.g., monthly, quarterly, annually), identify the next immediate due date considering the present date. The recurrence pattern can be in formats such as:
+                        - "Payments due on the 15th of each month"
+                        - "Quarterly payments due on the first of January, April, July, and October"
+                        - "Annual payment due on June 30 every year"
+
+                        **Instructions:**  
+                        - If no payment due date is found or it's unclear, return `'null'` as a string.
+                        - The output should be a JSON-style object with the following structure:
+                        {"Payment Due Date": "YYYY-MM-DD"}
+
+                    OUTPUT:
+                    {
+                    "flag": true/false,
+                    "Payment Due Date": "YYYY-MM-DD"
+                    }
+                    ###If Expiry Date < 'Payment Due Date', then return 'flag' = false and 'Payment Due Date' = 'null' 
+                    ###If Expiry Date < Current Date, then return "flag" = false and "Payment Due Date" = "null"
+                    Now, analyze the following contract text and return the next immediate payment due date in the required format.
+                    Current Date and Expiry Date for this contract:
+"""
+
 DOCUMENT_SUMMARY_AND_CHUNK_INDEX = config.DOCUMENT_SUMMARY_AND_CHUNK_INDEX
 PINECONE_API_KEY = config.PINECONE_API_KEY
 MODULE_NAME = "meta_data_extractor.py"
-
+TOP_K = 10
+# The date/jurisdiction/contract value calls sample at temperature 0.5, caching them is opt-in
+CACHE_SAMPLED_LLM_CALLS = getattr(config, "LLM_CACHE_SAMPLED_CALLS", False)
+# Answer METADATA_EXTRACTION_PROMPTS and the hybrid fallbacks with one packed LLM call
+METADATA_PACKED_EXTRACTION = getattr(config, "METADATA_PACKED_EXTRACTION", True)
+# The regex-filtered LLM calls, in the order of _extract_regex_contexts
+REGEX_STAGES = ("dates", "jurisdiction", "cv")
+# The Pinecone query text of every question the extractor retrieves context for
+RETRIEVAL_QUERIES = [list(question.keys())[0] for question in metadata_hybrid_queries + METADATA_EXTRACTION_PROMPTS] + [PAYMENT_DUE_DATE_QUESTION]
+# Cached question embeddings are passed to the hybrid retriever only when it takes one
+PASS_QUERY_VECTOR = accepts_query_vector(get_context_from_pinecone)
+# Files extract_meta_data_batch extracts at once, and prepares ahead of them
+METADATA_BATCH_FILES_IN_FLIGHT = getattr(config, "METADATA_BATCH_FILES_IN_FLIGHT", 8)
+# Extracted files whose vector upserts are flushed together
+METADATA_BATCH_VECTOR_GROUP = getattr(config, "METADATA_BATCH_VECTOR_GROUP", 16)
+# Vector upserts of a flushed group running at once
+METADATA_BATCH_VECTOR_WRITERS = getattr(config, "METADATA_BATCH_VECTOR_WRITERS", 4)
+
+
+def submit_with_context(executor, fn, *args, **kwargs):
+    """
+    Submits fn to the executor under the caller's OpenTelemetry context, so spans opened
+    in the worker thread keep their parent.
+    """
+    # Capture the current OpenTelemetry context (which includes the parent span)
+    parent_ctx = ot_context.get_current()
+    def wrapped():
+        token = ot_context.attach(parent_ctx)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            ot_context.detach(token)
+    return executor.submit(wrapped)
 
 
 class MetaDataExtractor:
@@ -853,7 +485,14 @@ class MetaDataExtractor:
         self.metadata_vector_handler = ContractMetadataVectorUpserter(logger)
         self.in_queue = False
 
-
+    def warm_query_embeddings(self) -> int:
+        """
+        Embeds the retrieval questions missing from the query embedding cache. Called once
+        at worker startup; questions it could not embed are embedded per call by the retriever.
+        """
+        if not PASS_QUERY_VECTOR:
+            return 0
+        return warm_query_embedding_cache(RETRIEVAL_QUERIES, self.logger)
 
     def _log_message(self, message: str, function_name: str) -> str:
         """
@@ -865,507 +504,1223 @@ class MetaDataExtractor:
         """
         Cleans markdown/special characters and splits text into sentences.
         """
-        # Remove markdown characters and special characters
-        text = re.sub(r'!\[.*?\]\(.*?\)', '', text)  # Remove markdown images
-        text = re.sub(r'\[.*?\]\(.*?\)', '', text)   # Remove markdown links
-        text = re.sub(r'[*_~`#+\-=|>\[\](){}!\\/<>]', '', text)  # Strip other markdown symbols
-        text = re.sub(r'\s+', ' ', text).strip()  # Collapse multiple spaces
-
-        # Split on . followed by optional markdown or spacing chars
-        sentences = re.split(r'\.(?:\s|\||\*|,)*', text)
-        
-        # Remove any empty strings from result
-        return [s.strip() for s in sentences if s.strip()]
-    
-    
+        return split_sentences(text)
+
     def extract_regex_chunks_with_words(self, chunks, regex_pattern):
         """
-        Extract 1 sentence before, the sentence with the RE match, and 1 sentence after.
-        Ensure the max length of sentences before and after is 25 words.
-        Avoid overlap and repetitions of words and sentences.
-        """
-        combined_text = []
-        seen_sentences = set()  # Track sentences to avoid repetition
-        chunks = "\n".join([chunk for chunk in chunks])
-        sentences = self.clean_and_split_sentences(chunks)
-        self.logger.info(self._log_message(f"Length of sentences:{len(sentences)} ", "extract_regex_chunks_with_words"))
-
-        i = 0
-        if regex_pattern == "date_pattern":
-            regex_pattern = date_pattern
-            while i < len(sentences):
-                if re.search(regex_pattern, sentences[i], re.VERBOSE):
-                    print(f"Matched Sentence {i}: {sentences[i]}\n\n")
-                    # Extract 1 sentence before, the matched sentence, and 1 sentence after
-                    start = max(0, i - 2)
-                    end = min(len(sentences), i + 3)  # Include the matched sentence and 1 after
-                    selected_sentences = sentences[start:end]
-
-                    # Limit the length of sentences before and after to 25 words
-                    trimmed_sentences = []
-                    for j, sent in enumerate(selected_sentences):
-                        if sent not in seen_sentences:  # Avoid duplicate sentences
-                            words = word_tokenize(sent)
-                            if j == 0 and i > 0:  # Sentence before
-                                trimmed_sentences.append(" ".join(words[-45:]))
-                            elif j == len(selected_sentences) - 1 and i + 1 < len(sentences):  # Sentence after
-                                trimmed_sentences.append(" ".join(words[:45]))
-                            else:  # Matched sentence
-                                trimmed_sentences.append(sent)
-                            seen_sentences.add(sent)  # Mark sentence as seen
-
-                    combined_text.extend(trimmed_sentences)
-                    i = end  # Skip to the sentence after the extracted range to avoid overlap
-                else:
-                    i += 1
-
-            # Combine all matched text into a single chunk
-            if combined_text:
-                filtered = [{"chunk_number": "combined", "text": " ".join(combined_text)}]
-                self.logger.info(self._log_message(f"Filtered on line 498: {filtered}", "extract_regex_chunks_with_words"))
-                return filtered[0]['text']
+        Extract the sentences matching one regex filter ("date_pattern", "jurisdiction_regex"
+        or "contract_value_regex") with the sentences around them, trimmed to the filter's word limit.
+        Avoid overlap and repetitions of words and sentences. ``chunks`` may be a DocumentIndex.
+        """
+        return scan_document(chunks, [regex_pattern], self.logger).windows[regex_pattern]
+
+    def _retrieval_filter(self, query, file_id):
+        """
+        Returns the Pinecone metadata filter used to retrieve context for a question.
+        """
+        if query == "What is the title of the contract?":
+            return {"file_id": {"$eq": file_id}, "page_no": {"$eq": 1}}
+        elif query == "What are the parties involved?":
+            return {"file_id": {"$eq": file_id}, "page_no": {"$eq": 1}}
+        return {"file_id": {"$eq": file_id}}
+
+    def _query_pinecone(self, query, custom_filter, file_id, user_id, org_id):
+        """
+        Runs the hybrid retrieval of a question over the chunk index. A cached embedding of
+        the question is passed along as its dense vector, else get_context_from_pinecone
+        embeds the question.
+        """
+        query_embeddings = get_query_embedding_cache() if PASS_QUERY_VECTOR else None
+        embedding = query_embeddings.embedding(query) if query_embeddings is not None else None
+        vector = {QUERY_VECTOR_ARGUMENT: embedding} if embedding is not None else {}
+        return get_context_from_pinecone(DOCUMENT_SUMMARY_AND_CHUNK_INDEX, PINECONE_API_KEY, custom_filter, TOP_K, query, file_id, user_id, org_id, self.logger, **vector)
+
+    def _retrieve_context(self, query, file_id, user_id, org_id):
+        """
+        Returns the text of the chunks retrieved for a question: BM25 over the file's
+        chunks in memory when the file has a local retriever, else a Pinecone query.
+        Page-filtered questions and questions no chunk shares a term with go to Pinecone.
+        """
+        custom_filter = self._retrieval_filter(query, file_id)
+        retriever = local_retrievers.get(file_id)
+        if retriever is not None and "page_no" not in custom_filter:
+            context = retriever.retrieve(query, TOP_K)
+            if context:
+                metrics.increment("local_retriever.hits")
+                return context
+            metrics.increment("local_retriever.misses")
+        context_chunks = self._query_pinecone(query, custom_filter, file_id, user_id, org_id)
+        return [match['metadata']['text'] for match in context_chunks.get('matches', [])]
+
+    def _log_retrieved_context(self, query, context, retrieve_duration, file_id, file_name, file_type, user_id, org_id, retry_count):
+        """
+        Logs the query and the context retrieved for it.
+        """
+        log_entry = {
+            "file_id": file_id,
+            "file_name": file_name,
+            "file_type": file_type,
+            "user_id": user_id,
+            "org_id": org_id,
+            "retry_count": retry_count,
+            "query": query,
+            "retrieved_context": context,
+            "retrieval_time": round(retrieve_duration, 2)
+        }
+        self.logger.info(self._log_message(f"METADATA QUERY AND CONTEXTS RETRIEVED: {orjson.dumps(log_entry).decode()}", "extract_meta_data_parallely"))
+        self.logger.debug(self._log_message(f"Context Chunks Retrieved: {len(context)}", "extract_meta_data_parallely"))
+
+    def _retrieve_question_context(self, question, file_id, file_name, file_type, user_id, org_id, retry_count):
+        """
+        Retrieves the context for a metadata question. Returns [] when nothing matched.
+        """
+        query = list(question.keys())[0]
+        retrieve_start = time.perf_counter()
+
+        context = self._retrieve_context(query, file_id, user_id, org_id)
+        retrieve_duration = time.perf_counter() - retrieve_start
+        if not context:
             return []
-        if regex_pattern == "jurisdiction_regex":
-            regex_pattern = jurisdiction_regex
-            while i < len(sentences):
-                if re.search(regex_pattern, sentences[i], re.VERBOSE):
-                    print(f"Matched Sentence {i}: {sentences[i]}\n\n")
-                    # Extract 1 sentence before, the matched sentence, and 1 sentence after
-                    start = max(0, i - 1)
-                    end = min(len(sentences), i + 2)  # Include the matched sentence and 1 after
-                    selected_sentences = sentences[start:end]
-
-                    # Limit the length of sentences before and after to 25 words
-                    trimmed_sentences = []
-                    for j, sent in enumerate(selected_sentences):
-                        if sent not in seen_sentences:  # Avoid duplicate sentences
-                            words = word_tokenize(sent)
-                            if j == 0 and i > 0:  # Sentence before
-                                trimmed_sentences.append(" ".join(words[-30:]))
-                            elif j == len(selected_sentences) - 1 and i + 1 < len(sentences):  # Sentence after
-                                trimmed_sentences.append(" ".join(words[:30]))
-                            else:  # Matched sentence
-                                trimmed_sentences.append(sent)
-                            seen_sentences.add(sent)  # Mark sentence as seen
-
-                    combined_text.extend(trimmed_sentences)
-                    i = end  # Skip to the sentence after the extracted range to avoid overlap
-                else:
-                    i += 1
-
-            # Combine all matched text into a single chunk
-            if combined_text:
-                filtered = [{"chunk_number": "combined", "text": " ".join(combined_text)}]
-                self.logger.info(self._log_message(f"Filtered on line 530: {filtered}", "extract_regex_chunks_with_words"))
-                return filtered[0]['text']
+
+        self._log_retrieved_context(query, context, retrieve_duration, file_id, file_name, file_type, user_id, org_id, retry_count)
+        support_ledger.record(file_id, question_field(question), context)
+        return context
+
+    async def _async_retrieve_question_context(self, question, file_id, file_name, file_type, user_id, org_id, retry_count):
+        """
+        Async variant of _retrieve_question_context. The blocking lookup runs in the default executor.
+        """
+        query = list(question.keys())[0]
+        retrieve_start = time.perf_counter()
+
+        context = await asyncio.to_thread(self._retrieve_context, query, file_id, user_id, org_id)
+        retrieve_duration = time.perf_counter() - retrieve_start
+        if not context:
             return []
-        
-        if regex_pattern == "contract_value_regex":
-            regex_pattern = contract_value_regex
-            while i < len(sentences):
-                if re.search(regex_pattern, sentences[i], re.VERBOSE | re.IGNORECASE):
-                    print(f"Matched Sentence {i}: {sentences[i]}\n\n")
-                    # Extract 1 sentence before, the matched sentence, and 1 sentence after
-                    start = max(0, i - 2)
-                    end = min(len(sentences), i + 2)  # Include the matched sentence and 1 after
-                    selected_sentences = sentences[start:end]
-
-                    # Limit the length of sentences before and after to 25 words
-                    trimmed_sentences = []
-                    for j, sent in enumerate(selected_sentences):
-                        if sent not in seen_sentences:  # Avoid duplicate sentences
-                            words = word_tokenize(sent)
-                            if j == 0 and i > 0:  # Sentence before
-                                trimmed_sentences.append(" ".join(words[-50:]))
-                            elif j == len(selected_sentences) - 1 and i + 1 < len(sentences):  # Sentence after
-                                trimmed_sentences.append(" ".join(words[:50]))
-                            else:  # Matched sentence
-                                trimmed_sentences.append(sent)
-                            seen_sentences.add(sent)  # Mark sentence as seen
-
-                    combined_text.extend(trimmed_sentences)
-                    i = end  # Skip to the sentence after the extracted range to avoid overlap
-                else:
-                    i += 1
-
-            # Combine all matched text into a single chunk
-            if combined_text:
-                filtered = [{"chunk_number": "combined", "text": " ".join(combined_text)}]
-                self.logger.info(self._log_message(f"Filtered on line 563: {filtered}", "extract_regex_chunks_with_words"))
-                return filtered[0]['text']
+
+        self._log_retrieved_context(query, context, retrieve_duration, file_id, file_name, file_type, user_id, org_id, retry_count)
+        support_ledger.record(file_id, question_field(question), context)
+        return context
+
+    @mlflow.trace(name="Metadata Extractor - Process Question")
+    def _process_question(self, question, file_id, file_name, file_type, user_id, org_id, retry_count, model_name=None):
+        """
+        Retrieves context for a metadata question from Pinecone and answers it with the LLM.
+        ``model_name`` overrides the routed model of the question's field.
+        """
+        try:
+            context = self._retrieve_question_context(question, file_id, file_name, file_type, user_id, org_id, retry_count)
+            if not context:
+                return []
+
+            return call_llm(question, context, file_id, user_id, org_id, self.logger, model_name=model_name)
+        except Exception as e:
+            self.logger.error(self._log_message(f"Error processing question: {e}", "extract_meta_data_parallely"))
             return []
 
-    @mlflow.trace(name="Metadata Extractor - Extract Meta Data Parallely")
-    def extract_meta_data_parallely(self, file_id, file_name, file_type, user_id, org_id, retry_count, chunks):
-        overall_start = time.perf_counter()
-        process = psutil.Process()
+    @mlflow.trace(name="Metadata Extractor - Process Question (Async)")
+    async def _async_process_question(self, question, file_id, file_name, file_type, user_id, org_id, retry_count, model_name=None):
+        """
+        Async variant of _process_question.
+        """
         try:
-            self.logger.info(self._log_message("Starting metadata extraction.", "extract_meta_data_parallely"))
-            start_datetime = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            current_date = datetime.now().strftime("%Y-%m-%d")
-            
-            status_start = time.perf_counter()
-            
+            context = await self._async_retrieve_question_context(question, file_id, file_name, file_type, user_id, org_id, retry_count)
+            if not context:
+                return []
 
-            set_llm_file_status(file_id, user_id, org_id, 3, True, retry_count, 1, "", start_datetime, "", False, False, self.in_queue, 25, self.logger)
-            status_duration = time.perf_counter() - status_start
-            
-            custom_filter = {"file_id": {"$eq": file_id}}
-            top_k = 10
-            results = []
-            
-            def submit_with_context(executor, fn, *args, **kwargs):
-                # Capture the current OpenTelemetry context (which includes the parent span)
-                parent_ctx = ot_context.get_current()
-                def wrapped():
-                    token = ot_context.attach(parent_ctx)
-                    try:
-                        return fn(*args, **kwargs)
-                    finally:
-                        ot_context.detach(token)
-                return executor.submit(wrapped)
-            
-            
-            @mlflow.trace(name="Metadata Extractor - Process Question")
-            def process_question(question):
-                try:
-                    query = list(question.keys())[0]
-                    retrieve_start = time.perf_counter()
-                    
-                    if query == "What is the title of the contract?":
-                        custom_filter = {"file_id": {"$eq": file_id}, "page_no": {"$eq": 1}}
-                    elif query == "What are the parties involved?":
-                        custom_filter = {"file_id": {"$eq": file_id}, "page_no": {"$eq": 1}}
-                    else:
-                        custom_filter = {"file_id": {"$eq": file_id}}
-
-                    context_chunks = get_context_from_pinecone(DOCUMENT_SUMMARY_AND_CHUNK_INDEX, PINECONE_API_KEY, custom_filter, top_k, query, file_id, user_id, org_id, self.logger)
-                    retrieve_duration = time.perf_counter() - retrieve_start
-                    
-                    matches = context_chunks.get('matches', [])
-                    if not matches:
-                        return []
-                    
-                    context = [match['metadata']['text'] for match in matches]
-                    # context = "/n here is more context:"+ first_page_context_chunks
-                    # Log the query and the retrieved context
-                    log_entry = {
-                        "file_id": file_id,
-                        "file_name": file_name,
-                        "file_type": file_type,
-                        "user_id": user_id,
-                        "org_id": org_id,
-                        "retry_count": retry_count,
-                        "query": query,
-                        "retrieved_context": context,
-                        "retrieval_time": round(retrieve_duration, 2)
-                    }
-                    self.logger.info(self._log_message(f"METADATA QUERY AND CONTEXTS RETRIEVED: {orjson.dumps(log_entry).decode()}", "extract_meta_data_parallely"))
-                    self.logger.debug(self._log_message(f"Context Chunks Retrieved: {len(context)}", "extract_meta_data_parallely"))
-                    
-                    process_start = time.perf_counter()
-                    response = call_llm(question, context, file_id, user_id, org_id, self.logger)
-                    process_duration = time.perf_counter() - process_start
-                    
-                    return response
-                except Exception as e:
-                    self.logger.error(self._log_message(f"Error processing question: {e}", "extract_meta_data_parallely"))
-                    return []
-            
-            self.logger.info(self._log_message(f"Calling extract_regex_chunks_with_words", "extract_meta_data_parallely"))
-            retrieved_chunks = self.extract_regex_chunks_with_words(chunks, "date_pattern")
-            self.logger.info(self._log_message(f"Retrieved Chunks: {retrieved_chunks}", "extract_meta_data_parallely"))
-            retrieved_chunks_jurisdiction = self.extract_regex_chunks_with_words(chunks, "jurisdiction_regex")
-            self.logger.info(self._log_message(f"Retrieved Chunks Jurisdiction: {retrieved_chunks_jurisdiction}", "extract_meta_data_parallely"))
-            retrieved_chunks_cv = self.extract_regex_chunks_with_words(chunks, "contract_value_regex")
-            self.logger.info(self._log_message(f"Retrieved Chunks Contract Value: {retrieved_chunks_cv}", "extract_meta_data_parallely"))
-            # Step 1: Extract dates using LLM
-            date_extraction = llm_call_for_dates(retrieved_chunks, date_extraction_instructions, file_id, user_id, org_id, self.logger)
-            jurisdiction_extraction = llm_call_for_jurisdiction(retrieved_chunks_jurisdiction, jurisdiction_instruction, file_id, user_id, org_id, self.logger)
-            contract_value_extraction = llm_call_for_cv(retrieved_chunks_cv, contract_value_instructions, file_id, user_id, org_id, self.logger)
-
-
-            # Step 2: Get keys with null or None values
-            null_date_keys = [key for key, value in date_extraction.items() if value in ("null", None)]
-            if jurisdiction_extraction.get("Jurisdiction") == "null" or jurisdiction_extraction.get("Jurisdiction") is None:
-                null_date_keys.append("Jurisdiction")
-            if contract_value_extraction.get("Contract Value") == "null" or contract_value_extraction.get("Contract Value") is None:
-                null_date_keys.append("Contract Value")
-
-            # Step 3: Collect relevant questions from metadata
-            null_date_keys_questions = [
-                data
-                for date_key in null_date_keys
-                for data in metadata_hybrid_queries
-                if date_key in data
-            ]
+            return await async_call_llm(question, context, file_id, user_id, org_id, self.logger, model_name=model_name)
+        except Exception as e:
+            self.logger.error(self._log_message(f"Error processing question: {e}", "extract_meta_data"))
+            return []
 
-            # Optional debug print (replace with logger if needed)
-            for q in null_date_keys_questions:
-                for k, v in q.items():
-                    print(f"Question.key: {k}")
-                    print(f"Question.value: {v}")
-
-            # Step 4: Process questions in parallel
-            hybrid_dates = []
-            with ThreadPoolExecutor() as executor:
-                futures = {submit_with_context(executor, process_question, q): q for q in null_date_keys_questions}
-                for future in as_completed(futures):
-                    try:
-                        hybrid_dates.append(future.result())
-                    except Exception as e:
-                        self.logger.error(self._log_message(f"Error collecting results: {e}", "extract_meta_data_parallely"))
-
-            # Step 5: Merge new date values into the original result
-            for result in hybrid_dates:
-                for key, value in result.items():
-                    if key in date_extraction:
-                        date_extraction[key] = value
-                    elif key == "Jurisdiction":
-                        jurisdiction_extraction["Jurisdiction"] = value
-                    elif key == "Contract Value":   
-                        contract_value_extraction["Contract Value"] = value
-        
-            self.logger.info(self._log_message(f"Final Date Extraction Result: {date_extraction}", "extract_meta_data_parallely"))
-            extraction_start = time.perf_counter()
+    def _extract_regex_contexts(self, index):
+        """
+        Runs the date, jurisdiction and contract value regex filters over the document index, segmented once.
+        """
+        self.logger.info(self._log_message("Calling scan_document", "extract_meta_data_parallely"))
+        windows = scan_document(index, logger=self.logger).windows
+        retrieved_chunks = windows["date_pattern"]
+        self.logger.info(self._log_message(f"Retrieved Chunks: {retrieved_chunks}", "extract_meta_data_parallely"))
+        retrieved_chunks_jurisdiction = windows["jurisdiction_regex"]
+        self.logger.info(self._log_message(f"Retrieved Chunks Jurisdiction: {retrieved_chunks_jurisdiction}", "extract_meta_data_parallely"))
+        retrieved_chunks_cv = windows["contract_value_regex"]
+        self.logger.info(self._log_message(f"Retrieved Chunks Contract Value: {retrieved_chunks_cv}", "extract_meta_data_parallely"))
+        return retrieved_chunks, retrieved_chunks_jurisdiction, retrieved_chunks_cv
+
+    def _null_metadata_questions(self, date_extraction, jurisdiction_extraction, contract_value_extraction):
+        """
+        Returns the hybrid queries for every field the regex-filtered LLM calls left empty.
+        """
+        # Get keys with null or None values
+        null_date_keys = [key for key, value in date_extraction.items() if value in ("null", None)]
+        if jurisdiction_extraction.get("Jurisdiction") == "null" or jurisdiction_extraction.get("Jurisdiction") is None:
+            null_date_keys.append("Jurisdiction")
+        if contract_value_extraction.get("Contract Value") == "null" or contract_value_extraction.get("Contract Value") is None:
+            null_date_keys.append("Contract Value")
+
+        # Collect relevant questions from metadata
+        null_date_keys_questions = [
+            data
+            for date_key in null_date_keys
+            for data in metadata_hybrid_queries
+            if date_key in data
+        ]
+
+        for q in null_date_keys_questions:
+            for k, v in q.items():
+                self.logger.debug(self._log_message(f"Question.key: {k} | Question.value: {v}", "extract_meta_data_parallely"))
+
+        return null_date_keys_questions
+
+    def _merge_hybrid_results(self, hybrid_dates, date_extraction, jurisdiction_extraction, contract_value_extraction):
+        """
+        Merges values answered by the hybrid queries into the regex-filtered results.
+        """
+        for result in hybrid_dates:
+            for key, value in result.items():
+                if key in date_extraction:
+                    date_extraction[key] = value
+                elif key == "Jurisdiction":
+                    jurisdiction_extraction["Jurisdiction"] = value
+                elif key == "Contract Value":
+                    contract_value_extraction["Contract Value"] = value
+
+    def _process_questions(self, questions, file_args, model_name=None):
+        """
+        Answers each question with its own retrieval and LLM call, in parallel.
+        """
+        answers = []
+        org_id = file_args[4]
+        futures = {fair_executor.submit(org_id, self._process_question, question, *file_args, model_name=model_name): question for question in questions}
+        for future in as_completed(futures):
+            try:
+                answers.append(future.result())
+            except Exception as e:
+                self.logger.error(self._log_message(f"Error collecting results: {e}", "extract_meta_data_parallely"))
+        return answers
 
-            with ThreadPoolExecutor() as executor:
-                # future_to_question = {executor.submit(process_question, question): question for question in METADATA_EXTRACTION_PROMPTS}
-                
-                future_to_question = {submit_with_context(executor, process_question, question): question for question in METADATA_EXTRACTION_PROMPTS}
+    def _merge_question_contexts(self, contexts):
+        """
+        Merges the contexts retrieved for several questions into one deduplicated list.
+        Chunks are interleaved by rank, so every question's best matches come first.
+        """
+        merged = []
+        seen = set()
+        for rank in range(max((len(context) for context in contexts), default=0)):
+            for context in contexts:
+                if rank < len(context) and context[rank] not in seen:
+                    seen.add(context[rank])
+                    merged.append(context[rank])
+        return merged
+
+    def _split_packed_answers(self, questions, answers):
+        """
+        Splits a packed answer into single-field results. Returns (results, questions to
+        re-ask), the latter holding every field that is missing or fails validation.
+        """
+        results = []
+        fallback_questions = []
+        for question in questions:
+            field = question_field(question)
+            if field in answers and is_valid_field_value(field, answers[field]):
+                results.append({field: answers[field]})
+            else:
+                fallback_questions.append(question)
 
-                for future in as_completed(future_to_question):
-                    try:
-                        results.append(future.result())
-                    except Exception as e:
-                        self.logger.error(self._log_message(f"Error collecting results: {e}", "extract_meta_data_parallely"))
-            
-            extraction_duration = time.perf_counter() - extraction_start
-            
-            self.logger.info(self._log_message(f"Metadata extraction results: {results}", "extract_meta_data_parallely"))
-            
-            expiry_date = None
-            results.append(date_extraction)
-            results.append(jurisdiction_extraction)
-            results.append(contract_value_extraction)
-            for result in results:
-                if not result:
-                    continue
-                self.logger.info(self._log_message(f"Processing Result: {result} | Type - {type(result)}", "extract_meta_data_parallely"))
-                if isinstance(result, dict):
-                    for key, value in result.items():
-                        if key == "Expiration Date":
-                            expiry_date = value
-                            print(f"Expiration date: {expiry_date}")
-                            break
-            
-            
-            
+        metrics.increment("metadata_packed.fields", len(results))
+        metrics.increment("metadata_packed.fallback_fields", len(fallback_questions))
+        if fallback_questions:
+            self.logger.warning(self._log_message(f"Packed extraction fell back for fields: {[question_field(q) for q in fallback_questions]}", "answer_questions_packed"))
+        return results, fallback_questions
 
+    def _escalated_questions(self, questions, answers):
+        """
+        Returns the first-tier questions whose packed answer was not accepted.
+        """
+        return [
+            question for question in questions
+            if route_model(question_field(question)) != ESCALATION_MODEL and question_field(question) not in answers
+        ]
+
+    @mlflow.trace(name="Metadata Extractor - Answer Questions Packed")
+    def _answer_questions_packed(self, questions, file_id, file_name, file_type, user_id, org_id, retry_count):
+        """
+        Answers several metadata questions with one LLM call over the union of their
+        retrieved context. Invalid fields fall back to per-field calls.
+        """
+        file_args = (file_id, file_name, file_type, user_id, org_id, retry_count)
+        contexts = []
+        futures = [fair_executor.submit(org_id, self._retrieve_question_context, question, *file_args) for question in questions]
+        for future in futures:
             try:
-                prompt_for_recurring_payment_due_date = {"What is the payment due date?": f"""Instructions:
-                    Two parts, part A and part B:
-                    Part A:
-                        Determine if the contract supports recurring payments based on the given text.
+                contexts.append(future.result())
+            except Exception as e:
+                self.logger.error(self._log_message(f"Error retrieving context: {e}", "answer_questions_packed"))
+                contexts.append([])
 
-                        Criteria:
-                        1. Identify if the contract mentions payments on a recurring basis using keywords such as 'monthly', 'quarterly', 'annually' or phrases like:
-                        - 'Payments due on the [specific date] of each month.'
-                        - 'Quarterly payments due on [specific months].'
-                        - 'Annual payment due on [specific date] every year.'
-                        
-                        2. Extract the contract expiry date.
-                        3. Extract the payment due dates.
-                        4. If the payment due dates extend beyond the contract expiry date, return 'false'.
-                        5. If the contract explicitly states recurring payments and they fall within the contract period, return 'true'.
-                        6. If no recurring payment terms are found, return 'false'.
+        # Questions without any context have nothing to answer from
+        questions = [question for question, context in zip(questions, contexts) if context]
+        if not questions:
+            return []
 
-                        Return only a single word: 'true' or 'false'.
+        # One packed call per routed model, then the first-tier fields left unanswered
+        # are escalated together
+        context = self._merge_question_contexts(contexts)
+        answers = {}
+        futures = [
+            fair_executor.submit(org_id, call_llm_for_fields, tier_questions, context, file_id, user_id, org_id, self.logger, model_name=model_name)
+            for model_name, tier_questions in route_questions(questions).items()
+        ]
+        for future in futures:
+            try:
+                answers.update(future.result() or {})
+            except Exception as e:
+                self.logger.error(self._log_message(f"Error collecting packed answers: {e}", "answer_questions_packed"))
+        escalated_questions = self._escalated_questions(questions, answers)
+        if escalated_questions:
+            answers.update(fair_executor.submit(org_id, call_llm_for_fields, escalated_questions, context, file_id, user_id, org_id, self.logger).result() or {})
 
-                    Part B:    
-                        Given the following relevant contract information, determine the next immediate payment due date based on the present date that is: {current_date}.
+        results, fallback_questions = self._split_packed_answers(questions, answers)
+        return results + self._process_questions(fallback_questions, file_args, model_name=ESCALATION_MODEL)
 
-                        Consider the following scenarios:
-                        1. **Fixed Payment Due Date:** If the contract specifies a one-time or fixed payment due date, return that date if it is in the future or have passed.
-                        2. **Recurring Payment Due Dates:** If the contract specifies recurring payments (e.g., monthly, quarterly, annually), identify the next immediate due date considering the present date. The recurrence pattern can be in formats such as:
-                        - "Payments due on the 15th of each month"
-                        - "Quarterly payments due on tllm_call_for_dateshe first of January, April, July, and October"
-                        - "Annual payment due on June 30 every year"
+    @mlflow.trace(name="Metadata Extractor - Answer Questions Packed (Async)")
+    async def _async_answer_questions_packed(self, questions, file_id, file_name, file_type, user_id, org_id, retry_count):
+        """
+        Async variant of _answer_questions_packed.
+        """
+        file_args = (file_id, file_name, file_type, user_id, org_id, retry_count)
+        contexts = await asyncio.gather(
+            *(self._async_retrieve_question_context(question, *file_args) for question in questions),
+            return_exceptions=True,
+        )
+        for context in contexts:
+            if isinstance(context, Exception):
+                self.logger.error(self._log_message(f"Error retrieving context: {context}", "answer_questions_packed"))
+        contexts = [[] if isinstance(context, Exception) else context for context in contexts]
+
+        questions = [question for question, context in zip(questions, contexts) if context]
+        if not questions:
+            return []
 
-                        **Instructions:**  
-                        - If no payment due date is found or it's unclear, return `'null'` as a string.
-                        - The output should be a JSON-style object with the following structure:
-                        {{"Payment Due Date": "YYYY-MM-DD"}}
+        context = self._merge_question_contexts(contexts)
+        tier_answers = await asyncio.gather(
+            *(
+                async_call_llm_for_fields(tier_questions, context, file_id, user_id, org_id, self.logger, model_name=model_name)
+                for model_name, tier_questions in route_questions(questions).items()
+            ),
+            return_exceptions=True,
+        )
+        answers = {}
+        for tier_answer in tier_answers:
+            if isinstance(tier_answer, Exception):
+                self.logger.error(self._log_message(f"Error collecting packed answers: {tier_answer}", "answer_questions_packed"))
+            else:
+                answers.update(tier_answer or {})
+        escalated_questions = self._escalated_questions(questions, answers)
+        if escalated_questions:
+            answers.update(await async_call_llm_for_fields(escalated_questions, context, file_id, user_id, org_id, self.logger) or {})
+
+        results, fallback_questions = self._split_packed_answers(questions, answers)
+        fallback_results = await asyncio.gather(
+            *(self._async_process_question(question, *file_args, model_name=ESCALATION_MODEL) for question in fallback_questions),
+            return_exceptions=True,
+        )
+        return results + [result for result in fallback_results if not isinstance(result, Exception)]
+
+    def _split_hybrid_answers(self, answers, null_date_keys_questions):
+        """
+        Separates the answers to the hybrid fallback questions from the other metadata answers.
+        """
+        hybrid_fields = {question_field(question) for question in null_date_keys_questions}
+        hybrid_dates = [answer for answer in answers if isinstance(answer, dict) and hybrid_fields & answer.keys()]
+        results = [answer for answer in answers if not (isinstance(answer, dict) and hybrid_fields & answer.keys())]
+        return hybrid_dates, results
 
-                    OUTPUT:
-                    {{
-                    "flag": true/false,
-                    "Payment Due Date": "YYYY-MM-DD"
-                    }}
-                    ###If Expiry date({expiry_date}) < 'Payment Due Date', then return 'flag' = false and 'Payment Due Date' = 'null' 
-                    ###If Expiry date({expiry_date}) < "Current Date ({current_date})", then return "flag" = false and "Payment Due Date" = "null"
-                    Now, analyze the following contract text and return the next immediate payment due date in the required format.
+    def _answer_pending_questions(self, null_date_keys_questions, file_args, prompts=METADATA_EXTRACTION_PROMPTS):
+        """
+        Answers the hybrid fallback questions and the metadata prompts.
+        Returns (hybrid answers, other answers).
+        """
+        if METADATA_PACKED_EXTRACTION:
+            # The always-asked prompts go first, keeping the packed prompt's static prefix stable
+            answers = self._answer_questions_packed(prompts + null_date_keys_questions, *file_args)
+            return self._split_hybrid_answers(answers, null_date_keys_questions)
+        hybrid_dates = self._process_questions(null_date_keys_questions, file_args)
+        return hybrid_dates, self._process_questions(prompts, file_args)
+
+    async def _async_answer_pending_questions(self, null_date_keys_questions, file_args, prompts=METADATA_EXTRACTION_PROMPTS):
+        """
+        Async variant of _answer_pending_questions.
+        """
+        if METADATA_PACKED_EXTRACTION:
+            answers = await self._async_answer_questions_packed(prompts + null_date_keys_questions, *file_args)
+            return self._split_hybrid_answers(answers, null_date_keys_questions)
+        hybrid_dates, results = await asyncio.gather(
+            asyncio.gather(*(self._async_process_question(q, *file_args) for q in null_date_keys_questions), return_exceptions=True),
+            asyncio.gather(*(self._async_process_question(q, *file_args) for q in prompts), return_exceptions=True),
+        )
+        hybrid_dates = [result for result in hybrid_dates if not isinstance(result, Exception)]
+        results = [result for result in results if not isinstance(result, Exception)]
+        return hybrid_dates, results
+
+    def _previous_provenance(self, previous_file_id):
+        """
+        Loads the provenance of the previous version of a file. Returns None when there is
+        no previous version or nothing was stored for it.
+        """
+        store = get_provenance_store()
+        if previous_file_id is None or store is None:
+            return None
+        previous = store.load(previous_file_id)
+        if previous is None:
+            self.logger.info(self._log_message(f"No provenance stored for previous version {previous_file_id}, extracting from scratch", "extract_meta_data_parallely"))
+        return previous
+
+    def _carried_stage_results(self, previous, regex_contexts):
+        """
+        Returns, keyed by stage, the regex-filtered call results of the previous version
+        whose filtered text is unchanged.
+        """
+        if previous is None:
+            return {}
+        carried = {}
+        for stage, context in zip(REGEX_STAGES, regex_contexts):
+            result = previous.stage_result(stage, context)
+            if result is not None:
+                carried[stage] = result
+        metrics.increment("extraction_provenance.carried_stages", len(carried))
+        self.logger.info(self._log_message(f"Regex-filtered calls carried forward: {sorted(carried)}", "extract_meta_data_parallely"))
+        return carried
+
+    async def _async_stage_result(self, carried, stage, llm_call, *args, **kwargs):
+        """
+        Returns the carried result of a regex-filtered call, or awaits the call.
+        """
+        if stage in carried:
+            return carried[stage]
+        return await llm_call(*args, **kwargs)
 
-                    """ }
-                # prompt_for_recurring_payment_due_date["What is the payment due date?"] = \
-                #     prompt_for_recurring_payment_due_date["What is the payment due date?"].format(
-                #         current_date=current_date, expiry_date=expiry_date
-                #     )
-            except Exception as e:
-                import traceback
-                error_details = traceback.format_exc()  # Captures full error traceback
-
-                self.logger.error(self._log_message(f"Error formatting prompt: {e}", "extract_meta_data_parallely"))
-                # self.logger.error(f"Prompt before formatting: {prompt_for_recurring_payment_due_date.get('What is the payment due date?', 'Key not found')}")
-                self.logger.error(f"Full Traceback:\n{error_details}")
-                # raise
-                # prompt_for_recurring_payment_due_date["What is the payment due date?"] = prompt_for_recurring_payment_due_date["What is the payment due date?"].format(current_date=current_date, expiry_date="null")
-            
-            recurring_start = time.perf_counter()
-            
-            response_for_recurring_payment = process_question(prompt_for_recurring_payment_due_date)
-            self.logger.info(self._log_message(f"Recurring Payment Extraction Result: {response_for_recurring_payment} | Type - {type(response_for_recurring_payment)}", "extract_meta_data_parallely"))
-            recurring_duration = time.perf_counter() - recurring_start
+    def _extract_dates(self, chunks, retrieved_chunks, file_id, user_id, org_id):
+        """
+        Resolves the labelled dates of the document locally and calls the LLM only for
+        the date fields left missing or ambiguous, skipping it when none are.
+        """
+        resolution = resolve_dates(chunks)
+        self.logger.info(self._log_message(f"Dates resolved locally: {sorted(resolution.resolved)}, pending: {resolution.pending}", "llm_call_for_dates"))
+        if not resolution.pending:
+            return resolution.merge({})
+        answer = fair_executor.submit(org_id, llm_call_for_dates, retrieved_chunks, date_extraction_instructions, file_id, user_id, org_id, self.logger, use_cache=CACHE_SAMPLED_LLM_CALLS,
+                                      fields=resolution.llm_fields, resolved=resolution.resolved).result()
+        return resolution.merge(answer)
+
+    async def _async_extract_dates(self, chunks, retrieved_chunks, file_id, user_id, org_id):
+        """
+        Async variant of _extract_dates.
+        """
+        resolution = await asyncio.to_thread(resolve_dates, chunks)
+        self.logger.info(self._log_message(f"Dates resolved locally: {sorted(resolution.resolved)}, pending: {resolution.pending}", "llm_call_for_dates"))
+        if not resolution.pending:
+            return resolution.merge({})
+        answer = await async_llm_call_for_dates(retrieved_chunks, date_extraction_instructions, file_id, user_id, org_id, self.logger, use_cache=CACHE_SAMPLED_LLM_CALLS,
+                                                fields=resolution.llm_fields, resolved=resolution.resolved)
+        return resolution.merge(answer)
+
+    def _extract_jurisdiction(self, chunks, retrieved_chunks_jurisdiction, file_id, user_id, org_id):
+        """
+        Resolves the jurisdiction from the governing-law and venue clauses locally and calls
+        the LLM only when they conflict or name no known place.
+        """
+        resolution = resolve_jurisdiction(chunks, retrieved_chunks_jurisdiction)
+        self.logger.info(self._log_message(f"Jurisdiction resolved locally: {resolution.value} ({resolution.reason}), {len(resolution.candidates)} candidates", "llm_call_for_jurisdiction"))
+        if resolution.resolved:
+            return resolution.extraction()
+        return fair_executor.submit(org_id, llm_call_for_jurisdiction, retrieved_chunks_jurisdiction, jurisdiction_instruction, file_id, user_id, org_id, self.logger, use_cache=CACHE_SAMPLED_LLM_CALLS).result()
 
-            if not response_for_recurring_payment:
-                self.logger.error(self._log_message("Recurring Payment Extraction Failed", "extract_meta_data_parallely"))
+    async def _async_extract_jurisdiction(self, chunks, retrieved_chunks_jurisdiction, file_id, user_id, org_id):
+        """
+        Async variant of _extract_jurisdiction.
+        """
+        resolution = await asyncio.to_thread(resolve_jurisdiction, chunks, retrieved_chunks_jurisdiction)
+        self.logger.info(self._log_message(f"Jurisdiction resolved locally: {resolution.value} ({resolution.reason}), {len(resolution.candidates)} candidates", "llm_call_for_jurisdiction"))
+        if resolution.resolved:
+            return resolution.extraction()
+        return await async_llm_call_for_jurisdiction(retrieved_chunks_jurisdiction, jurisdiction_instruction, file_id, user_id, org_id, self.logger, use_cache=CACHE_SAMPLED_LLM_CALLS)
+
+    def _extract_contract_value(self, chunks, retrieved_chunks_cv, file_id, user_id, org_id):
+        """
+        Settles a single or explicitly totalled contract value locally and calls the LLM
+        only for compositional values, with the parsed amounts as hints.
+        """
+        resolution = resolve_contract_value(chunks, retrieved_chunks_cv)
+        self.logger.info(self._log_message(f"Contract value resolved locally: {resolution.value} ({resolution.reason}), {len(resolution.amounts)} amounts parsed", "llm_call_for_cv"))
+        if resolution.resolved:
+            return resolution.extraction()
+        return fair_executor.submit(org_id, llm_call_for_cv, retrieved_chunks_cv, contract_value_instructions, file_id, user_id, org_id, self.logger, use_cache=CACHE_SAMPLED_LLM_CALLS, hints=resolution.hints).result()
+
+    async def _async_extract_contract_value(self, chunks, retrieved_chunks_cv, file_id, user_id, org_id):
+        """
+        Async variant of _extract_contract_value.
+        """
+        resolution = await asyncio.to_thread(resolve_contract_value, chunks, retrieved_chunks_cv)
+        self.logger.info(self._log_message(f"Contract value resolved locally: {resolution.value} ({resolution.reason}), {len(resolution.amounts)} amounts parsed", "llm_call_for_cv"))
+        if resolution.resolved:
+            return resolution.extraction()
+        return await async_llm_call_for_cv(retrieved_chunks_cv, contract_value_instructions, file_id, user_id, org_id, self.logger, use_cache=CACHE_SAMPLED_LLM_CALLS, hints=resolution.hints)
+
+    def _carry_forward_answers(self, previous, fingerprint, questions, provenance):
+        """
+        Splits questions into the answers carried forward from the previous version, for
+        fields whose supporting text is unchanged, and the questions left to ask. Carried
+        fields keep their recorded support in ``provenance``.
+        """
+        if previous is None:
+            return [], questions
+        carried, pending = [], []
+        for question in questions:
+            field = question_field(question)
+            answer = previous.field_answer(field, fingerprint)
+            if answer is None:
+                pending.append(question)
             else:
-                if isinstance(response_for_recurring_payment, dict):
-                    payment_due_date = response_for_recurring_payment.get("Payment Due Date", None)
-                    payment_due_date = None if payment_due_date == "null" else payment_due_date
-                    flag_value = "Yes" if response_for_recurring_payment.get("flag", None) else "No"
-                    flag_value, payment_due_date = payment_due_date_validatior(flag_value, payment_due_date, expiry_date, current_date, file_id, user_id, org_id, self.logger)
+                carried.append(answer)
+                provenance.fields[field] = previous.fields[field]
+        metrics.increment("extraction_provenance.carried_fields", len(carried))
+        metrics.increment("extraction_provenance.reextracted_fields", len(pending))
+        if carried:
+            self.logger.info(self._log_message(f"Fields carried forward: {[key for answer in carried for key in answer]}", "extract_meta_data_parallely"))
+        return carried, pending
+
+    def _record_answers(self, provenance, questions, answers, supports):
+        """
+        Records the answer and supporting context of each question answered in this run.
+        """
+        for question in questions:
+            field = question_field(question)
+            answer = next((answer for answer in answers if isinstance(answer, dict) and field in answer), None)
+            if answer is not None and field in supports:
+                provenance.record_field(field, answer, supports[field])
+
+    def _save_provenance(self, file_id, provenance):
+        store = get_provenance_store()
+        if store is not None:
+            store.save(file_id, provenance)
+
+    def _find_expiry_date(self, results):
+        """
+        Returns the first Expiration Date found in the collected results.
+        """
+        expiry_date = None
+        for result in results:
+            if not result:
+                continue
+            self.logger.info(self._log_message(f"Processing Result: {result} | Type - {type(result)}", "extract_meta_data_parallely"))
+            if isinstance(result, dict):
+                for key, value in result.items():
+                    if key == "Expiration Date":
+                        expiry_date = value
+                        self.logger.debug(self._log_message(f"Expiration date: {expiry_date}", "extract_meta_data_parallely"))
+                        break
+        return expiry_date
 
-                results.extend([{'Payment Due Date': payment_due_date}, {'Has Recurring Payment': flag_value}])
-            
-            set_llm_file_status(file_id, user_id, org_id, 3, True, retry_count, 1, "", start_datetime, "", False, False, self.in_queue, 50, self.logger)
-
-            @mlflow.trace(name="Metadata Extractor - Map Metadata")
-            def map_metadata(data, dates_metadata, others_metadata):
-                for entry in data:
-                    self.logger.info(self._log_message(f"Processing Entry: {entry} | Type - {type(entry)}", "map_metadata"))
-                    if isinstance(entry, dict):
-                        for key, value in entry.items():
-                            value = None if value == 'null' else value
-                            for date_metadata in dates_metadata:
-                                if key.strip().lower() == date_metadata["title"].strip().lower():
-                                    date_metadata["value"] = value
-                            for other_metadata in others_metadata:
-                                if key.strip().lower() == other_metadata["title"].strip().lower():
-                                    other_metadata["value"] = value
-
-                return dates_metadata, others_metadata
-
-            def update_contract_duration(dates_metadata, others_metadata):
-                # Find the contract duration metadata item
-                contract_duration_item = next((item for item in others_metadata if item["title"] == "Contract Duration"), None)
-                
-                # If contract duration is empty/None
-                if contract_duration_item and contract_duration_item["value"] is None:
-                    # Find effective date
-                    effective_date_item = next((item for item in dates_metadata if item["title"] == "Effective Date"), None)
-                    # Find expiration date
-                    expiration_date_item = next((item for item in dates_metadata if item["title"] == "Expiration Date"), None)
-                    # Find termination date
-                    termination_date_item = next((item for item in dates_metadata if item["title"] == "Termination Date"), None)
-                    
-                    # Check if effective date exists and either expiration or termination date exists
-                    if effective_date_item and effective_date_item["value"]:
-                        end_date = None
-                        
-                        if expiration_date_item and expiration_date_item["value"]:
-                            end_date = expiration_date_item["value"]
-                        elif termination_date_item and termination_date_item["value"]:
-                            end_date = termination_date_item["value"]
-                        
-                        if end_date:
-                            contract_duration_item["value"] = f"from {effective_date_item['value']} to {end_date}"
-                
-                return dates_metadata, others_metadata
-
-            default_dates_metadata = [
-                {"title": "Effective Date", "value": None},
-                {"title": "Term Date", "value": None},
-                {"title": "Payment Due Date", "value": None},
-                {"title": "Delivery Date", "value": None},
-                {"title": "Termination Date", "value": None},
-                {"title": "Renewal Date", "value": None},
-                {"title": "Expiration Date", "value": None}
-            ]
+    def _build_recurring_payment_prompt(self, current_date, expiry_date):
+        """
+        Builds the question used to extract the next payment due date and the recurring payment flag.
+        The per-file dates go at the end so the instructions stay a cacheable static prefix.
+        """
+        return {PAYMENT_DUE_DATE_QUESTION: RECURRING_PAYMENT_INSTRUCTIONS + f"""
+                    Current Date: {current_date}
+                    Expiry Date: {expiry_date}
+                    """}
 
-            default_others_metadata = [
-                {"title": "Title of the Contract", "value": None},
-                {"title": "Scope of Work", "value": None},
-                {"title": "Parties Involved", "value": None},
-                {"title": "Contract Type", "value": None},
-                {"title": "File Type", "value": "Contract"},
-                {"title": "Jurisdiction", "value": None},
-                {"title": "Version Control", "value": None},
-                {"title": "Contract Duration", "value": None},
-                {"title": "Contract Value", "value": None},
-                {"title": "Risk Mitigation Score", "value": None},
-                {"title": "Has Recurring Payment", "value": None}
-            ]
+    def _apply_recurring_payment(self, response_for_recurring_payment, results, expiry_date, current_date, file_id, user_id, org_id):
+        """
+        Validates the recurring payment answer and appends it to the collected results.
+        """
+        self.logger.info(self._log_message(f"Recurring Payment Extraction Result: {response_for_recurring_payment} | Type - {type(response_for_recurring_payment)}", "extract_meta_data_parallely"))
+        if not response_for_recurring_payment:
+            self.logger.error(self._log_message("Recurring Payment Extraction Failed", "extract_meta_data_parallely"))
+            return
 
-            mapping_start = time.perf_counter()
-            dates_metadata, others_metadata = map_metadata(results, default_dates_metadata, default_others_metadata)
-            # Add the validation for contract duration
-            dates_metadata, others_metadata = update_contract_duration(dates_metadata, others_metadata)
+        if isinstance(response_for_recurring_payment, dict):
+            payment_due_date = response_for_recurring_payment.get("Payment Due Date", None)
+            payment_due_date = None if payment_due_date == "null" else payment_due_date
+            flag_value = "Yes" if response_for_recurring_payment.get("flag", None) else "No"
+            flag_value, payment_due_date = payment_due_date_validatior(flag_value, payment_due_date, expiry_date, current_date, file_id, user_id, org_id, self.logger)
 
-            mapping_duration = time.perf_counter() - mapping_start
+        results.extend([{'Payment Due Date': payment_due_date}, {'Has Recurring Payment': flag_value}])
 
-            metadata = {"metadata": {"dates": dates_metadata, "others": others_metadata}}
+    def _expiry_date_pending(self, results):
+        """
+        The payment prompt waits for the hybrid fallback only when the date call left the
+        expiry date empty, as the fallback is then asked for it.
+        """
+        return ("fallback",) if results["dates"].get("Expiration Date") in ("null", None) else ()
 
-          
-            set_llm_file_status(file_id, user_id, org_id, 3, True, retry_count, 1, "", start_datetime, "", False, False, self.in_queue, 75, self.logger)
+    def _extraction_stages(self, chunks, regex_contexts, carried, previous, fingerprint, provenance, file_args, current_date):
+        """
+        Returns the extraction DAG: the regex-filtered calls and the metadata prompts start
+        at once, the hybrid fallback waits for the regex-filtered calls whose empty fields it
+        asks for, and the payment prompt waits for the expiry date.
+        """
+        file_id, file_name, file_type, user_id, org_id, retry_count = file_args
+        extract = {"dates": self._extract_dates, "jurisdiction": self._extract_jurisdiction, "cv": self._extract_contract_value}
+
+        def regex_stage(stage, context):
+            def run(results):
+                result = carried[stage] if stage in carried else extract[stage](chunks, context, file_id, user_id, org_id)
+                provenance.record_stage(stage, context, result)
+                return result
+            return Stage(stage, run)
+
+        def prompts(results):
+            carried_results, questions = self._carry_forward_answers(previous, fingerprint, METADATA_EXTRACTION_PROMPTS, provenance)
+            return questions, self._answer_pending_questions([], file_args, questions)[1], carried_results
+
+        def fallback(results):
+            questions = self._null_metadata_questions(results["dates"], results["jurisdiction"], results["cv"])
+            carried_answers, questions = self._carry_forward_answers(previous, fingerprint, questions, provenance)
+            answers = self._answer_pending_questions(questions, file_args, [])[0] if questions else []
+            # The regex-filtered results are shared with the other stages, which read them once this one is done
+            self._merge_hybrid_results(answers + carried_answers, results["dates"], results["jurisdiction"], results["cv"])
+            return questions, answers, carried_answers
+
+        def payment(results):
+            expiry_date = self._find_expiry_date([results["dates"]])
+            response = fair_executor.submit(org_id, self._process_question, self._build_recurring_payment_prompt(current_date, expiry_date), *file_args).result()
+            payment_results = []
+            self._apply_recurring_payment(response, payment_results, expiry_date, current_date, file_id, user_id, org_id)
+            return payment_results
+
+        return [
+            *(regex_stage(stage, context) for stage, context in zip(REGEX_STAGES, regex_contexts)),
+            Stage("prompts", prompts),
+            Stage("fallback", fallback, after=REGEX_STAGES),
+            Stage("payment", payment, after=("dates",), after_when=self._expiry_date_pending),
+        ]
+
+    def _async_extraction_stages(self, chunks, regex_contexts, carried, previous, fingerprint, provenance, file_args, current_date):
+        """
+        Async variant of _extraction_stages.
+        """
+        file_id, file_name, file_type, user_id, org_id, retry_count = file_args
+        extract = {"dates": self._async_extract_dates, "jurisdiction": self._async_extract_jurisdiction, "cv": self._async_extract_contract_value}
+
+        def regex_stage(stage, context):
+            async def run(results):
+                result = await self._async_stage_result(carried, stage, extract[stage], chunks, context, file_id, user_id, org_id)
+                provenance.record_stage(stage, context, result)
+                return result
+            return Stage(stage, run)
+
+        async def prompts(results):
+            carried_results, questions = self._carry_forward_answers(previous, fingerprint, METADATA_EXTRACTION_PROMPTS, provenance)
+            return questions, (await self._async_answer_pending_questions([], file_args, questions))[1], carried_results
+
+        async def fallback(results):
+            questions = self._null_metadata_questions(results["dates"], results["jurisdiction"], results["cv"])
+            carried_answers, questions = self._carry_forward_answers(previous, fingerprint, questions, provenance)
+            answers = (await self._async_answer_pending_questions(questions, file_args, []))[0] if questions else []
+            self._merge_hybrid_results(answers + carried_answers, results["dates"], results["jurisdiction"], results["cv"])
+            return questions, answers, carried_answers
+
+        async def payment(results):
+            expiry_date = self._find_expiry_date([results["dates"]])
+            response = await self._async_process_question(self._build_recurring_payment_prompt(current_date, expiry_date), *file_args)
+            payment_results = []
+            self._apply_recurring_payment(response, payment_results, expiry_date, current_date, file_id, user_id, org_id)
+            return payment_results
+
+        return [
+            *(regex_stage(stage, context) for stage, context in zip(REGEX_STAGES, regex_contexts)),
+            Stage("prompts", prompts),
+            Stage("fallback", fallback, after=REGEX_STAGES),
+            Stage("payment", payment, after=("dates",), after_when=self._expiry_date_pending),
+        ]
+
+    def _collect_stage_results(self, schedule, provenance, file_id):
+        """
+        Records the answers of the prompts and fallback stages and returns the collected
+        results in the order the metadata mapping expects.
+        """
+        prompt_questions, prompt_answers, carried_results = schedule.results["prompts"]
+        fallback_questions, fallback_answers, _ = schedule.results["fallback"]
+        self._record_answers(provenance, fallback_questions + prompt_questions, fallback_answers + prompt_answers, support_ledger.pop(file_id))
+        date_extraction = schedule.results["dates"]
+        self.logger.info(self._log_message(f"Final Date Extraction Result: {date_extraction}", "extract_meta_data_parallely"))
+        results = prompt_answers + carried_results
+        self.logger.info(self._log_message(f"Metadata extraction results: {results}", "extract_meta_data_parallely"))
+        return results + [schedule.results[stage] for stage in REGEX_STAGES] + schedule.results["payment"]
+
+    @mlflow.trace(name="Metadata Extractor - Map Metadata")
+    def _map_metadata(self, data, dates_metadata, others_metadata):
+        """
+        Maps the extracted key/value pairs onto the dates and others metadata templates.
+        """
+        for entry in data:
+            self.logger.info(self._log_message(f"Processing Entry: {entry} | Type - {type(entry)}", "map_metadata"))
+            if isinstance(entry, dict):
+                for key, value in entry.items():
+                    value = None if value == 'null' else value
+                    for date_metadata in dates_metadata:
+                        if key.strip().lower() == date_metadata["title"].strip().lower():
+                            date_metadata["value"] = value
+                    for other_metadata in others_metadata:
+                        if key.strip().lower() == other_metadata["title"].strip().lower():
+                            other_metadata["value"] = value
+
+        return dates_metadata, others_metadata
+
+    def _update_contract_duration(self, dates_metadata, others_metadata):
+        """
+        Derives the contract duration from the effective and end dates when it was not extracted.
+        """
+        # Find the contract duration metadata item
+        contract_duration_item = next((item for item in others_metadata if item["title"] == "Contract Duration"), None)
+
+        # If contract duration is empty/None
+        if contract_duration_item and contract_duration_item["value"] is None:
+            # Find effective date
+            effective_date_item = next((item for item in dates_metadata if item["title"] == "Effective Date"), None)
+            # Find expiration date
+            expiration_date_item = next((item for item in dates_metadata if item["title"] == "Expiration Date"), None)
+            # Find termination date
+            termination_date_item = next((item for item in dates_metadata if item["title"] == "Termination Date"), None)
+
+            # Check if effective date exists and either expiration or termination date exists
+            if effective_date_item and effective_date_item["value"]:
+                end_date = None
+
+                if expiration_date_item and expiration_date_item["value"]:
+                    end_date = expiration_date_item["value"]
+                elif termination_date_item and termination_date_item["value"]:
+                    end_date = termination_date_item["value"]
+
+                if end_date:
+                    contract_duration_item["value"] = f"from {effective_date_item['value']} to {end_date}"
+
+        return dates_metadata, others_metadata
+
+    def _build_metadata(self, results):
+        """
+        Builds the final metadata payload from the collected results.
+        """
+        default_dates_metadata = [
+            {"title": "Effective Date", "value": None},
+            {"title": "Term Date", "value": None},
+            {"title": "Payment Due Date", "value": None},
+            {"title": "Delivery Date", "value": None},
+            {"title": "Termination Date", "value": None},
+            {"title": "Renewal Date", "value": None},
+            {"title": "Expiration Date", "value": None}
+        ]
+
+        default_others_metadata = [
+            {"title": "Title of the Contract", "value": None},
+            {"title": "Scope of Work", "value": None},
+            {"title": "Parties Involved", "value": None},
+            {"title": "Contract Type", "value": None},
+            {"title": "File Type", "value": "Contract"},
+            {"title": "Jurisdiction", "value": None},
+            {"title": "Version Control", "value": None},
+            {"title": "Contract Duration", "value": None},
+            {"title": "Contract Value", "value": None},
+            {"title": "Risk Mitigation Score", "value": None},
+            {"title": "Has Recurring Payment", "value": None}
+        ]
+
+        dates_metadata, others_metadata = self._map_metadata(results, default_dates_metadata, default_others_metadata)
+        # Add the validation for contract duration
+        dates_metadata, others_metadata = self._update_contract_duration(dates_metadata, others_metadata)
+
+        return {"metadata": {"dates": dates_metadata, "others": others_metadata}}
+
+    def _log_extraction_summary(self, process, metadata, timings, overall_start, file_id, file_name, file_type, user_id, org_id, retry_count, schedule=None):
+        """
+        Logs the memory, CPU and timing summary of a metadata extraction run, with the
+        stage timings and critical path of its stage schedule.
+        """
+        overall_duration = time.perf_counter() - overall_start
+        memory_usage = process.memory_info().rss / (1024 * 1024)  # Memory usage in MB
+        cpu_usage = process.cpu_percent(interval=0.1)
+
+        log_data = {
+            "file_id": file_id,
+            "file_name": file_name,
+            "file_type": file_type,
+            "user_id": user_id,
+            "org_id": org_id,
+            "retry_count": retry_count,
+            "metadata": metadata,
+            "model_routing": routing_ledger.pop_summary(file_id),
+            "stage_schedule": schedule.summary() if schedule is not None else None,
+            "memory_usage": round(memory_usage, 2),
+            "cpu_usage": round(cpu_usage, 2),
+            "time_taken": {
+                **{name: round(duration, 2) for name, duration in timings.items()},
+                "total_metadata_execution_time": round(overall_duration, 2)
+            }
+        }
+        self.logger.info(self._log_message(f"METADATA EXTRACTION PROCESS SUMMARY: {orjson.dumps(log_data).decode()}", "extract_meta_data_parallely"))
+
+    def _new_file_state(self, file_args):
+        """
+        Returns the state a file carries through the steps of its extraction.
+        """
+        return {
+            "file_args": file_args,
+            "start_datetime": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "overall_start": time.perf_counter(),
+            "timings": {},
+            "failed": False,
+        }
+
+    def _prepare_file(self, state, chunks, previous_file_id=None):
+        """
+        Marks the file as started and runs the CPU-bound preparation: the document index,
+        its fingerprint, the previous version's provenance and the regex filters.
+        """
+        file_id, file_name, file_type, user_id, org_id, retry_count = state["file_args"]
+        status_start = time.perf_counter()
+        set_llm_file_status(file_id, user_id, org_id, 3, True, retry_count, 1, "", state["start_datetime"], "", False, False, self.in_queue, 25, self.logger)
+        state["timings"]["llm_status_initiate_3_time"] = time.perf_counter() - status_start
+
+        # Normalised and segmented once, then shared by the stages reading the document
+        state["chunks"] = chunks
+        state["index"] = DocumentIndex.build(chunks)
+        state["fingerprint"] = DocumentFingerprint(state["index"])
+        state["provenance"] = FileProvenance(state["fingerprint"].chunk_hashes)
+        state["previous"] = self._previous_provenance(previous_file_id)
+        state["regex_contexts"] = self._extract_regex_contexts(state["index"])
+        local_retrievers.register(file_id, chunks)
+        return state
+
+    def _extract_prepared(self, state, current_date):
+        """
+        Runs the extraction stages of a prepared file and stores its metadata.
+        """
+        file_id, file_name, file_type, user_id, org_id, retry_count = state["file_args"]
+        start_datetime = state["start_datetime"]
+        timings = state["timings"]
+
+        # Steps that do not depend on each other run at once; regex-filtered calls whose
+        # filtered text is that of the previous version are carried forward
+        carried = self._carried_stage_results(state["previous"], state["regex_contexts"])
+        extraction_start = time.perf_counter()
+        state["schedule"] = run_stages(
+            self._extraction_stages(state["chunks"], state["regex_contexts"], carried, state["previous"], state["fingerprint"], state["provenance"], state["file_args"], current_date),
+            submit=submit_with_context,
+        )
+        timings["metadata_extraction_time"] = time.perf_counter() - extraction_start
+        timings["recurring_payment_extraction_time"] = state["schedule"].seconds("payment")
+        # Batches hold many extracted files until their vectors are stored, the text and
+        # its retriever are no longer needed
+        del state["chunks"]
+        local_retrievers.pop(file_id)
+        results = self._collect_stage_results(state["schedule"], state["provenance"], file_id)
+
+        set_llm_file_status(file_id, user_id, org_id, 3, True, retry_count, 1, "", start_datetime, "", False, False, self.in_queue, 50, self.logger)
+
+        metadata = self._build_metadata(results)
+
+        set_llm_file_status(file_id, user_id, org_id, 3, True, retry_count, 1, "", start_datetime, "", False, False, self.in_queue, 75, self.logger)
+
+        set_meta_start = time.perf_counter()
+        set_meta_data(file_id, user_id, org_id, 3, start_datetime, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), 3, False, "", retry_count, metadata, self.in_queue, 100, self.logger)
+        timings["metadata_status_completion_time"] = time.perf_counter() - set_meta_start
+        self._save_provenance(file_id, state["provenance"])
+        # Only the chunk count of the document is read once the metadata is stored
+        state["chunk_count"] = state["index"].chunk_count
+        for key in ("index", "fingerprint", "provenance", "previous", "regex_contexts"):
+            del state[key]
+        state["metadata"] = metadata
+        return metadata
+
+    def _store_metadata_vectors(self, state):
+        """
+        Upserts the metadata vectors of an extracted file and marks it as completed.
+        """
+        file_id, file_name, file_type, user_id, org_id, retry_count = state["file_args"]
+        vector_start = time.perf_counter()
+        self.metadata_vector_handler.process_contract_template(state["metadata"], file_id, file_name, file_type, user_id, org_id, state["chunk_count"])
+        state["timings"]["metadata_vector_upsertion_time"] = time.perf_counter() - vector_start
+
+        status_end_start = time.perf_counter()
+        set_llm_file_status(file_id, user_id, org_id, 3, True, retry_count, 3, "", state["start_datetime"], datetime.now().strftime('%Y-%m-%d %H:%M:%S'), False, False, self.in_queue, 100, self.logger)
+        state["timings"]["llm_status_completion_3_time"] = time.perf_counter() - status_end_start
+
+    @mlflow.trace(name="Metadata Extractor - Extract Meta Data Parallely")
+    def extract_meta_data_parallely(self, file_id, file_name, file_type, user_id, org_id, retry_count, chunks, previous_file_id=None):
+        """
+        Extracts the metadata of a file. ``previous_file_id`` names the previous version of
+        the contract: calls and fields whose supporting text is unchanged are carried forward.
+        """
+        overall_start = time.perf_counter()
+        process = psutil.Process()
+        file_args = (file_id, file_name, file_type, user_id, org_id, retry_count)
+        state = self._new_file_state(file_args)
+        try:
+            self.logger.info(self._log_message("Starting metadata extraction.", "extract_meta_data_parallely"))
+            current_date = datetime.now().strftime("%Y-%m-%d")
+
+            self._prepare_file(state, chunks, previous_file_id)
+            metadata = self._extract_prepared(state, current_date)
+            self._store_metadata_vectors(state)
+
+            self._log_extraction_summary(process, metadata, state["timings"], overall_start, *file_args, schedule=state["schedule"])
+            return metadata
+        except Exception as e:
+            error_message = f"Error during metadata extraction: {e}"
+            self.logger.error(self._log_message(error_message, "extract_meta_data_parallely"))
             
+            set_llm_file_status(file_id, user_id, org_id, 3, True, retry_count, 2, error_message, state["start_datetime"], datetime.now().strftime('%Y-%m-%d %H:%M:%S'), False, False, self.in_queue, 100, self.logger)
+            raise
+
+        finally:
+            # Forget the routing and support records of a failed run
+            routing_ledger.pop_summary(file_id)
+            support_ledger.pop(file_id)
+            local_retrievers.pop(file_id)
+            elapsed_time = time.perf_counter() - overall_start
+            self.logger.info(self._log_message(f"Metadata extraction completed in {elapsed_time:.2f} seconds.", "extract_meta_data_parallely"))
+
+    def _store_batch_vectors(self, state):
+        """
+        Stores the metadata vectors of a file extracted by a batch on one of its vector
+        writers. A file whose upsert fails is marked as failed.
+        """
+        try:
+            self._store_metadata_vectors(state)
+            self._log_extraction_summary(psutil.Process(), state["metadata"], state["timings"], state["overall_start"], *state["file_args"], schedule=state["schedule"])
+        except Exception as e:
+            self._fail_backfill_file(state, e, "extract_meta_data_batch")
+        return state
+
+    @mlflow.trace(name="Metadata Extractor - Extract Meta Data Batch")
+    def extract_meta_data_batch(self, files, files_in_flight=METADATA_BATCH_FILES_IN_FLIGHT):
+        """
+        Extracts the metadata of many files, pipelined across files, and yields
+        (file_id, metadata) as each file completes, with None for a file that failed.
+
+        ``files`` is an iterable of dicts holding the extract_meta_data_parallely arguments,
+        read lazily. Up to ``files_in_flight`` files are in extraction while as many more
+        are prepared (indexing and regex filters) on the stage executor, so the CPU work
+        of the next files overlaps the LLM calls of the current ones. Their retrieval and
+        LLM calls share the process-wide fair executor and rate limits. Vector upserts are
+        flushed in groups of METADATA_BATCH_VECTOR_GROUP files, a group's upserts running on
+        METADATA_BATCH_VECTOR_WRITERS writers at once.
+        """
+        current_date = datetime.now().strftime("%Y-%m-%d")
+        files = iter(files)
+        exhausted = False
+        preparing, extracting, storing = {}, {}, {}
+        prepared, group = deque(), []
+        completed = failed = 0
+        with ThreadPoolExecutor(max_workers=files_in_flight, thread_name_prefix="metadata-batch") as file_executor, \
+                ThreadPoolExecutor(max_workers=METADATA_BATCH_VECTOR_WRITERS, thread_name_prefix="metadata-batch-vectors") as vector_executor:
+            while True:
+                while not exhausted and len(preparing) + len(prepared) < files_in_flight:
+                    file = next(files, None)
+                    if file is None:
+                        exhausted = True
+                        break
+                    state = self._new_file_state((file["file_id"], file["file_name"], file["file_type"], file["user_id"], file["org_id"], file.get("retry_count", 0)))
+                    preparing[submit_with_context(stage_executor, self._prepare_file, state, file["chunks"], file.get("previous_file_id"))] = state
+                while prepared and len(extracting) < files_in_flight:
+                    state = prepared.popleft()
+                    extracting[submit_with_context(file_executor, self._extract_prepared, state, current_date)] = state
+                # A partial group is flushed once no file is left to join it
+                if group and (len(group) >= METADATA_BATCH_VECTOR_GROUP or not (preparing or prepared or extracting)):
+                    for state in group:
+                        storing[submit_with_context(vector_executor, self._store_batch_vectors, state)] = state
+                    group = []
+                if not (preparing or extracting or storing):
+                    break
+
+                done, _ = wait([*preparing, *extracting, *storing], return_when=FIRST_COMPLETED)
+                finished = []
+                for future in done:
+                    if future in storing:
+                        finished.append(storing.pop(future))
+                        continue
+                    state = preparing.pop(future, None) or extracting.pop(future)
+                    if future.exception() is not None:
+                        self._fail_backfill_file(state, future.exception(), "extract_meta_data_batch")
+                        finished.append(state)
+                    elif "metadata" in state:
+                        group.append(state)
+                    else:
+                        prepared.append(state)
+                for state in finished:
+                    file_id = state["file_args"][0]
+                    # Forget the routing and support records of a failed file
+                    routing_ledger.pop_summary(file_id)
+                    support_ledger.pop(file_id)
+                    local_retrievers.pop(file_id)
+                    completed += not state["failed"]
+                    failed += state["failed"]
+                    yield file_id, None if state["failed"] else state["metadata"]
+
+        self.logger.info(self._log_message(f"Batch extraction completed for {completed} files, {failed} failed.", "extract_meta_data_batch"))
+
+    @mlflow.trace(name="Metadata Extractor - Extract Meta Data (Async)")
+    async def extract_meta_data(self, file_id, file_name, file_type, user_id, org_id, retry_count, chunks, previous_file_id=None):
+        """
+        Async variant of extract_meta_data_parallely.
+
+        LLM calls go through AsyncOpenAI and fan out with asyncio.gather, so a worker can
+        keep many files in flight without a thread per request. Blocking status, Pinecone and
+        vector store calls run in the default executor; asyncio.to_thread copies the
+        contextvars, which carries the OpenTelemetry context across.
+        """
+        overall_start = time.perf_counter()
+        process = psutil.Process()
+        start_datetime = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        try:
+            self.logger.info(self._log_message("Starting metadata extraction.", "extract_meta_data"))
+            current_date = datetime.now().strftime("%Y-%m-%d")
+            file_args = (file_id, file_name, file_type, user_id, org_id, retry_count)
+
+            status_start = time.perf_counter()
+            await asyncio.to_thread(set_llm_file_status, file_id, user_id, org_id, 3, True, retry_count, 1, "", start_datetime, "", False, False, self.in_queue, 25, self.logger)
+            status_duration = time.perf_counter() - status_start
+
+            # Indexing and the regex filters are CPU bound, keep them off the event loop
+            index = await asyncio.to_thread(DocumentIndex.build, chunks)
+            fingerprint = await asyncio.to_thread(DocumentFingerprint, index)
+            provenance = FileProvenance(fingerprint.chunk_hashes)
+            previous = await asyncio.to_thread(self._previous_provenance, previous_file_id)
+            regex_contexts = await asyncio.to_thread(self._extract_regex_contexts, index)
+            await asyncio.to_thread(local_retrievers.register, file_id, chunks)
+
+            # The regex-filtered calls, the metadata prompts, the hybrid fallback and the
+            # payment prompt run as a DAG, each starting once the stages it reads are done
+            carried = self._carried_stage_results(previous, regex_contexts)
+            extraction_start = time.perf_counter()
+            schedule = await async_run_stages(
+                self._async_extraction_stages(chunks, regex_contexts, carried, previous, fingerprint, provenance, file_args, current_date)
+            )
+            extraction_duration = time.perf_counter() - extraction_start
+            results = self._collect_stage_results(schedule, provenance, file_id)
+
+            await asyncio.to_thread(set_llm_file_status, file_id, user_id, org_id, 3, True, retry_count, 1, "", start_datetime, "", False, False, self.in_queue, 50, self.logger)
+
+            metadata = self._build_metadata(results)
+
+            await asyncio.to_thread(set_llm_file_status, file_id, user_id, org_id, 3, True, retry_count, 1, "", start_datetime, "", False, False, self.in_queue, 75, self.logger)
+
             set_meta_start = time.perf_counter()
-            set_meta_data(file_id, user_id, org_id, 3, start_datetime, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), 3, False, "", retry_count, metadata, self.in_queue, 100, self.logger)
+            await asyncio.to_thread(set_meta_data, file_id, user_id, org_id, 3, start_datetime, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), 3, False, "", retry_count, metadata, self.in_queue, 100, self.logger)
             set_meta_duration = time.perf_counter() - set_meta_start
-            
+            await asyncio.to_thread(self._save_provenance, file_id, provenance)
+
             vector_start = time.perf_counter()
-            self.metadata_vector_handler.process_contract_template(metadata, file_id, file_name, file_type, user_id, org_id, len(chunks))
+            await asyncio.to_thread(self.metadata_vector_handler.process_contract_template, metadata, file_id, file_name, file_type, user_id, org_id, index.chunk_count)
             vector_duration = time.perf_counter() - vector_start
-            
-            status_end_start = time.perf_counter()
-            
 
-            set_llm_file_status(file_id, user_id, org_id, 3, True, retry_count, 3, "", start_datetime, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), False, False, self.in_queue, 100, self.logger)
+            status_end_start = time.perf_counter()
+            await asyncio.to_thread(set_llm_file_status, file_id, user_id, org_id, 3, True, retry_count, 3, "", start_datetime, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), False, False, self.in_queue, 100, self.logger)
             status_end_duration = time.perf_counter() - status_end_start
-            
-            overall_duration = time.perf_counter() - overall_start
-            memory_usage = process.memory_info().rss / (1024 * 1024)  # Memory usage in MB
-            cpu_usage = process.cpu_percent(interval=0.1)
-            
-            log_data = {
-                "file_id": file_id,
-                "file_name": file_name,
-                "file_type": file_type,
-                "user_id": user_id,
-                "org_id": org_id,
-                "retry_count": retry_count,
-                "metadata": metadata,
-                "memory_usage": round(memory_usage, 2),
-                "cpu_usage": round(cpu_usage, 2),
-                "time_taken": {
-                    "llm_status_initiate_3_time": round(status_duration, 2),
-                    "metadata_extraction_time": round(extraction_duration, 2),
-                    "recurring_payment_extraction_time": round(recurring_duration, 2),
-                    "metadata_status_completion_time": round(set_meta_duration, 2),
-                    "metadata_vector_upsertion_time": round(vector_duration, 2),
-                    "llm_status_completion_3_time": round(status_end_duration, 2),
-                    "total_metadata_execution_time": round(overall_duration, 2)
-                }
+
+            timings = {
+                "llm_status_initiate_3_time": status_duration,
+                "metadata_extraction_time": extraction_duration,
+                "recurring_payment_extraction_time": schedule.seconds("payment"),
+                "metadata_status_completion_time": set_meta_duration,
+                "metadata_vector_upsertion_time": vector_duration,
+                "llm_status_completion_3_time": status_end_duration,
             }
-            self.logger.info(self._log_message(f"METADATA EXTRACTION PROCESS SUMMARY: {orjson.dumps(log_data).decode()}", "extract_meta_data_parallely"))
+            self._log_extraction_summary(process, metadata, timings, overall_start, *file_args, schedule=schedule)
             return metadata
         except Exception as e:
             error_message = f"Error during metadata extraction: {e}"
-            self.logger.error(self._log_message(error_message, "extract_meta_data_parallely"))
-            
-            set_llm_file_status(file_id, user_id, org_id, 3, True, retry_count, 2, error_message, start_datetime, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), False, False, self.in_queue, 100, self.logger)
+            self.logger.error(self._log_message(error_message, "extract_meta_data"))
+
+            await asyncio.to_thread(set_llm_file_status, file_id, user_id, org_id, 3, True, retry_count, 2, error_message, start_datetime, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), False, False, self.in_queue, 100, self.logger)
             raise
 
         finally:
+            # Forget the routing and support records of a failed run
+            routing_ledger.pop_summary(file_id)
+            support_ledger.pop(file_id)
+            local_retrievers.pop(file_id)
             elapsed_time = time.perf_counter() - overall_start
-            self.logger.info(self._log_message(f"Metadata extraction completed in {elapsed_time:.2f} seconds.", "extract_meta_data_parallely"))
+            self.logger.info(self._log_message(f"Metadata extraction completed in {elapsed_time:.2f} seconds.", "extract_meta_data"))
+
+    def _batch_question_line(self, custom_id, question, file_args):
+        """
+        Retrieves the context for a question and returns its batch request line, or None
+        when nothing was retrieved.
+        """
+        context = self._retrieve_question_context(question, *file_args)
+        if not context:
+            return None
+        context = assemble_context(context, context_token_budget(question_field(question)), "call_llm")
+        system_prompt, user_prompt = build_llm_call_prompts(question, context)
+        return build_batch_line(custom_id, system_prompt, user_prompt, "gpt-4o", 0, structured_response_format(question_response_schema(question)))
+
+    def _parse_batch_answer(self, answers, custom_id, function_name):
+        """
+        Parses one batch answer. Missing or malformed answers yield None.
+        """
+        llm_response = answers.get(custom_id)
+        if llm_response is None:
+            self.logger.warning(self._log_message(f"No batch answer for {custom_id}", function_name))
+            return None
+        try:
+            return parse_llm_response(llm_response, function_name, self.logger)
+        except LLMCallError as e:
+            self.logger.error(self._log_message(f"Malformed batch answer for {custom_id}: {e}", function_name))
+            return None
+
+    def _fail_backfill_file(self, state, error, function_name="backfill_meta_data"):
+        """
+        Marks a file of a backfill or batch extraction as failed and drops it from the remaining rounds.
+        """
+        file_id, file_name, file_type, user_id, org_id, retry_count = state["file_args"]
+        error_message = f"Error during metadata extraction: {error}"
+        self.logger.error(self._log_message(error_message, function_name))
+        state["failed"] = True
+        set_llm_file_status(file_id, user_id, org_id, 3, True, retry_count, 2, error_message, state["start_datetime"], datetime.now().strftime('%Y-%m-%d %H:%M:%S'), False, False, self.in_queue, 100, self.logger)
+
+    @mlflow.trace(name="Metadata Extractor - Backfill Meta Data")
+    def backfill_meta_data(self, files, backend=None):
+        """
+        Re-extracts metadata for many files through the OpenAI Batch API.
+
+        ``files`` is a list of dicts holding the extract_meta_data_parallely arguments
+        (file_id, file_name, file_type, user_id, org_id, retry_count, chunks). The prompts
+        of all files go out in three batch rounds: the regex-filtered and metadata
+        questions, the hybrid fallbacks for empty fields, and the recurring payment
+        question that needs the expiry date. Answers then go through the same
+        map/set_meta_data/vector flow as a single file. Returns metadata keyed by file_id.
+        """
+        backend = backend or OpenAIBatchBackend()
+        current_date = datetime.now().strftime("%Y-%m-%d")
+        states = []
+        for file in files:
+            state = {
+                "file_args": (file["file_id"], file["file_name"], file["file_type"], file["user_id"], file["org_id"], file.get("retry_count", 0)),
+                "start_datetime": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                "failed": False,
+            }
+            states.append(state)
+            file_id, file_name, file_type, user_id, org_id, retry_count = state["file_args"]
+            try:
+                set_llm_file_status(file_id, user_id, org_id, 3, True, retry_count, 1, "", state["start_datetime"], "", False, False, self.in_queue, 25, self.logger)
+                # Only the index is kept, the chunks of every file need not stay in memory
+                state["index"] = DocumentIndex.build(file["chunks"])
+                state["regex_contexts"] = self._extract_regex_contexts(state["index"])
+                state["date_resolution"] = resolve_dates(file["chunks"])
+                state["jurisdiction_resolution"] = resolve_jurisdiction(file["chunks"], state["regex_contexts"][1])
+                state["contract_value_resolution"] = resolve_contract_value(file["chunks"], state["regex_contexts"][2])
+            except Exception as e:
+                self._fail_backfill_file(state, e)
+
+        # Round 1: regex-filtered calls and the metadata questions
+        lines = []
+        for idx, state in enumerate(states):
+            if state["failed"]:
+                continue
+            try:
+                retrieved_chunks, retrieved_chunks_jurisdiction, retrieved_chunks_cv = state["regex_contexts"]
+                resolution = state["date_resolution"]
+                if resolution.pending:
+                    date_prompts = build_dates_prompts(assemble_text_context(retrieved_chunks, context_token_budget("llm_call_for_dates"), "llm_call_for_dates"), date_extraction_instructions,
+                                                       fields=resolution.llm_fields, resolved=resolution.resolved)
+                    lines.append(build_batch_line(f"{idx}:dates", *date_prompts, "gpt-4o", 0.5, structured_response_format(dates_response_schema(resolution.llm_fields or DATE_FIELDS))))
+                if not state["jurisdiction_resolution"].resolved:
+                    lines.append(build_batch_line(f"{idx}:jurisdiction", *build_jurisdiction_prompts(assemble_text_context(retrieved_chunks_jurisdiction, context_token_budget("llm_call_for_jurisdiction"), "llm_call_for_jurisdiction"), jurisdiction_instruction), "gpt-4o", 0.5, structured_response_format(JURISDICTION_RESPONSE_SCHEMA)))
+                cv_resolution = state["contract_value_resolution"]
+                if not cv_resolution.resolved:
+                    cv_prompts = build_cv_prompts(assemble_text_context(retrieved_chunks_cv, context_token_budget("llm_call_for_cv"), "llm_call_for_cv"), contract_value_instructions, hints=cv_resolution.hints)
+                    lines.append(build_batch_line(f"{idx}:cv", *cv_prompts, "gpt-4o", 0.5, structured_response_format(CONTRACT_VALUE_RESPONSE_SCHEMA)))
+                for n, question in enumerate(METADATA_EXTRACTION_PROMPTS):
+                    line = self._batch_question_line(f"{idx}:question:{n}", question, state["file_args"])
+                    if line:
+                        lines.append(line)
+            except Exception as e:
+                self._fail_backfill_file(state, e)
+        answers = run_batch(lines, backend, self.logger) if lines else {}
+
+        for idx, state in enumerate(states):
+            if state["failed"]:
+                continue
+            resolution = state["date_resolution"]
+            state["date_extraction"] = resolution.merge(self._parse_batch_answer(answers, f"{idx}:dates", "llm_call_for_dates") if resolution.pending else {})
+            jurisdiction_resolution = state["jurisdiction_resolution"]
+            if jurisdiction_resolution.resolved:
+                state["jurisdiction_extraction"] = jurisdiction_resolution.extraction()
+            else:
+                state["jurisdiction_extraction"] = self._parse_batch_answer(answers, f"{idx}:jurisdiction", "llm_call_for_jurisdiction") or {"Jurisdiction": "null"}
+            cv_resolution = state["contract_value_resolution"]
+            if cv_resolution.resolved:
+                state["contract_value_extraction"] = cv_resolution.extraction()
+            else:
+                state["contract_value_extraction"] = self._parse_batch_answer(answers, f"{idx}:cv", "llm_call_for_cv") or {"Contract Value": "null"}
+            state["results"] = [
+                self._parse_batch_answer(answers, f"{idx}:question:{n}", "call_llm") or []
+                for n in range(len(METADATA_EXTRACTION_PROMPTS))
+                if f"{idx}:question:{n}" in answers
+            ]
+
+        # Round 2: hybrid fallbacks for the fields left empty
+        lines = []
+        for idx, state in enumerate(states):
+            if state["failed"]:
+                continue
+            try:
+                null_questions = self._null_metadata_questions(state["date_extraction"], state["jurisdiction_extraction"], state["contract_value_extraction"])
+                state["fallback_ids"] = []
+                for n, question in enumerate(null_questions):
+                    line = self._batch_question_line(f"{idx}:fallback:{n}", question, state["file_args"])
+                    if line:
+                        lines.append(line)
+                        state["fallback_ids"].append(line["custom_id"])
+            except Exception as e:
+                self._fail_backfill_file(state, e)
+        answers = run_batch(lines, backend, self.logger) if lines else {}
+
+        for state in states:
+            if state["failed"]:
+                continue
+            hybrid_dates = [self._parse_batch_answer(answers, custom_id, "call_llm") or {} for custom_id in state["fallback_ids"]]
+            self._merge_hybrid_results(hybrid_dates, state["date_extraction"], state["jurisdiction_extraction"], state["contract_value_extraction"])
+            state["results"].extend([state["date_extraction"], state["jurisdiction_extraction"], state["contract_value_extraction"]])
+            state["expiry_date"] = self._find_expiry_date(state["results"])
+
+        # Round 3: the recurring payment question
+        lines = []
+        for idx, state in enumerate(states):
+            if state["failed"]:
+                continue
+            try:
+                payment_question = self._build_recurring_payment_prompt(current_date, state["expiry_date"])
+                line = self._batch_question_line(f"{idx}:payment", payment_question, state["file_args"])
+                if line:
+                    lines.append(line)
+            except Exception as e:
+                self._fail_backfill_file(state, e)
+        answers = run_batch(lines, backend, self.logger) if lines else {}
+
+        metadata_by_file = {}
+        for idx, state in enumerate(states):
+            if state["failed"]:
+                continue
+            file_id, file_name, file_type, user_id, org_id, retry_count = state["file_args"]
+            start_datetime = state["start_datetime"]
+            try:
+                response_for_recurring_payment = self._parse_batch_answer(answers, f"{idx}:payment", "call_llm") if f"{idx}:payment" in answers else []
+                self._apply_recurring_payment(response_for_recurring_payment, state["results"], state["expiry_date"], current_date, file_id, user_id, org_id)
+                set_llm_file_status(file_id, user_id, org_id, 3, True, retry_count, 1, "", start_datetime, "", False, False, self.in_queue, 50, self.logger)
+
+                metadata = self._build_metadata(state["results"])
+                set_llm_file_status(file_id, user_id, org_id, 3, True, retry_count, 1, "", start_datetime, "", False, False, self.in_queue, 75, self.logger)
+                set_meta_data(file_id, user_id, org_id, 3, start_datetime, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), 3, False, "", retry_count, metadata, self.in_queue, 100, self.logger)
+                self.metadata_vector_handler.process_contract_template(metadata, file_id, file_name, file_type, user_id, org_id, state["index"].chunk_count)
+                set_llm_file_status(file_id, user_id, org_id, 3, True, retry_count, 3, "", start_datetime, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), False, False, self.in_queue, 100, self.logger)
+                metadata_by_file[file_id] = metadata
+            except Exception as e:
+                self._fail_backfill_file(state, e)
+
+        self.logger.info(self._log_message(f"Backfill completed for {len(metadata_by_file)} of {len(states)} files.", "backfill_meta_data"))
+        return metadata_by_file
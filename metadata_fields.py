@@ -0,0 +1,147 @@
+import re
+from datetime import datetime
+from typing import Optional
+
+MODULE_NAME = "metadata_fields.py"
+
+DATE_FIELDS = ["Effective Date", "Termination Date", "Renewal Date", "Expiration Date", "Delivery Date", "Term Date"]
+
+# Value kind of every field the extraction prompts ask for
+FIELD_KINDS = {
+    **{field: "date" for field in DATE_FIELDS},
+    "Payment Due Date": "date",
+    "Jurisdiction": "text",
+    "Contract Value": "integer",
+    "Scope of Work": "text",
+    "Title of the Contract": "text",
+    "Risk Mitigation Score": "text",
+    "Parties Involved": "text",
+    "Contract Type": "text",
+    "Contract Duration": "text",
+    "Version Control": "text",
+    "flag": "boolean",
+}
+
+PAYMENT_DUE_DATE_QUESTION = "What is the payment due date?"
+
+DATE_VALUE_PATTERN = r"^(\d{4}-\d{2}-\d{2}|null)$"
+# The date extraction instructions allow unresolved relative dates, e.g. "calculated:effective_date+15_years"
+CALCULATED_DATE_VALUE_PATTERN = r"^(\d{4}-\d{2}-\d{2}|null|calculated:.+)$"
+
+# JSON schema of every field kind, in the subset accepted by strict structured outputs
+KIND_SCHEMAS = {
+    "date": {"type": "string", "pattern": DATE_VALUE_PATTERN},
+    "integer": {"anyOf": [{"type": "integer"}, {"type": "string", "enum": ["null"]}]},
+    "text": {"type": "string"},
+    "boolean": {"type": "boolean"},
+}
+
+_EXPECTED_OUTPUT_KEY = re.compile(r'\{\s*"([^"]+)"\s*:\s*""\s*\}')
+
+
+def unwrap_question(question: dict):
+    """
+    Returns (question text, instructions) of a metadata question. Hybrid queries are
+    wrapped as ``{"<Field>": {"<question>": "<instructions>"}}`` and are unwrapped first.
+    """
+    query, instructions = next(iter(question.items()))
+    if isinstance(instructions, dict):
+        query, instructions = next(iter(instructions.items()))
+    return query, instructions
+
+
+def question_field(question: dict) -> str:
+    """
+    Returns the output key a metadata question asks for, read from the
+    ``{"<Field>":""}`` expected output at the end of its instructions.
+    """
+    query, instructions = unwrap_question(question)
+    keys = _EXPECTED_OUTPUT_KEY.findall(instructions)
+    return keys[-1] if keys else query
+
+
+def is_null(value) -> bool:
+    return value is None or value == "null"
+
+
+def is_valid_field_value(field: str, value) -> bool:
+    """
+    Checks an extracted value against its field kind. "null" is a valid answer.
+    """
+    kind = FIELD_KINDS.get(field, "text")
+    if kind == "boolean":
+        return isinstance(value, bool)
+    if is_null(value):
+        return True
+    if kind == "date":
+        if not isinstance(value, str):
+            return False
+        try:
+            datetime.strptime(value, "%Y-%m-%d")
+            return True
+        except ValueError:
+            return False
+    if kind == "integer":
+        if isinstance(value, bool):
+            return False
+        if isinstance(value, (int, float)):
+            return True
+        return isinstance(value, str) and value.strip().isdigit()
+    # Free-text fields also take numeric answers, e.g. a risk score of 7
+    return isinstance(value, (str, int, float)) and not isinstance(value, bool)
+
+
+def field_schema(field: str) -> dict:
+    """
+    Returns the JSON schema of a single field value.
+    """
+    return dict(KIND_SCHEMAS[FIELD_KINDS.get(field, "text")])
+
+
+def response_schema(name: str, fields, overrides: dict = None) -> dict:
+    """
+    Returns a strict structured-output ``response_format`` for an object holding ``fields``.
+    ``overrides`` replaces the schema of individual fields.
+    """
+    overrides = overrides or {}
+    properties = {field: overrides.get(field) or field_schema(field) for field in fields}
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": re.sub(r"[^a-zA-Z0-9_-]", "_", name),
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": properties,
+                "required": list(properties),
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+def dates_response_schema(fields=DATE_FIELDS) -> dict:
+    """
+    Returns the ``response_format`` of the date extraction call asking for ``fields``.
+    """
+    return response_schema("dates", fields, {field: {"type": "string", "pattern": CALCULATED_DATE_VALUE_PATTERN} for field in fields})
+
+
+DATES_RESPONSE_SCHEMA = dates_response_schema()
+JURISDICTION_RESPONSE_SCHEMA = response_schema("jurisdiction", ["Jurisdiction"])
+CONTRACT_VALUE_RESPONSE_SCHEMA = response_schema("contract_value", ["Contract Value"])
+PAYMENT_RESPONSE_SCHEMA = response_schema("payment_due_date", ["flag", "Payment Due Date"])
+
+
+def question_response_schema(question: dict) -> Optional[dict]:
+    """
+    Returns the structured-output ``response_format`` for a metadata question, or None
+    when its output field is not declared.
+    """
+    query, _ = unwrap_question(question)
+    if query == PAYMENT_DUE_DATE_QUESTION:
+        return PAYMENT_RESPONSE_SCHEMA
+    field = question_field(question)
+    if field not in FIELD_KINDS:
+        return None
+    return response_schema(field, [field])
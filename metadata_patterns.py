@@ -0,0 +1,467 @@
+MODULE_NAME = "metadata_patterns.py"
+
+# Regex filters selecting the sentences sent to the dates, jurisdiction and contract value prompts
+
+date_pattern = r"""
+\b(
+    # === DOCUMENT-SPECIFIC DATE FIELD PATTERNS ===
+    
+    # Effective Date patterns
+    (?:effective\s+date\s*[:;]?\s*(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
+    (?:(?:this\s+agreement\s+(?:is|shall\s+be)\s+)?effective\s+(?:as\s+of|on|from)?[\s:]*.{0,50}?(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
+    
+    # Termination Date patterns
+    (?:termination\s+date\s*[:;]?\s*(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
+    (?:terminates\s+(?:on|at|after|before|by)[\s:]*.{0,50}?(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
+    
+    # Expiration Date patterns
+    (?:expiration\s+date\s*[:;]?\s*(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
+    (?:expires\s+(?:on|at|after|before|by)[\s:]*.{0,50}?(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
+    
+    # Term Date patterns
+    (?:term\s+date\s*[:;]?\s*(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
+    (?:term\s+(?:shall|will)\s+(?:begin|commence|start)\s+(?:on|at|from)[\s:]*.{0,50}?(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
+    
+    # Payment Due Date patterns
+    (?:payment\s+due\s+date\s*[:;]?\s*(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
+    (?:payment\s+(?:is|shall\s+be)\s+due\s+(?:on|by|before|after|within)[\s:]*.{0,50}?(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
+    
+    # Delivery Date patterns
+    (?:delivery\s+date\s*[:;]?\s*(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
+    (?:delivery\s+(?:shall|will)\s+(?:be|occur|take\s+place)\s+(?:on|by|before|after|within)[\s:]*.{0,50}?(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
+    
+    # Renewal Date patterns
+    (?:renewal\s+date\s*[:;]?\s*(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
+    (?:(?:agreement|contract)\s+(?:shall|will|may)\s+(?:renew|be\s+renewed)\s+(?:on|as\s+of|effective)[\s:]*.{0,50}?(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4}))|
+
+    # Section headings with dates
+    (?:^|\n|\r)[\s*]*(?:effective|term|termination|expiration|renewal|payment\s+due|delivery)\s+date[\s*:-]*\s*(?:\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}|\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}|(?:\d{1,2}(?:st|nd|rd|th)?[\s,]*)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[,\s]*\d{1,2}(?:st|nd|rd|th)?[,\s]*\d{2,4})|
+
+    # === GENERAL DATE PATTERNS ===
+    
+     # ISO 8601 with time components
+    \d{4}[-/]\d{1,2}[-/]\d{1,2}[T ]\d{1,2}:\d{2}(?::\d{2})?(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})? |
+    
+    # YYYY-MM-DD or YYYY/MM/DD or YYYY.MM.DD
+    \d{4}[-/\.]\d{1,2}[-/\.]\d{1,2} |
+    
+    # DD-MM-YYYY or DD/MM/YYYY or DD.MM.YYYY
+    \d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4} |
+    
+    # DD MM YYYY or YYYY MM DD (space separated)
+    \d{1,2}\s+\d{1,2}\s+\d{4} |
+    \d{4}\s+\d{1,2}\s+\d{1,2} |
+    
+    # Month DD, YYYY or DD Month YYYY
+    (?:\d{1,2}(?:st|nd|rd|th)?[ -/]?)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[ -/]?(?:\d{1,2}(?:st|nd|rd|th)?[,]?[ -/])?\d{2,4} |
+    
+    # Month YYYY or Month DD
+    (?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[ -/\.]\d{4} |
+    (?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[ -/\.]\d{1,2}(?:st|nd|rd|th)? |
+
+    # Day of week with date
+    (?:Mon(?:day)?|Tue(?:sday)?|Wed(?:nesday)?|Thu(?:rsday)?|Fri(?:day)?|Sat(?:urday)?|Sun(?:day)?)[,]?\s+(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2}(?:st|nd|rd|th)?[,]?\s+\d{4} |
+    
+    # Quarter notation
+    Q[1-4]\s+\d{4} |
+    \d{4}\s+Q[1-4] |
+    [1-4]Q\s+\d{4} |
+    \d{4}\s+[1-4]Q |
+    (?:First|Second|Third|Fourth|1st|2nd|3rd|4th)\s+quarter\s+\d{4} |
+    \d{4}\s+(?:First|Second|Third|Fourth|1st|2nd|3rd|4th)\s+quarter |
+    
+    # Week notation
+    Week\s+\d{1,2}\s+\d{4} |
+    \d{4}\s+Week\s+\d{1,2} |
+    W\d{1,2}\s+\d{4} |
+    \d{4}\s+W\d{1,2} |
+    W\d{1,2}-\d{4} |
+    
+    # Month/Year formats
+    \d{1,2}/\d{4} |
+    \d{1,2}-\d{4} |
+    
+    # Date ranges
+    \d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}\s+(?:to|through|thru|-)\s+\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2} |
+    \d{1,2}[-/\.]\d{1,2}[-/\.]\d{4}\s+(?:to|through|thru|-)\s+\d{1,2}[-/\.]\d{1,2}[-/\.]\d{4} |
+    (?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2}(?:st|nd|rd|th)?\s+-\s+(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2}(?:st|nd|rd|th)?[,]?\s+\d{4} |
+    
+    # Fiscal year notation
+    FY\s*\d{2,4} |
+    Fiscal\s+Year\s+\d{4} |
+    Fiscal\s+\d{4} |
+    
+    # Chinese/Japanese year format (e.g., 令和5年10月1日)
+    [令和|平成|昭和|大正|明治]\d{1,2}年\d{1,2}月\d{1,2}日 |
+    
+    # Timestamps with dates
+    \d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}\s+\d{1,2}:\d{2}(?::\d{2})?\s*(?:AM|PM|am|pm)? |
+    \d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}\s+\d{1,2}:\d{2}(?::\d{2})?\s*(?:AM|PM|am|pm)? |
+    
+    # Unix timestamp (10-13 digits)
+    \b\d{10,13}\b |
+    
+    # RFC 2822 format
+    (?:Mon|Tue|Wed|Thu|Fri|Sat|Sun),\s+\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}\s+\d{2}:\d{2}(?::\d{2})?\s+(?:[+-]\d{4}|UTC|GMT|[A-Z]{3}) |
+    
+    # French date format (e.g., 1er janvier 2023)
+    \d{1,2}(?:er|ème|e|ère)?\s+(?:janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)\s+\d{4} |
+    
+    # Spanish date format
+    \d{1,2}\s+de\s+(?:enero|febrero|marzo|abril|mayo|junio|julio|agosto|septiembre|octubre|noviembre|diciembre)(?:\s+de)?\s+\d{4} |
+    
+    # German date format
+    \d{1,2}\.\s+(?:Januar|Februar|März|April|Mai|Juni|Juli|August|September|Oktober|November|Dezember)\s+\d{4} |
+    
+    # Year-specific patterns
+    
+    # Year preceded by words
+    (?:year|in|during|of|for|by|before|after|since|until|around|circa|ca\.?|c\.?)\s+\d{4} |
+    
+    # Years with era designations
+    \d{1,4}\s*(?:AD|BC|BCE|CE|B\.C\.(?:E\.)?|C\.E\.|A\.D\.) |
+    (?:AD|BC|BCE|CE|B\.C\.(?:E\.)?|C\.E\.|A\.D\.)\s*\d{1,4} |
+    
+    # Decade references
+    \d{3}0s |
+    \d{4}s |
+    \d{4}-\d{2} |
+    \d{2}s |
+    (?:the\s+)?(?:twenty|nineteen|eighteen|seventeen|sixteen|fifteen|fourteen|thirteen|twelve|twenty-first|twentieth|nineteenth|eighteenth|seventeenth|sixteenth|fifteenth|fourteenth|thirteenth|twelfth)\s+(?:century|hundreds) |
+    (?:the\s+)?(?:twenties|thirties|forties|fifties|sixties|seventies|eighties|nineties) |
+    
+    # Year ranges
+    \d{4}\s*(?:-|to|through|until|and|&|–|—)\s*\d{4} |
+    \d{4}\s*(?:-|to|through|until|and|&|–|—)\s*\d{2} |
+    
+    # Academic/school years
+    (?:academic\s+year\s+)?\d{4}[-/]\d{2,4} |
+    (?:academic\s+year\s+)?\d{4}[-/]\d{2} |
+    (?:AY|SY)\s*\d{4}[-/]\d{2,4} |
+    
+    # Centuries
+    (?:(?:\d{1,2}(?:st|nd|rd|th)?|(?:twenty|nineteen|eighteen|seventeen|sixteen|fifteen|fourteen|thirteen|twelve|twenty-first|twentieth|nineteenth|eighteenth|seventeenth|sixteenth|fifteenth|fourteenth|thirteenth|twelfth))\s+century) |
+    
+    # Year only (must be a complete 4-digit number)
+    \b\d{4}\b |
+    
+    # ----- NEW PATTERNS BELOW -----
+    
+    # Relative time expressions
+    (?:(?:last|next|previous|coming|this)\s+(?:week|month|year|decade|century|spring|summer|fall|autumn|winter)) |
+    (?:(?:\d{1,3}|a|an|one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|twenty|thirty|forty|fifty|sixty|seventy|eighty|ninety|hundred|thousand|few|several|many|couple)\s+(?:second|minute|hour|day|week|fortnight|month|quarter|year|decade|century)s?\s+(?:ago|from\s+now|hence|later|earlier|before|after)) |
+    
+    # Specific day references
+    (?:today|yesterday|tomorrow|day\s+before\s+yesterday|day\s+after\s+tomorrow) |
+    
+    # Days of week references
+    (?:on\s+)?(?:Mon(?:day)?|Tue(?:sday)?|Wed(?:nesday)?|Thu(?:rsday)?|Fri(?:day)?|Sat(?:urday)?|Sun(?:day)?)(?:\s+(?:morning|afternoon|evening|night))? |
+    
+    # Month/season + year patterns
+    (?:(?:early|mid|late|beginning\s+of|end\s+of)\s+)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+(?:of\s+)?\d{4} |
+    
+    # Season + year patterns
+    (?:(?:early|mid|late|beginning\s+of|end\s+of)\s+)?(?:Spring|Summer|Fall|Autumn|Winter)\s+(?:of\s+)?\d{4} |
+    \d{4}\s+(?:Spring|Summer|Fall|Autumn|Winter) |
+    
+    # Holiday references with year
+    (?:Christmas|Easter|Thanksgiving|Halloween|New\s+Year(?:'s)?|Valentine's\s+Day|St\.\s+Patrick's\s+Day|Independence\s+Day|Labor\s+Day|Memorial\s+Day|Veterans\s+Day|MLK\s+Day|Martin\s+Luther\s+King\s+Day|Presidents'\s+Day|Columbus\s+Day|Hanukkah|Passover|Rosh\s+Hashanah|Yom\s+Kippur|Diwali|Eid(?:\s+al-Fitr|\s+al-Adha)?|Ramadan|Chinese\s+New\s+Year|Lunar\s+New\s+Year)\s+(?:of\s+)?\d{4} |
+    \d{4}\s+(?:Christmas|Easter|Thanksgiving|Halloween|New\s+Year(?:'s)?|Valentine's\s+Day|St\.\s+Patrick's\s+Day|Independence\s+Day|Labor\s+Day|Memorial\s+Day|Veterans\s+Day|MLK\s+Day|Martin\s+Luther\s+King\s+Day|Presidents'\s+Day|Columbus\s+Day|Hanukkah|Passover|Rosh\s+Hashanah|Yom\s+Kippur|Diwali|Eid(?:\s+al-Fitr|\s+al-Adha)?|Ramadan|Chinese\s+New\s+Year|Lunar\s+New\s+Year) |
+    
+    # Duration expressions
+    (?:for|during|over|within|in|throughout|across|spanning)\s+(?:\d{1,3}|a|an|one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|twenty|thirty|forty|fifty|sixty|seventy|eighty|ninety|hundred|thousand|few|several|many|couple)\s+(?:second|minute|hour|day|week|month|year|decade|century)s? |
+    
+    # Time periods like "first half of 2023"
+    (?:first|second|third|fourth|1st|2nd|3rd|4th|H1|H2|initial|early|mid|middle|late|latter|final)\s+(?:half|part|portion|quarter)\s+of\s+(?:\d{4}|the\s+year) |
+    (?:Q[1-4]|[1-4]Q)\s+of\s+\d{4} |
+    
+    # Date and day ordinals
+    (?:(?:the\s+)?\d{1,2}(?:st|nd|rd|th)\s+(?:of\s+)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)) |
+    
+    # Approximate dates
+    (?:circa|ca\.|c\.|around|approximately|about|roughly|in\s+or\s+around|somewhere\s+around)\s+\d{4} |
+    
+    # Frequency expressions
+    (?:(?:every|each)\s+(?:other\s+)?(?:second|minute|hour|day|week|month|quarter|year|decade|century|Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday|Mon|Tue|Wed|Thu|Fri|Sat|Sun|January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|Jun|Jul|Aug|Sep|Oct|Nov|Dec)) |
+    (?:daily|weekly|monthly|quarterly|yearly|annually|bi-weekly|bi-monthly|bi-annually|semi-annually|fortnightly) |
+    
+    # Time periods with prepositions
+    (?:from|since|between|after|before|prior\s+to|following|as\s+of|as\s+at|starting|ending|beginning|until|till|up\s+to)\s+(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+(?:\d{1,2}(?:st|nd|rd|th)?\s+)?(?:\d{4})? |
+    
+    # Age references
+    (?:aged|age)\s+\d{1,3} |45 j
+    \d{1,3}\s+(?:years|months|weeks|days)\s+old |
+    
+    # Century parts
+    (?:early|mid|late|beginning\s+of|end\s+of)\s+(?:the\s+)?\d{1,2}(?:st|nd|rd|th)\s+century |
+    (?:early|mid|late|beginning\s+of|end\s+of)\s+(?:the\s+)?(?:twentieth|nineteenth|eighteenth|seventeenth|sixteenth|fifteenth|fourteenth|thirteenth|twelfth|twenty-first)\s+century |
+    
+    # Time spans with "from...to" format
+    from\s+\d{4}\s+to\s+\d{4} |
+    from\s+(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+(?:\d{1,2})?\s+to\s+(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+(?:\d{1,2})?\s+\d{4} |
+    
+    # Recurring dates
+    (?:every|each)\s+(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday|Mon|Tue|Wed|Thu|Fri|Sat|Sun|January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2}(?:st|nd|rd|th)? |
+    
+    # X days/weeks/months/years ago/from now
+    \d{1,3}\s+(?:second|minute|hour|day|week|month|year|decade)s?\s+(?:ago|from\s+now|later|before|after|hence) |
+    
+    # Morning/afternoon/evening references
+    (?:this|tomorrow|yesterday|next|last|previous|coming)\s+(?:morning|afternoon|evening|night) |
+    
+    # Weekend references
+    (?:this|next|last|previous|coming)\s+weekend |
+    
+    # Named periods
+    (?:the\s+)?(?:Great\s+Depression|Renaissance|Medieval\s+period|Middle\s+Ages|Stone\s+Age|Bronze\s+Age|Iron\s+Age|Industrial\s+Revolution|Digital\s+Age|Information\s+Age|Cold\s+War|World\s+War\s+(?:I|II|One|Two|1|2)|Victorian\s+Era|Georgian\s+Era|Edwardian\s+Era|Elizabethan\s+Era|Tudor\s+period|Roman\s+Empire|Byzantine\s+Empire|Ming\s+Dynasty|Qing\s+Dynasty|Han\s+Dynasty|Ottoman\s+Empire|Paleolithic|Mesolithic|Neolithic|post-war\s+era) |
+    
+    # Specific time period references
+    (?:the\s+)?(?:Stone|Bronze|Iron|Dark|Middle|Golden|Modern|Post-modern|Contemporary|Colonial|Post-colonial|Post-war|Pre-war|Antebellum|Post-apocalyptic)\s+(?:Age|Era|Period) |
+    
+    # Business quarters and fiscal periods
+    (?:Q[1-4]|[1-4]Q|first\s+quarter|second\s+quarter|third\s+quarter|fourth\s+quarter|H1|H2|first\s+half|second\s+half)\s+(?:FY)?\s*\d{2,4} |
+    
+    # Anniversary references
+    \d{1,3}(?:st|nd|rd|th)?\s+anniversary |
+    
+    # Vague time references
+    (?:a\s+(?:short|long)\s+(?:time|while)\s+(?:ago|from\s+now)|some\s+time\s+(?:ago|from\s+now)|in\s+recent\s+(?:days|weeks|months|years)|in\s+the\s+(?:near|distant)\s+(?:future|past))
+)\b
+"""
+# date_pattern = r"""
+# \b
+# (
+#     # YYYY-MM-DD or YYYY/MM/DD
+#     \d{4}[-/]\d{1,2}[-/]\d{1,2} |
+    
+#     # DD-MM-YYYY or DD/MM/YYYY
+#     \d{1,2}[-/]\d{1,2}[-/]\d{2,4} |
+    
+#     # Month DD, YYYY or DD Month YYYY
+#     (?:\d{1,2}(?:st|nd|rd|th)?[ -/]?)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[ -/]?(?:\d{1,2}(?:st|nd|rd|th)?[,]?[ -/])?\d{2,4} |
+    
+#     # Month YYYY or Month DD
+#     (?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[ -/]\d{4} |
+#     (?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[ -/]\d{1,2} |
+
+#     # Year only
+#     \b\d{4}\b
+# )
+# \b
+# """
+jurisdiction_regex = r"""
+Comprehensive regex pattern for identifying jurisdiction and governing law clauses in legal documents.
+
+This pattern captures various forms of jurisdiction references including:
+- Governing law clauses
+- Jurisdiction and venue clauses
+- Conflict of laws provisions
+- Forum selection clauses
+- Arbitration seat designations
+- Court references
+- Legal proceeding locations
+- Applicable law statements
+
+Usage:
+    import re
+    jurisdiction_pattern = re.compile(jurisdiction_regex, re.VERBOSE | re.IGNORECASE)
+    matches = jurisdiction_pattern.findall(document_text)
+"""
+
+jurisdiction_regex = r"""
+Comprehensive regex pattern for identifying jurisdiction and governing law clauses in legal documents.
+
+This pattern captures:
+- Governing law clauses
+- Jurisdiction and venue clauses
+- Conflict of laws provisions
+- Forum selection clauses
+- Arbitration seat designations
+- Specific countries, states, provinces, and territories worldwide
+- Court references
+- Legal proceeding locations
+- Applicable law statements
+
+Last updated: 2025-05-05
+Author: sanket2992 (with assistance)
+"""
+
+jurisdiction_regex = r"""(?xi)\b(
+    # Governing law clauses
+    governed\s+by\s+the\s+laws?\s+of |
+    governing\s+law(?:\s+shall\s+be)?(?:\s+of)? |
+    shall\s+be\s+governed\s+by(?:\s+the\s+laws?\s+of)? |
+    construed\s+(?:and\s+enforced\s+)?(?:in\s+accordance\s+)?with\s+the\s+laws?\s+of |
+    interpreted\s+(?:in\s+accordance\s+)?(?:with|under)\s+the\s+laws?\s+of |
+    enforced\s+(?:in\s+accordance\s+)?with\s+the\s+laws?\s+of |
+    applicable\s+laws?\s+(?:shall\s+be\s+that|are\s+those)\s+of |
+    laws?\s+applicable\s+(?:to|in) |
+
+    # Subject‐to/jurisdiction clauses
+    subject\s+to\s+(?:the\s+)?jurisdiction\s+of |
+    (?:exclusive|non[-\s]?exclusive|sole)\s+jurisdiction\s+of |
+    (?:proper|applicable)\s+venue(?:\s+shall\s+be\s+in)? |
+    venue\s+shall\s+be\s+in |
+    jurisdiction\s+and\s+venue\s+(?:shall|will)\s+(?:be|lie|exist|vest)\s+(?:exclusively\s+)?in |
+    courts?\s+of\s+competent\s+jurisdiction\s+(?:in|of|located\s+in) |
+    competent\s+jurisdiction\s+(?:in|of|located\s+in) |
+
+    # Legal/forum clauses
+    (?:legal|judicial)\s+forum(?:\s+of)? |
+    forum\s+for\s+(?:any|all)\s+disputes? |
+    forum\s+(?:selection|clause) |
+    disputes?\s+(?:shall|will|may)\s+be\s+(?:resolved|determined|heard|litigated|adjudicated|decided|settled)\s+
+        (?:in\s+accordance\s+with\s+)?(?:the\s+)?laws?\s+of |
+    choice\s+of\s+law |
+    conflict\s+of\s+laws? |
+    without\s+(?:regard\s+to|giving\s+effect\s+to)\s+(?:its\s+)?conflict\s+of\s+laws?\s+(?:principles|provisions|rules) |
+    irrespective\s+of\s+conflict\s+of\s+laws |
+    excluding\s+(?:the\s+application\s+of\s+)?(?:any\s+)?conflict\s+of\s+laws?\s+(?:principles|provisions|rules) |
+
+    # Submission clauses
+    (?:submitted|subject)\s+to\s+(?:the\s+)?(?:courts?|jurisdiction|tribunals?)(?:\s+of)? |
+    submits?\s+(?:themselves|itself|himself|herself)\s+to\s+the\s+jurisdiction\s+of |
+    consents?\s+to\s+the\s+jurisdiction\s+of |
+    
+    # Legal proceedings clauses
+    (?:any|all)\s+(?:legal\s+)?proceedings?\s+(?:shall|must|will|may)\s+be\s+brought\s+(?:exclusively\s+)?in |
+    (?:any|all)\s+(?:actions?|suits?|claims?|proceedings?)\s+(?:arising|resulting)\s+
+        (?:out\s+of|from|under|in\s+connection\s+with)\s+this |
+    (?:any|all)\s+disputes?\s+(?:arising|resulting)\s+
+        (?:out\s+of|from|under|in\s+connection\s+with)\s+this |
+    (?:any|all)\s+(?:legal\s+)?(?:actions?|proceedings?)\s+to\s+enforce |
+    
+    # Seat/place of arbitration/jurisdiction
+    place\s+of\s+(?:arbitration|jurisdiction|performance) |
+    seat\s+of\s+(?:arbitration|jurisdiction) |
+    arbitration\s+(?:shall|will)\s+be\s+conducted\s+in |
+    arbitration\s+proceedings\s+shall\s+take\s+place\s+in |
+    arbitration\s+venue\s+shall\s+be |
+    
+    # Court types and specific references
+    (?:federal|state|district|circuit|supreme|high|appellate|superior|county|provincial|municipal)\s+courts?\s+
+        (?:sitting|located)\s+in |
+    courts?\s+of\s+the\s+(?:state|province|district|county|city|country|nation)\s+of |
+    
+    # Country-specific jurisdictional terms
+    (?:chancery|common\s+law|crown|administrative|commercial|civil|criminal|family|probate|labor|tax|bankruptcy)\s+
+        courts?\s+of |
+    
+    # "Courts of X" or "laws of X" with multi‐word or acronym regions
+    (?:courts?|laws?|tribunals?)\s+of\s+
+        (?:[A-Z][a-zA-Z\-'.]*(?:\s+(?:and|&|or)\s+[A-Z][a-zA-Z\-'.]*)*
+            (?:\s+(?:County|State|Province|Country|Nation|Republic|Kingdom|Government|Commonwealth|Federation|Union|Emirate|Territory))?|
+        (?:USA|US|U\.S\.|U\.S\.A\.|UK|U\.K\.|UAE|U\.A\.E\.|EU|E\.U\.|PRC|P\.R\.C\.|ROK|R\.O\.K\.|APAC|EMEA|LATAM))
+    |
+    
+    # Specific country and region references
+    # Major countries and regions
+    (?:in|of|under\s+the\s+laws?\s+of|subject\s+to\s+the\s+jurisdiction\s+of)\s+
+    (?:
+        # Countries (major ones and common legal jurisdictions)
+        Afghanistan|Albania|Algeria|Andorra|Angola|Antigua\s+and\s+Barbuda|Argentina|Armenia|Australia|Austria|
+        Azerbaijan|Bahamas|Bahrain|Bangladesh|Barbados|Belarus|Belgium|Belize|Benin|Bhutan|Bolivia|
+        Bosnia\s+and\s+Herzegovina|Botswana|Brazil|Brunei|Bulgaria|Burkina\s+Faso|Burundi|Cabo\s+Verde|Cambodia|
+        Cameroon|Canada|Central\s+African\s+Republic|Chad|Chile|China|Colombia|Comoros|Congo|Costa\s+Rica|
+        Croatia|Cuba|Cyprus|Czech\s+Republic|Denmark|Djibouti|Dominica|Dominican\s+Republic|
+        East\s+Timor|Ecuador|Egypt|El\s+Salvador|Equatorial\s+Guinea|Eritrea|Estonia|Eswatini|Ethiopia|
+        Fiji|Finland|France|Gabon|Gambia|Georgia|Germany|Ghana|Greece|Grenada|Guatemala|Guinea|Guinea-Bissau|
+        Guyana|Haiti|Honduras|Hungary|Iceland|India|Indonesia|Iran|Iraq|Ireland|Israel|Italy|
+        Jamaica|Japan|Jordan|Kazakhstan|Kenya|Kiribati|Korea|Kosovo|Kuwait|Kyrgyzstan|Laos|Latvia|
+        Lebanon|Lesotho|Liberia|Libya|Liechtenstein|Lithuania|Luxembourg|Madagascar|Malawi|Malaysia|
+        Maldives|Mali|Malta|Marshall\s+Islands|Mauritania|Mauritius|Mexico|Micronesia|Moldova|Monaco|
+        Mongolia|Montenegro|Morocco|Mozambique|Myanmar|Namibia|Nauru|Nepal|Netherlands|New\s+Zealand|
+        Nicaragua|Niger|Nigeria|North\s+Korea|North\s+Macedonia|Norway|Oman|Pakistan|Palau|Palestine|
+        Panama|Papua\s+New\s+Guinea|Paraguay|Peru|Philippines|Poland|Portugal|Qatar|Romania|Russia|
+        Rwanda|Saint\s+Kitts\s+and\s+Nevis|Saint\s+Lucia|Saint\s+Vincent\s+and\s+the\s+Grenadines|Samoa|
+        San\s+Marino|Sao\s+Tome\s+and\s+Principe|Saudi\s+Arabia|Senegal|Serbia|Seychelles|Sierra\s+Leone|
+        Singapore|Slovakia|Slovenia|Solomon\s+Islands|Somalia|South\s+Africa|South\s+Korea|South\s+Sudan|
+        Spain|Sri\s+Lanka|Sudan|Suriname|Sweden|Switzerland|Syria|Taiwan|Tajikistan|Tanzania|Thailand|
+        Togo|Tonga|Trinidad\s+and\s+Tobago|Tunisia|Turkey|Turkmenistan|Tuvalu|Uganda|Ukraine|
+        United\s+Arab\s+Emirates|United\s+Kingdom|United\s+States(?:\s+of\s+America)?|Uruguay|Uzbekistan|
+        Vanuatu|Vatican\s+City|Venezuela|Vietnam|Yemen|Zambia|Zimbabwe|
+        Hong\s+Kong|Macau|Puerto\s+Rico|Scotland|Northern\s+Ireland|Wales|England|
+        
+        # US States
+        Alabama|Alaska|Arizona|Arkansas|California|Colorado|Connecticut|Delaware|Florida|Georgia|
+        Hawaii|Idaho|Illinois|Indiana|Iowa|Kansas|Kentucky|Louisiana|Maine|Maryland|
+        Massachusetts|Michigan|Minnesota|Mississippi|Missouri|Montana|Nebraska|Nevada|
+        New\s+Hampshire|New\s+Jersey|New\s+Mexico|New\s+York|North\s+Carolina|North\s+Dakota|
+        Ohio|Oklahoma|Oregon|Pennsylvania|Rhode\s+Island|South\s+Carolina|South\s+Dakota|
+        Tennessee|Texas|Utah|Vermont|Virginia|Washington|West\s+Virginia|Wisconsin|Wyoming|
+        District\s+of\s+Columbia|D\.C\.|Washington\s+D\.C\.|
+        
+        # Canadian Provinces/Territories
+        Alberta|British\s+Columbia|Manitoba|New\s+Brunswick|Newfoundland\s+and\s+Labrador|
+        Northwest\s+Territories|Nova\s+Scotia|Nunavut|Ontario|Prince\s+Edward\s+Island|Quebec|
+        Saskatchewan|Yukon|
+        
+        # Australian States/Territories
+        New\s+South\s+Wales|Queensland|South\s+Australia|Tasmania|Victoria|Western\s+Australia|
+        Australian\s+Capital\s+Territory|Northern\s+Territory|
+        
+        # Indian States/Territories
+        Andhra\s+Pradesh|Arunachal\s+Pradesh|Assam|Bihar|Chhattisgarh|Goa|Gujarat|Haryana|
+        Himachal\s+Pradesh|Jharkhand|Karnataka|Kerala|Madhya\s+Pradesh|Maharashtra|Manipur|
+        Meghalaya|Mizoram|Nagaland|Odisha|Punjab|Rajasthan|Sikkim|Tamil\s+Nadu|Telangana|
+        Tripura|Uttar\s+Pradesh|Uttarakhand|West\s+Bengal|Andaman\s+and\s+Nicobar\s+Islands|
+        Chandigarh|Dadra\s+and\s+Nagar\s+Haveli\s+and\s+Daman\s+and\s+Diu|Delhi|Jammu\s+and\s+Kashmir|
+        Ladakh|Lakshadweep|Puducherry|
+        
+        # UK Countries/Regions
+        England|Scotland|Wales|Northern\s+Ireland|
+        
+        # Chinese Provinces/Regions
+        Anhui|Beijing|Chongqing|Fujian|Gansu|Guangdong|Guangxi|Guizhou|Hainan|Hebei|
+        Heilongjiang|Henan|Hubei|Hunan|Inner\s+Mongolia|Jiangsu|Jiangxi|Jilin|Liaoning|
+        Ningxia|Qinghai|Shaanxi|Shandong|Shanghai|Shanxi|Sichuan|Tianjin|Tibet|Xinjiang|
+        Yunnan|Zhejiang|
+        
+        # Brazilian States
+        Acre|Alagoas|Amapá|Amazonas|Bahia|Ceará|Espírito\s+Santo|Goiás|Maranhão|
+        Mato\s+Grosso|Mato\s+Grosso\s+do\s+Sul|Minas\s+Gerais|Pará|Paraíba|Paraná|
+        Pernambuco|Piauí|Rio\s+de\s+Janeiro|Rio\s+Grande\s+do\s+Norte|Rio\s+Grande\s+do\s+Sul|
+        Rondônia|Roraima|Santa\s+Catarina|São\s+Paulo|Sergipe|Tocantins|
+        
+        # Mexican States
+        Aguascalientes|Baja\s+California|Baja\s+California\s+Sur|Campeche|Chiapas|
+        Chihuahua|Coahuila|Colima|Durango|Guanajuato|Guerrero|Hidalgo|Jalisco|
+        México|Mexico\s+City|Michoacán|Morelos|Nayarit|Nuevo\s+León|Oaxaca|Puebla|
+        Querétaro|Quintana\s+Roo|San\s+Luis\s+Potosí|Sinaloa|Sonora|Tabasco|
+        Tamaulipas|Tlaxcala|Veracruz|Yucatán|Zacatecas|
+        
+        # German States
+        Baden-Württemberg|Bavaria|Berlin|Brandenburg|Bremen|Hamburg|Hesse|
+        Lower\s+Saxony|Mecklenburg-Vorpommern|North\s+Rhine-Westphalia|Rhineland-Palatinate|
+        Saarland|Saxony|Saxony-Anhalt|Schleswig-Holstein|Thuringia|
+        
+        # Russian Regions (Federal Subjects)
+        Moscow|Saint\s+Petersburg|Adygea|Altai|Bashkortostan|Buryatia|Chechnya|
+        Chuvashia|Dagestan|Ingushetia|Kabardino-Balkaria|Kalmykia|Karachay-Cherkessia|
+        Karelia|Khakassia|Komi|Mari\s+El|Mordovia|North\s+Ossetia-Alania|Tatarstan|
+        Tuva|Udmurtia|Sakha|Yakutia
+    )
+)\b"""
+
+contract_value_regex = r"""
+(  # Removed the enclosing \b(...)\b
+    # Symbol-Based Currency Amounts
+    (?:[\$\€\£\¥\₹]|AED|USD|INR|GBP|EUR|CNY|RMB|JPY|SAR)\s?
+    (?:
+        \d{1,3}(?:,\d{3})*(?:\.\d+)? |
+        \d+(?:\.\d+)?\s*(?:million|billion|crore|lakh|thousand)?
+    )
+|
+    # Name-Based Currency Amounts
+    (?:
+        (?:(?:[Oo]ne|[Tt]wo|[Tt]hree|[Ff]our|[Ff]ive|[Ss]ix|[Ss]even|[Ee]ight|[Nn]ine|[Tt]en|
+        [Ee]leven|[Tt]welve|[Tt]hirteen|[Ff]ourteen|[Ff]ifteen|[Ss]ixteen|[Ss]eventeen|
+        [Ee]ighteen|[Nn]ineteen|[Tt]wenty|[Tt]hirty|[Ff]orty|[Ff]ifty|[Ss]ixty|[Ss]eventy|
+        [Ee]ighty|[Nn]inety|[Oo]ne\s+hundred|[Oo]ne\s+thousand|
+        [Oo]ne\s+million|[Oo]ne\s+billion|[Oo]ne\s+crore|[Oo]ne\s+lakh)(\s+and\s+)?)*
+        (?:[Mm]illion|[Bb]illion|[Tt]housand|[Cc]rore|[Ll]akh)?
+    )
+    \s+
+    (?:dollars?|pounds?|euros?|rupees?|dirhams?|yuan|yen)
+)
+"""
@@ -0,0 +1,121 @@
+import math
+import threading
+from collections import defaultdict
+from typing import Optional
+from config.config import config
+from services.insights.llm_metrics import metrics
+from services.insights.metadata_fields import is_null, is_valid_field_value, question_field
+
+MODULE_NAME = "model_router.py"
+
+MODEL_ROUTING_ENABLED = getattr(config, "MODEL_ROUTING_ENABLED", True)
+# Model that answers every field without a first-tier entry and every escalation
+ESCALATION_MODEL = getattr(config, "MODEL_ROUTING_ESCALATION_MODEL", "gpt-4o")
+# Fields simple enough to try on the small model first. The date fields are left out: a
+# date question only reaches call_llm in the hybrid fallback, once the gpt-4o date call
+# has returned null, where a first try on the small model adds a call.
+DEFAULT_MODEL_ROUTING = {
+    "Title of the Contract": "gpt-4o-mini",
+    "Version Control": "gpt-4o-mini",
+    "Parties Involved": "gpt-4o-mini",
+}
+MODEL_ROUTING_TABLE = {**DEFAULT_MODEL_ROUTING, **getattr(config, "MODEL_ROUTING_TABLE", {})}
+# First-tier answers below this confidence (geometric mean token probability) are escalated
+MODEL_ROUTING_MIN_CONFIDENCE = getattr(config, "MODEL_ROUTING_MIN_CONFIDENCE", 0.6)
+
+
+def route_model(field: str) -> str:
+    """
+    Returns the first-tier model of a field.
+    """
+    if not MODEL_ROUTING_ENABLED:
+        return ESCALATION_MODEL
+    return MODEL_ROUTING_TABLE.get(field, ESCALATION_MODEL)
+
+
+def route_questions(questions) -> dict:
+    """
+    Groups metadata questions by the first-tier model of their field, keeping their order.
+    """
+    routes = {}
+    for question in questions:
+        routes.setdefault(route_model(question_field(question)), []).append(question)
+    return routes
+
+
+def answer_confidence(response) -> Optional[float]:
+    """
+    Returns the geometric mean token probability of a completion, or None without logprobs.
+    """
+    logprobs = getattr(response.choices[0], "logprobs", None)
+    tokens = getattr(logprobs, "content", None)
+    if not tokens:
+        return None
+    return math.exp(sum(token.logprob for token in tokens) / len(tokens))
+
+
+def is_low_confidence(confidence: Optional[float]) -> bool:
+    return confidence is not None and confidence < MODEL_ROUTING_MIN_CONFIDENCE
+
+
+def escalation_reason(field: str, value, confidence: Optional[float]) -> Optional[str]:
+    """
+    Returns why a first-tier answer must be escalated, or None when it can be kept.
+    """
+    if is_null(value):
+        return "null"
+    if not is_valid_field_value(field, value):
+        return "invalid"
+    if is_low_confidence(confidence):
+        return "low_confidence"
+    return None
+
+
+class RoutingLedger:
+    """
+    Per-file record of model routing: calls, fields and cost per model, and escalations.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._files = defaultdict(self._new_summary)
+
+    @staticmethod
+    def _new_summary():
+        return {"calls": defaultdict(int), "cost_usd": defaultdict(float), "first_tier_fields": 0, "escalated_fields": 0}
+
+    def record_call(self, file_id, model_name: str, cost: float):
+        metrics.increment("model_router.calls", model=model_name)
+        metrics.increment("model_router.cost_usd", cost, model=model_name)
+        with self._lock:
+            summary = self._files[file_id]
+            summary["calls"][model_name] += 1
+            summary["cost_usd"][model_name] += cost
+
+    def record_first_tier(self, file_id, field: str, reason: Optional[str]):
+        metrics.increment("model_router.first_tier_fields", field=field)
+        if reason:
+            metrics.increment("model_router.escalations", field=field, reason=reason)
+        with self._lock:
+            summary = self._files[file_id]
+            summary["first_tier_fields"] += 1
+            summary["escalated_fields"] += 1 if reason else 0
+
+    def pop_summary(self, file_id) -> dict:
+        """
+        Returns and forgets the routing summary of a file.
+        """
+        with self._lock:
+            summary = self._files.pop(file_id, None) or self._new_summary()
+        first_tier_fields = summary["first_tier_fields"]
+        return {
+            "calls": dict(summary["calls"]),
+            "cost_usd": {model_name: round(cost, 6) for model_name, cost in summary["cost_usd"].items()},
+            "first_tier_fields": first_tier_fields,
+            "escalated_fields": summary["escalated_fields"],
+            "escalation_rate": round(summary["escalated_fields"] / first_tier_fields, 4) if first_tier_fields else 0.0,
+        }
+
+
+routing_ledger = RoutingLedger()
+
@@ -0,0 +1,143 @@
+import inspect
+import json
+import os
+import tempfile
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+from config.config import config
+from services.insights.llm_call import client
+from services.insights.llm_metrics import metrics
+from services.insights.llm_retry import run_with_retry
+from utils.logger import _log_message
+
+MODULE_NAME = "query_embedding_cache.py"
+
+# The embedding model of the chunk index; unset, questions are embedded by the retriever per call
+QUERY_EMBEDDING_MODEL = getattr(config, "QUERY_EMBEDDING_MODEL", None)
+# The argument through which the hybrid retriever takes a precomputed dense query vector
+QUERY_VECTOR_ARGUMENT = getattr(config, "QUERY_VECTOR_ARGUMENT", "dense_vector")
+# Prebuilt embeddings of the metadata questions, written when new questions are embedded
+QUERY_EMBEDDING_CACHE_PATH = getattr(config, "QUERY_EMBEDDING_CACHE_PATH", os.path.join(tempfile.gettempdir(), "query_embeddings.json"))
+QUERY_EMBEDDING_BATCH_SIZE = getattr(config, "QUERY_EMBEDDING_BATCH_SIZE", 256)
+
+
+class QueryEmbeddingCache:
+    """
+    Embeddings of question texts keyed by (model, text). warm() embeds the questions
+    missing from the cache in batches and writes them back to the artifact at ``path``,
+    so later processes start warm. Lookups never call the embedding API.
+    """
+
+    def __init__(self, model: str, path: Optional[str] = QUERY_EMBEDDING_CACHE_PATH):
+        self.model = model
+        self.path = path
+        self._lock = threading.Lock()
+        self._embeddings: Dict[tuple, List[float]] = {}
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                artifact = json.load(handle)
+        except (OSError, ValueError):
+            return
+        for model, embeddings in artifact.items():
+            for text, embedding in embeddings.items():
+                self._embeddings[(model, text)] = embedding
+
+    def _save(self):
+        if not self.path:
+            return
+        artifact = {}
+        for (model, text), embedding in self._embeddings.items():
+            artifact.setdefault(model, {})[text] = embedding
+        # Written aside and renamed, processes warming at once never read a partial file
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(artifact, handle)
+        os.replace(tmp_path, self.path)
+
+    def _embed_batch(self, texts: List[str], logger) -> Optional[List[List[float]]]:
+        def attempt(feedback):
+            response = client.embeddings.create(model=self.model, input=texts)
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        return run_with_retry(attempt, "embed_queries", logger)
+
+    def warm(self, texts: Iterable[str], logger) -> int:
+        """
+        Embeds the texts not cached yet, in batches, and returns how many were added.
+        """
+        with self._lock:
+            missing = list(dict.fromkeys(text for text in texts if (self.model, text) not in self._embeddings))
+        added = 0
+        for start in range(0, len(missing), QUERY_EMBEDDING_BATCH_SIZE):
+            batch = missing[start:start + QUERY_EMBEDDING_BATCH_SIZE]
+            embeddings = self._embed_batch(batch, logger)
+            if embeddings is None:
+                continue
+            with self._lock:
+                self._embeddings.update(((self.model, text), embedding) for text, embedding in zip(batch, embeddings))
+            added += len(batch)
+        if added:
+            with self._lock:
+                try:
+                    self._save()
+                except OSError as e:
+                    logger.warning(_log_message(f"Query embeddings not saved to {self.path}: {e}", "warm", MODULE_NAME))
+            metrics.increment("query_embedding_cache.embedded", added)
+        return added
+
+    def embedding(self, text: str) -> Optional[List[float]]:
+        """
+        Returns the cached embedding of a question, None when it is not cached.
+        """
+        with self._lock:
+            embedding = self._embeddings.get((self.model, text))
+        metrics.increment("query_embedding_cache.hits" if embedding is not None else "query_embedding_cache.misses")
+        return embedding
+
+
+_query_embedding_cache = None
+_query_embedding_cache_lock = threading.Lock()
+
+
+def get_query_embedding_cache() -> Optional[QueryEmbeddingCache]:
+    """
+    Returns the process-wide query embedding cache, or None when QUERY_EMBEDDING_MODEL
+    is unset. Constructing it only reads the artifact.
+    """
+    global _query_embedding_cache
+    if not QUERY_EMBEDDING_MODEL:
+        return None
+    if _query_embedding_cache is None:
+        with _query_embedding_cache_lock:
+            if _query_embedding_cache is None:
+                _query_embedding_cache = QueryEmbeddingCache(QUERY_EMBEDDING_MODEL)
+    return _query_embedding_cache
+
+
+def warm_query_embedding_cache(texts: Iterable[str], logger) -> int:
+    """
+    Embeds the questions missing from the query embedding cache, to be called once at
+    worker startup. Never raises: on failure the questions missing from the cache are
+    embedded by the retriever per call, as without the cache.
+    """
+    try:
+        query_embeddings = get_query_embedding_cache()
+        return query_embeddings.warm(texts, logger) if query_embeddings is not None else 0
+    except Exception as e:
+        logger.warning(_log_message(f"Query embeddings not warmed: {e}", "warm_query_embedding_cache", MODULE_NAME))
+        return 0
+
+
+def accepts_query_vector(retrieve: Callable) -> bool:
+    """
+    Tells whether a retrieval function takes a precomputed dense query vector through
+    QUERY_VECTOR_ARGUMENT.
+    """
+    try:
+        return QUERY_VECTOR_ARGUMENT in inspect.signature(retrieve).parameters
+    except (TypeError, ValueError):
+        return False
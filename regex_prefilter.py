@@ -0,0 +1,327 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from config.config import config
+from services.insights.llm_metrics import metrics
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+MODULE_NAME = "regex_prefilter.py"
+
+REGEX_PREFILTER_ENABLED = getattr(config, "REGEX_PREFILTER_ENABLED", True)
+# Literal runs are expanded through small character classes, e.g. [Oo]ne -> one, One
+MAX_CLASS_CHARS = 8
+MAX_RUN_EXPANSIONS = 64
+# A required digit is about as selective in contract prose as a three-letter literal
+DIGIT_ANCHOR_STRENGTH = 3
+
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, getattr(sre_constants, "POSSESSIVE_REPEAT", None))
+_LEADING_FLAGS = re.compile(r"^\(\?[aiLmsux]+\)")
+_DIGIT = re.compile(r"\d")
+
+
+@dataclass(frozen=True)
+class Anchors:
+    """
+    Casefolded literals of which every match of a regex contains at least one.
+    ``digit`` means a match may instead be anchored only by a decimal digit.
+    """
+    literals: frozenset
+    digit: bool = False
+
+    def _rank(self):
+        # Prefer longer shortest literals, then literal-only anchors, then fewer literals
+        strength = min(map(len, self.literals), default=DIGIT_ANCHOR_STRENGTH)
+        if self.digit:
+            strength = min(strength, DIGIT_ANCHOR_STRENGTH)
+        return strength, not self.digit, -len(self.literals)
+
+
+def _class_chars(items):
+    """
+    Returns (characters, matches digits) of a character class made of literals,
+    small ranges and \\d, or None for any other class.
+    """
+    chars, digit = set(), False
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            chars.add(chr(av))
+        elif op is sre_constants.RANGE and av[1] - av[0] < MAX_CLASS_CHARS:
+            chars.update(chr(c) for c in range(av[0], av[1] + 1))
+        elif op is sre_constants.CATEGORY and av is sre_constants.CATEGORY_DIGIT:
+            digit = True
+        else:
+            return None
+    if len(chars) > MAX_CLASS_CHARS:
+        return None
+    return chars, digit
+
+
+def _union(parts) -> Optional[Anchors]:
+    if any(part is None for part in parts):
+        return None
+    return Anchors(frozenset().union(*(part.literals for part in parts)), any(part.digit for part in parts))
+
+
+def _sequence_anchors(items) -> Optional[Anchors]:
+    """
+    Returns the best required anchors of a parsed sequence, or None when a match of the
+    sequence need not contain any literal or digit.
+    """
+    candidates = []
+    run = [""]
+
+    def flush():
+        if run != [""]:
+            candidates.append(Anchors(frozenset(run)))
+
+    for op, av in items:
+        chars = None
+        if op is sre_constants.LITERAL:
+            chars = {chr(av)}
+        elif op is sre_constants.IN:
+            class_chars = _class_chars(av)
+            if class_chars is None:
+                flush()
+                run = [""]
+                continue
+            chars, digit = class_chars
+            if digit:
+                flush()
+                run = [""]
+                candidates.append(Anchors(frozenset(c.casefold() for c in chars), True))
+                continue
+
+        if chars is not None:
+            expanded = {(prefix + char).casefold() for prefix in run for char in chars}
+            if len(expanded) <= MAX_RUN_EXPANSIONS:
+                run = sorted(expanded)
+            else:
+                flush()
+                run = sorted({char.casefold() for char in chars})
+            continue
+
+        flush()
+        run = [""]
+        if op is sre_constants.SUBPATTERN:
+            anchors = _sequence_anchors(av[-1])
+        elif op is sre_constants.BRANCH:
+            anchors = _union([_sequence_anchors(branch) for branch in av[1]])
+        elif op in _REPEATS and av[0] >= 1:
+            anchors = _sequence_anchors(av[2])
+        elif op is getattr(sre_constants, "ATOMIC_GROUP", None):
+            anchors = _sequence_anchors(av)
+        else:
+            # Assertions, \b, optional repeats and wide classes require nothing
+            anchors = None
+        if anchors is not None:
+            candidates.append(anchors)
+    flush()
+
+    candidates = [anchors for anchors in candidates if anchors.literals or anchors.digit]
+    return max(candidates, key=Anchors._rank) if candidates else None
+
+
+def required_anchors(pattern: str, flags: int = 0) -> Optional[Anchors]:
+    """
+    Derives literals every match of ``pattern`` contains, or None when there are none,
+    in which case the pattern cannot be prefiltered.
+    """
+    return _sequence_anchors(list(sre_parse.parse(pattern, flags)))
+
+
+@lru_cache(maxsize=32)
+def split_alternation(pattern: str, flags: int = 0) -> Tuple[str, tuple, str]:
+    """
+    Splits a pattern of the form ``prefix(A|B|...)suffix`` into its prefix, top-level
+    branches and suffix. A pattern of any other form is returned as its only branch.
+    A match of the pattern exists iff ``prefix(X)suffix`` matches for some branch X.
+    """
+    leading = _LEADING_FLAGS.match(pattern)
+    offset = leading.end() if leading else 0
+    verbose = bool(flags & re.VERBOSE) or bool(leading and "x" in leading.group(0))
+    depth = 0
+    in_class = False
+    open_at = close_at = None
+    bars = []
+    i = offset
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # A ] right after [ or [^ is a literal member of the class
+            i += 1 + pattern.startswith("^", i + 1)
+            i += pattern.startswith("]", i)
+            continue
+        elif char == "#" and verbose:
+            end = pattern.find("\n", i)
+            i = len(pattern) if end == -1 else end
+            continue
+        elif char == "(":
+            if depth == 0 and open_at is not None:
+                return "", (pattern,), ""
+            open_at = i if depth == 0 else open_at
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            close_at = i if depth == 0 else close_at
+        elif char == "|" and depth <= 1:
+            if depth == 0:
+                return "", (pattern,), ""
+            bars.append(i)
+        i += 1
+
+    if open_at is None or not bars:
+        return "", (pattern,), ""
+    following = pattern[close_at + 1:].lstrip() if verbose else pattern[close_at + 1:]
+    if following[:1] in ("*", "+", "?", "{"):
+        # A repeated group can match with a different branch per repetition
+        return "", (pattern,), ""
+    body_start = open_at + 1
+    if pattern.startswith("?:", body_start):
+        body_start += 2
+    elif pattern.startswith("?", body_start):
+        # Named groups, lookarounds and scoped flags are left whole
+        return "", (pattern,), ""
+    starts = [body_start] + [bar + 1 for bar in bars]
+    ends = bars + [close_at]
+    return pattern[:body_start], tuple(pattern[start:end] for start, end in zip(starts, ends)), pattern[close_at:]
+
+
+@lru_cache(maxsize=2048)
+def restrict_pattern(pattern: str, flags: int, branches: Optional[tuple]) -> str:
+    """
+    Returns ``pattern`` keeping only the given top-level branches, or whole for None.
+    """
+    prefix, all_branches, suffix = split_alternation(pattern, flags)
+    if branches is None or len(branches) == len(all_branches):
+        return pattern
+    return prefix + "|".join(all_branches[index] for index in branches) + suffix
+
+
+def _trie_regex(literals) -> str:
+    """
+    Returns a regex matching the longest of ``literals`` at a position, factoring common
+    prefixes so the backtracking engine tests one character per trie level.
+    """
+    trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node):
+        terminal = "" in node
+        children = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not children:
+            return ""
+        body = children[0] if len(children) == 1 else "(?:" + "|".join(children) + ")"
+        return "(?:" + body + ")?" if terminal else body
+
+    return render(trie)
+
+
+class AnchorPrefilter:
+    """
+    Finds the branches of each regex filter that can match each sentence with one
+    multi-literal search per sentence: Aho-Corasick when pyahocorasick is installed,
+    otherwise a prefix-factored regex. A branch none of whose anchors occur
+    in a sentence cannot match it, so only the remaining branches are ever run.
+    """
+
+    def __init__(self, patterns: Dict[str, Tuple[str, int]]):
+        self._always = {}
+        self._digit = []
+        self._units_by_literal = {}
+        for name, (pattern, flags) in patterns.items():
+            prefix, branches, suffix = split_alternation(pattern, flags)
+            for index, branch in enumerate(branches):
+                anchors = required_anchors(prefix + branch + suffix, flags)
+                if anchors is None:
+                    self._always.setdefault(name, set()).add(index)
+                    continue
+                if anchors.digit:
+                    self._digit.append((name, index))
+                for literal in anchors.literals:
+                    self._units_by_literal.setdefault(literal, []).append((name, index))
+
+        self._automaton = None
+        self._literal_regex = None
+        if ahocorasick is not None and self._units_by_literal:
+            self._automaton = ahocorasick.Automaton()
+            for literal in self._units_by_literal:
+                self._automaton.add_word(literal, literal)
+            self._automaton.make_automaton()
+        elif self._units_by_literal:
+            self._literal_regex = re.compile(f"(?=({_trie_regex(self._units_by_literal)}))", re.DOTALL)
+
+    @lru_cache(maxsize=4096)
+    def _units(self, literal: str) -> tuple:
+        """
+        Returns the (filter, branch) units anchored by ``literal`` or by any of its
+        prefixes, which the longest-match regex search does not report separately.
+        """
+        if self._automaton is not None:
+            return tuple(self._units_by_literal[literal])
+        units = []
+        for length in range(1, len(literal) + 1):
+            units.extend(self._units_by_literal.get(literal[:length], ()))
+        return tuple(units)
+
+    def _sentence_literals(self, folded_sentence: str) -> set:
+        """
+        Returns the anchors occurring in a casefolded sentence.
+        """
+        if self._automaton is not None:
+            return {literal for _, literal in self._automaton.iter(folded_sentence)}
+        if self._literal_regex is not None:
+            return set(self._literal_regex.findall(folded_sentence))
+        return set()
+
+    def _sentence_branches(self, sentence: str, unanchored: bool = True) -> Dict[str, set]:
+        branches = {name: set(indexes) for name, indexes in self._always.items()} if unanchored else {}
+        for literal in self._sentence_literals(sentence.casefold()):
+            for name, index in self._units(literal):
+                branches.setdefault(name, set()).add(index)
+        if self._digit and _DIGIT.search(sentence):
+            for name, index in self._digit:
+                branches.setdefault(name, set()).add(index)
+        return branches
+
+    def active_branches(self, sentences: List[str]) -> List[Dict[str, tuple]]:
+        """
+        Returns, per sentence, the branches of each filter that must be run on it.
+        Filters without any such branch are left out.
+        """
+        active = [
+            {name: tuple(sorted(indexes)) for name, indexes in self._sentence_branches(sentence).items()}
+            for sentence in sentences
+        ]
+        metrics.increment("regex_prefilter.sentences", len(sentences))
+        metrics.increment("regex_prefilter.candidate_sentences", sum(1 for branches in active if branches))
+        return active
+
+    def anchor_matches(self, sentence: str, names) -> List[str]:
+        """
+        Returns the filters among ``names`` with a branch whose required anchors occur in
+        the sentence: the cheap approximation used when running the regex itself is too slow.
+        Branches without anchors never match this way.
+        """
+        branches = self._sentence_branches(sentence, unanchored=False)
+        return [name for name in names if name in branches]
@@ -0,0 +1,202 @@
+import asyncio
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from config.config import config
+from services.insights.llm_metrics import metrics
+
+MODULE_NAME = "stage_scheduler.py"
+
+# Threads running stages of every file in flight. Stages wait on the retrieval and LLM
+# calls they hand to the fair executor, so they get a pool of their own
+STAGE_SCHEDULER_MAX_WORKERS = getattr(config, "STAGE_SCHEDULER_MAX_WORKERS", 64)
+
+stage_executor = ThreadPoolExecutor(max_workers=STAGE_SCHEDULER_MAX_WORKERS, thread_name_prefix="metadata-stage")
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    A node of a stage DAG. ``run`` receives the results of the finished stages keyed by
+    name and starts once the stages of ``after`` are done, and then those ``after_when``
+    returns for their results: a stage that needs a field only when an earlier stage
+    left it empty waits for the stage filling it in only in that case.
+    """
+    name: str
+    run: Callable[[Dict[str, Any]], Any]
+    after: Tuple[str, ...] = ()
+    after_when: Optional[Callable[[Dict[str, Any]], Sequence[str]]] = None
+
+
+@dataclass
+class Schedule:
+    """
+    The results of a run of stages, with the start and finish of each stage in seconds
+    since the run began and the stages each one waited for.
+    """
+    results: Dict[str, Any] = field(default_factory=dict)
+    started: Dict[str, float] = field(default_factory=dict)
+    finished: Dict[str, float] = field(default_factory=dict)
+    waited_on: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+
+    def seconds(self, name: str) -> float:
+        return self.finished[name] - self.started[name]
+
+    @property
+    def wall_seconds(self) -> float:
+        return max(self.finished.values(), default=0.0)
+
+    @property
+    def stage_seconds(self) -> float:
+        """
+        The latency of running the stages one after the other.
+        """
+        return sum(self.seconds(name) for name in self.finished)
+
+    @property
+    def critical_path(self) -> List[str]:
+        """
+        The chain of stages that set the wall time: from the last stage to finish back
+        through the stage each one waited for last.
+        """
+        path = []
+        name = max(self.finished, key=self.finished.get) if self.finished else None
+        while name is not None:
+            path.append(name)
+            waited_on = self.waited_on[name]
+            name = max(waited_on, key=self.finished.get) if waited_on else None
+        return path[::-1]
+
+    def summary(self) -> dict:
+        return {
+            "critical_path": self.critical_path,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "stage_seconds": round(self.stage_seconds, 3),
+            "stages": {name: round(self.seconds(name), 3) for name in self.finished},
+        }
+
+
+def _validate(stages: Sequence[Stage]):
+    """
+    Raises ValueError for duplicate stage names, unknown prerequisites and cycles.
+    """
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate stage names: {names}")
+    after = {stage.name: stage.after for stage in stages}
+    for name, prerequisites in after.items():
+        unknown = set(prerequisites) - after.keys()
+        if unknown:
+            raise ValueError(f"Stage {name} runs after unknown stages {sorted(unknown)}")
+    visiting, done = set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Stage {name} is part of a cycle")
+        visiting.add(name)
+        for prerequisite in after[name]:
+            visit(prerequisite)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in names:
+        visit(name)
+
+
+def _prerequisites(stage: Stage, results: Dict[str, Any]) -> Optional[Tuple[str, ...]]:
+    """
+    Returns the stages a stage waited for when it is ready to start, else None.
+    """
+    if any(name not in results for name in stage.after):
+        return None
+    prerequisites = stage.after + tuple(stage.after_when(results) if stage.after_when else ())
+    if any(name not in results for name in prerequisites):
+        return None
+    return prerequisites
+
+
+def _ready_stages(pending: Dict[str, Stage], schedule: Schedule, origin: float) -> List[Stage]:
+    """
+    Removes the stages ready to start from ``pending`` and records their start.
+    """
+    ready = []
+    for name, stage in list(pending.items()):
+        prerequisites = _prerequisites(stage, schedule.results)
+        if prerequisites is None:
+            continue
+        del pending[name]
+        schedule.waited_on[name] = prerequisites
+        schedule.started[name] = time.perf_counter() - origin
+        ready.append(stage)
+    return ready
+
+
+def _stalled(pending: Dict[str, Stage]) -> ValueError:
+    return ValueError(f"Stages {sorted(pending)} wait for stages that never run")
+
+
+def _record(schedule: Schedule):
+    metrics.observe("stage_scheduler.wall_seconds", schedule.wall_seconds)
+    metrics.observe("stage_scheduler.stage_seconds", schedule.stage_seconds)
+
+
+def run_stages(stages: Sequence[Stage], submit: Optional[Callable] = None, executor: Optional[ThreadPoolExecutor] = None) -> Schedule:
+    """
+    Runs the stages on the shared stage executor, starting every stage as soon as it is
+    ready. ``submit(executor, fn, *args)`` submits a stage, e.g. under the caller's
+    tracing context. The first stage to raise fails the run once the running stages finish.
+    """
+    _validate(stages)
+    submit = submit or (lambda executor, fn, *args: executor.submit(fn, *args))
+    executor = executor or stage_executor
+    schedule = Schedule()
+    pending = {stage.name: stage for stage in stages}
+    running = {}
+    origin = time.perf_counter()
+    try:
+        while pending or running:
+            for stage in _ready_stages(pending, schedule, origin):
+                # A copy, the stages read the results while this thread adds to them
+                running[submit(executor, stage.run, dict(schedule.results))] = stage.name
+            if not running:
+                raise _stalled(pending)
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                schedule.finished[name] = time.perf_counter() - origin
+                schedule.results[name] = future.result()
+    finally:
+        wait(running)
+    _record(schedule)
+    return schedule
+
+
+async def async_run_stages(stages: Sequence[Stage]) -> Schedule:
+    """
+    Async variant of run_stages: ``run`` returns an awaitable and every ready stage
+    becomes a task. The first stage to raise cancels the running ones.
+    """
+    _validate(stages)
+    schedule = Schedule()
+    pending = {stage.name: stage for stage in stages}
+    running = {}
+    origin = time.perf_counter()
+    try:
+        while pending or running:
+            for stage in _ready_stages(pending, schedule, origin):
+                running[asyncio.ensure_future(stage.run(dict(schedule.results)))] = stage.name
+            if not running:
+                raise _stalled(pending)
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = running.pop(task)
+                schedule.finished[name] = time.perf_counter() - origin
+                schedule.results[name] = task.result()
+    finally:
+        for task in running:
+            task.cancel()
+    _record(schedule)
+    return schedule
@@ -0,0 +1,39 @@
+import re
+from typing import List, Tuple
+
+MODULE_NAME = "word_spans.py"
+
+# A word, with the digit group separators of numbers (1,200, 10:30, 2.5), the clitics
+# nltk.word_tokenize splits off a word (do n't, party 's, days '), or any other non-space
+# character on its own. On the normalised sentences the filters see, which hold no
+# markdown symbols, hyphens or sentence periods, this finds nltk's words but for
+# apostrophes inside names (O'Brien is three words here) and runs of punctuation
+# (one word per character), so a trimmed window may rarely end a word off nltk's cut.
+_TOKEN = re.compile(r"(?i)\w+?(?=n['’]t\b)|n['’]t\b|['’](?:s|m|d|re|ve|ll)\b|\w+(?:[,:.](?=\d)\w+)*|[^\w\s]")
+
+
+def word_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Returns the (start, end) offsets of the words of a sentence.
+    """
+    return [match.span() for match in _TOKEN.finditer(text)]
+
+
+def head_words(text: str, max_words: int, spans: List[Tuple[int, int]] = None) -> str:
+    """
+    Returns the text of the first ``max_words`` words of a sentence.
+    """
+    spans = word_spans(text) if spans is None else spans
+    if not spans:
+        return ""
+    return text[spans[0][0]:spans[:max_words][-1][1]]
+
+
+def tail_words(text: str, max_words: int, spans: List[Tuple[int, int]] = None) -> str:
+    """
+    Returns the text of the last ``max_words`` words of a sentence.
+    """
+    spans = word_spans(text) if spans is None else spans
+    if not spans or max_words <= 0:
+        return ""
+    return text[spans[-max_words:][0][0]:spans[-1][1]]